@@ -0,0 +1,261 @@
+# ======================================================
+# 📄 FILE: async_repository.py
+# PURPOSE: Async repository layer for asyncio services
+# EXPECTED:
+# - Coroutine versions of get_company_by_symbol and
+#   get_stock_data_by_company
+# - PostgreSQL through an asyncpg connection pool
+# - CSV backend through the blocking repository in an executor
+# - Identical in-flight requests share a single fetch
+# RULES:
+# - Never block the event loop on I/O or pandas work
+# - Same frames and errors as the blocking repositories
+# - asyncpg is optional; only the postgres backend needs it, and
+#   only the postgres backend imports database.py (psycopg2)
+# OUTCOME:
+# - Many concurrent ticker requests without stalling the loop
+# ======================================================
+
+import asyncio
+import sys
+import time
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from pipeline import (DATA_BACKEND, CompanyRepository, CSVClientFactory,
+                      is_valid_symbol)
+from schema import format_date, parse_market_cap, select_columns
+
+try:
+    import asyncpg
+except ImportError:  # Only needed for the postgres backend
+    asyncpg = None
+
+
+class AsyncPostgresClientFactory:
+    """
+    Factory Pattern: one asyncpg pool, created on first use.
+    """
+
+    def __init__(self, dsn=None, min_size=None, max_size=None):
+        import database
+
+        self.dsn = dsn or database.DATABASE_URL
+        self.min_size = min_size or database.DB_POOL_MIN
+        self.max_size = max_size or database.DB_POOL_MAX
+        self._pool = None
+        self._lock = asyncio.Lock()
+
+    async def get_pool(self):
+        if asyncpg is None:
+            raise ImportError(
+                "The async postgres backend needs asyncpg: "
+                "pip install asyncpg")
+        if not self.dsn:
+            raise ValueError("DATABASE_URL is missing")
+        async with self._lock:
+            if self._pool is None:
+                try:
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn, min_size=self.min_size,
+                        max_size=self.max_size)
+                except (OSError, asyncpg.PostgresError) as e:
+                    raise ConnectionError(
+                        f"Failed to connect to the database: {e}")
+            return self._pool
+
+    async def close(self):
+        async with self._lock:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+
+
+class AsyncCompanyRepository(ABC):
+    """
+    Base class: validation and request coalescing. Backends implement
+    _fetch_company and _fetch_stock_data.
+
+    Concurrent calls for the same key await one shared task, so a
+    burst of requests for one ticker costs a single fetch. Results are
+    shared between callers and should be treated as read-only.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.stats = {"fetches": 0, "coalesced": 0}
+
+    async def preload(self):
+        """
+        Warm up the backend ahead of a burst of requests.
+        """
+
+    async def get_company_by_symbol(self, symbol):
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+        return await self._coalesce(
+            ("company", symbol), lambda: self._fetch_company(symbol))
+
+    async def get_stock_data_by_company(self, company_name, start=None,
+                                        end=None, columns=None):
+        columns = select_columns(columns)
+        key = ("stock", company_name, format_date(start), format_date(end),
+               None if columns is None else tuple(columns))
+        return await self._coalesce(key, lambda: self._fetch_stock_data(
+            company_name, start, end, columns))
+
+    async def _coalesce(self, key, fetch):
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["fetches"] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.stats["coalesced"] += 1
+        # A cancelled caller must not cancel the fetch others await
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    @abstractmethod
+    async def _fetch_company(self, symbol):
+        """
+        Return the company row for symbol as a Series.
+        """
+
+    @abstractmethod
+    async def _fetch_stock_data(self, company_name, start, end, columns):
+        """
+        Return the stock rows of company_name as a DataFrame.
+        """
+
+
+class AsyncCSVCompanyRepository(AsyncCompanyRepository):
+    """
+    CSV backend: runs the blocking repository in an executor.
+    """
+
+    def __init__(self, repo=None, executor=None):
+        super().__init__()
+        self.repo = repo or CompanyRepository(CSVClientFactory.get_client())
+        # None means the event loop's default thread pool
+        self.executor = executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def preload(self):
+        await self._run(self.repo.preload)
+
+    async def _fetch_company(self, symbol):
+        return await self._run(self.repo.get_company_by_symbol, symbol)
+
+    async def _fetch_stock_data(self, company_name, start, end, columns):
+        return await self._run(self.repo.get_stock_data_by_company,
+                               company_name, start, end, columns)
+
+
+class AsyncPostgresCompanyRepository(AsyncCompanyRepository):
+    """
+    PostgreSQL backend on an asyncpg pool.
+    """
+
+    def __init__(self, factory=None):
+        super().__init__()
+        self.factory = factory or AsyncPostgresClientFactory()
+
+    async def preload(self):
+        await self.factory.get_pool()
+
+    async def _fetch_company(self, symbol):
+        from database import COMPANY_COLUMNS
+
+        columns = ", ".join(COMPANY_COLUMNS)
+        pool = await self.factory.get_pool()
+        try:
+            row = await pool.fetchrow(
+                f"SELECT {columns} FROM company_info "
+                f"WHERE symbol = $1 LIMIT 1", symbol)
+            if row is None:
+                raise LookupError(f"{symbol} not found")
+        except Exception as e:
+            raise RuntimeError(f"Failed to query company by symbol: {e}")
+
+        company = dict(zip(COMPANY_COLUMNS.values(), row.values()))
+        company["Market Cap"] = parse_market_cap(company["Market Cap"])
+        return pd.Series(company, dtype=object)
+
+    async def _fetch_stock_data(self, company_name, start, end, columns):
+        from database import stock_frame, stock_query
+
+        query, params, names = stock_query(company_name, start, end, columns,
+                                           placeholder="$")
+        if start is not None or end is not None:
+            # asyncpg binds DATE parameters from date objects only
+            params = [params[0]] + [pd.Timestamp(value).date()
+                                    for value in params[1:]]
+        pool = await self.factory.get_pool()
+        try:
+            rows = await pool.fetch(query, *params)
+        except asyncpg.PostgresError as e:
+            raise RuntimeError(f"Failed to query stock data by company: {e}")
+        return stock_frame([tuple(row.values()) for row in rows], names)
+
+
+def get_async_repository(backend=None):
+    """
+    Return the async repository for the configured data backend.
+    """
+    backend = backend or DATA_BACKEND
+    if backend == "csv":
+        return AsyncCSVCompanyRepository()
+    if backend == "postgres":
+        return AsyncPostgresCompanyRepository()
+    raise ValueError(f"Unknown data backend: {backend}")
+
+
+async def fetch_many(repo, symbols):
+    """
+    Fetch company rows and stock data for many symbols concurrently.
+    Returns {"results": {symbol: rows}, "errors": {symbol: message}}.
+    """
+    async def fetch_one(symbol):
+        company = await repo.get_company_by_symbol(symbol)
+        stock_df = await repo.get_stock_data_by_company(
+            company["Company Name"])
+        return len(stock_df)
+
+    outcomes = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols),
+                                    return_exceptions=True)
+    batch = {"results": {}, "errors": {}}
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, Exception):
+            batch["errors"][symbol] = f"{type(outcome).__name__}: {outcome}"
+        else:
+            batch["results"][symbol] = outcome
+    return batch
+
+
+async def _main(symbols):
+    repo = get_async_repository()
+    await repo.preload()
+    start = time.perf_counter()
+    batch = await fetch_many(repo, symbols)
+    elapsed = time.perf_counter() - start
+    for symbol, rows in batch["results"].items():
+        print(f"{symbol}: {rows} rows")
+    for symbol, error in batch["errors"].items():
+        print(f"{symbol}: ERROR {error}")
+    print(f"{len(symbols)} requests, {repo.stats['fetches']} fetches, "
+          f"{repo.stats['coalesced']} coalesced in {elapsed:.3f}s")
+    if isinstance(repo, AsyncPostgresCompanyRepository):
+        await repo.factory.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main([symbol.upper() for symbol in sys.argv[1:]]))
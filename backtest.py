@@ -0,0 +1,154 @@
+# ======================================================
+# 📄 FILE: backtest.py
+# PURPOSE: Walk-forward backtest of the 5D Future Return predictor
+# EXPECTED:
+# - Expanding-window backtest over load_and_prepare_data output
+# - Recursive least-squares updates instead of refitting per window
+# - Rolling error metrics and a per-ticker summary
+# RULES:
+# - A row is only used for training once its target is known
+# - Keep the linear model identical to ReturnPredictor's
+# OUTCOME:
+# - Honest out-of-sample error over time, cheap for every ticker
+# ======================================================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ml_model import FEATURES, TARGET
+
+# 5D Future Return is only known five trading days later
+HORIZON = 5
+
+
+class RecursiveLeastSquares:
+    """
+    Ordinary least squares updated one observation at a time.
+    Each update is a rank-one (Sherman-Morrison) change of the inverse.
+    """
+
+    def __init__(self, X, y):
+        self.P = np.linalg.pinv(X.T @ X)
+        self.beta = self.P @ (X.T @ y)
+
+    def predict(self, x):
+        return x @ self.beta
+
+    def update(self, x, y):
+        Px = self.P @ x
+        gain = Px / (1.0 + x @ Px)
+        self.beta = self.beta + gain * (y - x @ self.beta)
+        self.P = self.P - np.outer(gain, Px)
+
+
+def _design(stock_df, features, min_train):
+    """
+    Intercept plus the features that vary in the initial window.
+    Constant columns (e.g. a ticker's Market Cap) add nothing to a
+    per-ticker fit and would make the normal equations singular.
+    """
+    values = stock_df[list(features)].to_numpy(np.float64)
+    varying = values[:min_train].std(axis=0) > 0
+    X = np.column_stack([np.ones(len(values)), values[:, varying]])
+    return X, [name for name, keep in zip(features, varying) if keep]
+
+
+def walk_forward(stock_df, features=FEATURES, min_train=60, window=20,
+                 horizon=HORIZON):
+    """
+    Expanding-window backtest for one ticker.
+
+    The model predicts each day with every row whose target was known
+    by then, i.e. rows at least `horizon` days older.
+
+    :param stock_df: One ticker's rows from load_and_prepare_data.
+    :param min_train: Rows in the first training window.
+    :param window: Length of the rolling error metrics.
+    :return: DataFrame with Date, Actual, Predicted, Error and rolling
+             MSE, MAE and directional hit rate.
+    """
+    stock_df = stock_df.sort_values("Date")
+    first = min_train + horizon - 1
+    if len(stock_df) <= first:
+        raise ValueError(
+            f"Need more than {first} rows, got {len(stock_df)}")
+
+    X, _ = _design(stock_df, features, min_train)
+    y = stock_df[TARGET].to_numpy(np.float64)
+    model = RecursiveLeastSquares(X[:min_train], y[:min_train])
+
+    predictions = np.empty(len(y) - first)
+    for step, t in enumerate(range(first, len(y))):
+        predictions[step] = model.predict(X[t])
+        # The target of row t - horizon + 1 is known from tomorrow on
+        known = t - horizon + 1
+        model.update(X[known], y[known])
+
+    actual = y[first:]
+    error = predictions - actual
+    result = pd.DataFrame({
+        "Date": stock_df["Date"].to_numpy()[first:],
+        "Actual": actual,
+        "Predicted": predictions,
+        "Error": error,
+    })
+    result["Rolling MSE"] = (result["Error"] ** 2).rolling(window).mean()
+    result["Rolling MAE"] = result["Error"].abs().rolling(window).mean()
+    hits = np.sign(predictions) == np.sign(actual)
+    result["Rolling Hit Rate"] = pd.Series(hits, dtype=float).rolling(
+        window).mean()
+    return result
+
+
+def summarize(result):
+    """
+    Whole-period metrics of a walk_forward result.
+    """
+    error = result["Error"]
+    return {
+        "predictions": len(result),
+        "mse": float((error ** 2).mean()),
+        "mae": float(error.abs().mean()),
+        "hit_rate": float((np.sign(result["Predicted"])
+                           == np.sign(result["Actual"])).mean()),
+    }
+
+
+def _backtest_one(job):
+    symbol, stock_df, kwargs = job
+    try:
+        return symbol, walk_forward(stock_df, **kwargs), None
+    except Exception as e:
+        return symbol, None, f"{type(e).__name__}: {e}"
+
+
+def backtest_universe(universe_df, workers=None, group_column="Name",
+                      **kwargs):
+    """
+    Run walk_forward for every ticker of load_and_prepare_universe
+    output across a process pool.
+
+    :return: (predictions, summary, errors) where predictions stacks
+             every ticker's walk_forward rows, summary has one row of
+             metrics per ticker and errors maps symbol -> message.
+    """
+    jobs = [(symbol, group, kwargs) for symbol, group
+            in universe_df.groupby(group_column, observed=True)]
+    workers = workers or os.cpu_count() or 1
+
+    frames, rows, errors = [], {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for symbol, result, error in executor.map(_backtest_one, jobs):
+            if error is not None:
+                errors[symbol] = error
+                continue
+            frames.append(result.assign(**{group_column: symbol}))
+            rows[symbol] = summarize(result)
+
+    predictions = (pd.concat(frames, ignore_index=True) if frames
+                   else pd.DataFrame())
+    summary = pd.DataFrame.from_dict(rows, orient="index")
+    return predictions, summary, errors
@@ -0,0 +1,93 @@
+# ======================================================
+# 📄 FILE: benchmarks/import_budget.py
+# PURPOSE: Measure and enforce the startup cost of the entry point
+# EXPECTED:
+# - Time `import main` in fresh interpreters (best of several runs)
+# - Check that headless startup loads no GUI/ML/PDF packages
+# - Exit non-zero when the budget is exceeded (usable in CI)
+# RULES:
+# - Run from the project root: python -m benchmarks.import_budget
+# - tests/test_import_budget.py runs the same check under pytest
+# - Each measurement is a new process, so nothing is pre-imported
+# OUTCOME:
+# - Slow or heavy imports at startup fail a check, not just a feeling
+# ======================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for `import main`; pandas alone takes a few hundred ms
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+# Packages only specific commands need; startup must not import them
+LAZY_MODULES = ["sklearn", "tkinter", "fpdf", "matplotlib", "psycopg2",
+                "asyncpg"]
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": 1000 * elapsed,
+                  "loaded": [name for name in {lazy!r}
+                             if name in sys.modules]}}))
+"""
+
+
+def measure_import(module="main", lazy_modules=LAZY_MODULES):
+    """
+    Import module in a fresh interpreter; return its time in ms and
+    which of lazy_modules it loaded.
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(module=module,
+                                              lazy=list(lazy_modules))],
+        cwd=PROJECT_ROOT, env=env, check=True, capture_output=True,
+        text=True).stdout
+    # The JSON result is the last line; imports may print before it
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def check_budget(module="main", budget_ms=None, repeat=5):
+    """
+    Return (best_ms, problems): problems is empty when the import is
+    within the budget and loaded none of the lazy modules.
+    """
+    budget_ms = IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    runs = [measure_import(module) for _ in range(repeat)]
+    best_ms = min(run["ms"] for run in runs)
+
+    problems = []
+    if best_ms > budget_ms:
+        problems.append(f"import {module} took {best_ms:.0f} ms "
+                        f"(budget {budget_ms:.0f} ms)")
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    if loaded:
+        problems.append(f"import {module} loaded {', '.join(loaded)}")
+    return best_ms, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import budget")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    best_ms, problems = check_budget(args.module, args.budget_ms,
+                                     args.repeat)
+    print(f"import {args.module}: {best_ms:.0f} ms (best of "
+          f"{args.repeat})")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
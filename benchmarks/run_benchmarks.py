@@ -0,0 +1,222 @@
+# ======================================================
+# 📄 FILE: benchmarks/run_benchmarks.py
+# PURPOSE: Benchmarks for the load -> features -> train -> report path
+# EXPECTED:
+# - Generate synthetic datasets at several scales
+# - Time CSV loading, repository lookups, feature engineering,
+#   the utils strategies and ReturnPredictor train/predict
+# - Store results per commit and compare against an earlier run
+# - Results go to benchmarks/results/ (ignored by git) unless
+#   --output-dir names another directory
+# RULES:
+# - Run from the project root: python -m benchmarks.run_benchmarks
+# - Each benchmark is a zero-argument callable timed several times
+# OUTCOME:
+# - Performance regressions show up as numbers, not impressions
+# ======================================================
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pipeline
+import utils
+from benchmarks.synthetic_data import write_dataset
+from csv_cache import ColumnarCache
+from ml_model import FEATURES, BatchedReturnPredictor, ReturnPredictor
+from result_cache import RESULT_CACHE
+
+# Scale name -> (tickers, trading days)
+SCALES = {
+    "small": (10, 250),
+    "medium": (100, 1000),
+    "large": (500, 2500),
+}
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Ratio of new/old time above which a benchmark counts as a regression
+REGRESSION_RATIO = 1.2
+
+
+def time_call(func, repeat):
+    """
+    Run func `repeat` times and return min/mean wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "mean": sum(timings) / len(timings),
+            "repeat": repeat}
+
+
+def use_dataset(company_csv, stock_csv, cache_dir):
+    """
+    Point pipeline at a dataset and drop every cached client.
+    """
+    pipeline.CSV_CACHE_DIR = cache_dir
+    pipeline.COMPANY_INFO_CSV = company_csv
+    pipeline.STOCK_MARKET_CSV = stock_csv
+    pipeline.DATA_BACKEND = "csv"
+    pipeline.CSVClientFactory.get_client.cache_clear()
+    RESULT_CACHE.invalidate()
+
+
+def build_benchmarks(workdir):
+    """
+    Return an ordered dict of benchmark name -> callable for the
+    dataset currently selected with use_dataset.
+    """
+    cache_dir = os.path.join(workdir, "cache")
+    client = pipeline.CSVClient(cache=ColumnarCache(cache_dir))
+    repo = pipeline.CompanyRepository(client)
+    repo.preload()
+    symbols = list(client.get_company_df()["Symbol"])
+    symbol = symbols[0]
+    company_name = repo.get_company_by_symbol(symbol)["Company Name"]
+    stock_slice = repo.get_stock_data_by_company(company_name)
+    prepared = pipeline.load_and_prepare_data(symbol)
+    universe = pipeline.load_and_prepare_universe()
+    predictor = ReturnPredictor()
+    predictor.train(prepared)
+
+    def fresh_client():
+        return pipeline.CSVClient(cache=ColumnarCache(cache_dir))
+
+    def lookups():
+        for name in symbols:
+            company = repo.get_company_by_symbol(name)
+            repo.get_stock_data_by_company(company["Company Name"])
+
+    def uncached_prepare():
+        RESULT_CACHE.invalidate()
+        pipeline.load_and_prepare_data(symbol)
+
+    def legacy_strategies():
+        utils.calculate_average_close(stock_slice)
+        utils.filter_high_volume(stock_slice, threshold=50000000)
+        utils.sort_by_close(stock_slice, descending=False)
+
+    strategies = utils.StrategyPipeline()
+    strategies.register("average_close", utils.AverageCloseStrategy())
+    strategies.register("high_volume",
+                        utils.HighVolumeStrategy(threshold=50000000))
+    strategies.register("top_closes", utils.TopCloseStrategy(k=5))
+
+    return {
+        "csv_parse_stock": lambda: pipeline.CSVClient().get_stock_df(),
+        "csv_parse_company": lambda: pipeline.CSVClient().get_company_df(),
+        "cache_warm_stock": lambda: fresh_client().get_stock_df(),
+        "index_build": lambda: fresh_client().get_stock_index(),
+        "repository_lookups_all": lookups,
+        "load_and_prepare_data": uncached_prepare,
+        "load_and_prepare_cached": lambda: pipeline.load_and_prepare_data(
+            symbol),
+        "load_and_prepare_universe": pipeline.load_and_prepare_universe,
+        "strategies_legacy": legacy_strategies,
+        "strategies_pipeline": lambda: strategies.run(stock_slice),
+        "predictor_train": lambda: ReturnPredictor().train(prepared),
+        "predictor_predict": lambda: predictor.predict(
+            prepared[FEATURES].tail(5)),
+        "batched_train_universe": lambda: BatchedReturnPredictor().train(
+            universe),
+    }
+
+
+def run_scale(scale, repeat):
+    """
+    Generate the dataset for one scale and time every benchmark.
+    """
+    tickers, days = SCALES[scale]
+    with tempfile.TemporaryDirectory() as workdir:
+        company_csv, stock_csv = write_dataset(workdir, tickers, days)
+        use_dataset(company_csv, stock_csv,
+                    os.path.join(workdir, "cache"))
+        results = {}
+        # Pipeline functions print progress; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            benchmarks = build_benchmarks(workdir)
+        for name, func in benchmarks.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = time_call(func, repeat)
+            print(f"  {scale:>6} {name:<28} "
+                  f"{results[name]['min'] * 1000:10.2f} ms")
+        return results
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results, commit, output_dir=RESULTS_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{commit}.json")
+    with open(path, "w") as handle:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, handle, indent=2)
+    return path
+
+
+def compare(results, baseline_path):
+    """
+    Print new/old ratios against a saved run; return the regressions.
+    """
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)["results"]
+    regressions = []
+    for scale, benchmarks in results.items():
+        for name, timing in benchmarks.items():
+            old = baseline.get(scale, {}).get(name)
+            if old is None:
+                continue
+            ratio = timing["min"] / old["min"]
+            flag = "REGRESSION" if ratio > REGRESSION_RATIO else ""
+            print(f"  {scale:>6} {name:<28} {ratio:6.2f}x {flag}")
+            if flag:
+                regressions.append((scale, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmarks")
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"],
+                        choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare", help="Saved results JSON to compare")
+    parser.add_argument("--output-dir", default=RESULTS_DIR,
+                        help="Directory for the results JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in args.scales:
+        print(f"Scale {scale}: {SCALES[scale][0]} tickers x "
+              f"{SCALES[scale][1]} days")
+        results[scale] = run_scale(scale, args.repeat)
+
+    # Compare before saving, the baseline may be this commit's file
+    regressions = compare(results, args.compare) if args.compare else []
+    path = save_results(results, current_commit(), args.output_dir)
+    print(f"Saved {path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
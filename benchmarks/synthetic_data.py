@@ -0,0 +1,114 @@
+# ======================================================
+# 📄 FILE: benchmarks/synthetic_data.py
+# PURPOSE: Synthetic company_info / stock_market_data generator
+# EXPECTED:
+# - N tickers x M trading days with the real CSV schemas
+# - Market Cap strings with T/B/M suffixes, like symbol_company.csv
+# - Deterministic output for a given seed
+# RULES:
+# - Run from the project root: python -m benchmarks.synthetic_data
+# OUTCOME:
+# - Benchmark datasets at any scale without the real archive
+# ======================================================
+
+import argparse
+import os
+import string
+
+import numpy as np
+import pandas as pd
+
+INDUSTRIES = ["Technology", "Energy", "Healthcare", "Financials",
+              "Consumer Goods", "Utilities", "Industrials"]
+CAP_SUFFIXES = [("T", 0.5, 3.0), ("B", 1.0, 900.0), ("M", 50.0, 900.0)]
+
+
+def make_symbols(count):
+    """
+    Return `count` distinct 1-5 letter uppercase ticker symbols.
+    """
+    letters = string.ascii_uppercase
+    symbols = []
+    for number in range(count):
+        symbol = ""
+        number += 1
+        while number:
+            number, remainder = divmod(number - 1, 26)
+            symbol = letters[remainder] + symbol
+        symbols.append(symbol.rjust(3, "X"))
+    return symbols
+
+
+def generate_company_df(tickers, seed=0):
+    """
+    company_info rows: Symbol, Company Name, Industry, Market Cap.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = make_symbols(tickers)
+    caps = []
+    for _ in symbols:
+        suffix, low, high = CAP_SUFFIXES[rng.integers(len(CAP_SUFFIXES))]
+        caps.append(f"{rng.uniform(low, high):,.2f}{suffix}")
+    return pd.DataFrame({
+        "Symbol": symbols,
+        "Company Name": [f"{symbol} Holdings Inc." for symbol in symbols],
+        "Industry": rng.choice(INDUSTRIES, size=tickers),
+        "Market Cap": caps,
+    })
+
+
+def generate_stock_df(company_df, days, seed=0):
+    """
+    stock_market_data rows for every company over `days` trading days.
+    Prices follow a geometric random walk per ticker.
+    """
+    rng = np.random.default_rng(seed + 1)
+    tickers = len(company_df)
+    dates = pd.bdate_range("2000-01-03", periods=days).strftime("%Y-%m-%d")
+
+    log_returns = rng.normal(0.0003, 0.02, size=(tickers, days))
+    start = rng.uniform(5, 500, size=(tickers, 1))
+    close = start * np.exp(np.cumsum(log_returns, axis=1))
+    spread = np.abs(rng.normal(0, 0.01, size=(tickers, days)))
+    open_ = close * (1 + rng.normal(0, 0.005, size=(tickers, days)))
+
+    return pd.DataFrame({
+        "Date": np.tile(dates, tickers),
+        "Open": open_.ravel(),
+        "High": (np.maximum(open_, close) * (1 + spread)).ravel(),
+        "Low": (np.minimum(open_, close) * (1 - spread)).ravel(),
+        "Close": close.ravel(),
+        "Adj Close": close.ravel(),
+        "Volume": rng.integers(100_000, 100_000_000, size=tickers * days),
+        "Name": np.repeat(company_df["Symbol"].to_numpy(), days),
+        "Company Name": np.repeat(company_df["Company Name"].to_numpy(),
+                                  days),
+    })
+
+
+def write_dataset(directory, tickers, days, seed=0):
+    """
+    Write symbol_company.csv and full_stock_df.csv into directory and
+    return their paths as (company_csv, stock_csv).
+    """
+    os.makedirs(directory, exist_ok=True)
+    company_csv = os.path.join(directory, "symbol_company.csv")
+    stock_csv = os.path.join(directory, "full_stock_df.csv")
+
+    company_df = generate_company_df(tickers, seed)
+    # The real company CSV carries a leading unnamed index column
+    company_df.to_csv(company_csv)
+    generate_stock_df(company_df, days, seed).to_csv(stock_csv, index=False)
+    return company_csv, stock_csv
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic CSV dataset")
+    parser.add_argument("directory")
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = write_dataset(args.directory, args.tickers, args.days, args.seed)
+    print(f"Wrote {paths[0]} and {paths[1]}")
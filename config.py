@@ -0,0 +1,26 @@
+# ======================================================
+# 📄 FILE: config.py
+# PURPOSE: Load the .env file once per process
+# EXPECTED:
+# - Every module reads its settings with os.getenv
+# - The .env lookup and parse happen on the first load_env() only
+# RULES:
+# - Call load_env() before reading settings at import time
+# - Variables already set in the environment win over .env values
+# OUTCOME:
+# - One .env parse per process instead of one per module
+# ======================================================
+
+from dotenv import load_dotenv
+
+_loaded = False
+
+
+def load_env():
+    """
+    Load .env into os.environ on the first call; later calls are free.
+    """
+    global _loaded
+    if not _loaded:
+        load_dotenv()
+        _loaded = True
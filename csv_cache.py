@@ -0,0 +1,198 @@
+# ======================================================
+# 📄 FILE: csv_cache.py
+# PURPOSE: Persistent columnar cache for the CSV "database"
+# EXPECTED:
+# - Convert a CSV table once into typed NumPy column files
+# - Reuse the columns on later runs through a memory-map
+# - Open only the requested columns; row slices touch only their pages
+# - Rebuild automatically when the source CSV changes
+# RULES:
+# - No extra dependencies beyond pandas/NumPy
+# - Cache writes must never leave a half-written table behind
+# OUTCOME:
+# - Cold start is a memory-map instead of a full CSV parse
+# ======================================================
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = "manifest.json"
+CACHE_FORMAT_VERSION = 3
+
+
+def code_dtype(categories):
+    """
+    The code dtype pandas itself uses for this many categories, so a
+    categorical can wrap stored codes instead of copying them.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if len(categories) < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def file_fingerprint(path):
+    """
+    Return the cheap (mtime, size) fingerprint of a source file.
+    """
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def file_hash(path, block_size=1 << 20):
+    """
+    Return the SHA-1 content hash of a source file.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def same_source(cached, path):
+    """
+    Check a fingerprint saved with "sha1" against the file on disk. A
+    changed mtime alone falls back to a content hash comparison.
+    """
+    current = file_fingerprint(path)
+    if current["size"] != cached["size"]:
+        return False
+    if current["mtime_ns"] == cached["mtime_ns"]:
+        return True
+    return file_hash(path) == cached["sha1"]
+
+
+def source_fingerprint(path):
+    """
+    Return the fingerprint of a source file, content hash included.
+    """
+    source = file_fingerprint(path)
+    source["sha1"] = file_hash(path)
+    return source
+
+
+class ColumnarCache:
+    """
+    Stores DataFrames as one .npy file per column plus a manifest.
+
+    Numeric columns are memory-mapped on load. Text and categorical
+    columns are stored as integer codes with their categories kept in
+    the manifest, and load back as categoricals over the mapped codes.
+    Text columns get a sorted dictionary, so code order is string
+    order (e.g. ISO dates) and no strings are decoded per row.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def load(self, csv_path, name, prepare=None, columns=None,
+             **read_kwargs):
+        """
+        Return the table for csv_path, building the cache if stale.
+
+        :param csv_path: Source CSV file.
+        :param name: Table name used as the cache sub-directory.
+        :param prepare: Optional callable that turns the raw CSV frame
+                        into the frame that should be cached.
+        :param columns: Only open these column files (None for all).
+        :param read_kwargs: Extra pd.read_csv arguments, e.g. dtype.
+        """
+        table_dir = os.path.join(self.cache_dir, name)
+        manifest = self._read_manifest(table_dir)
+        if manifest is not None and self._is_fresh(manifest, csv_path):
+            return self._read_table(table_dir, manifest, columns)
+
+        df = pd.read_csv(csv_path, **read_kwargs)
+        if prepare is not None:
+            df = prepare(df)
+        self._write_table(table_dir, df, source_fingerprint(csv_path))
+        return self._read_table(table_dir, self._read_manifest(table_dir),
+                                columns)
+
+    def _is_fresh(self, manifest, csv_path):
+        """
+        Check the cached source fingerprint against the CSV on disk.
+        A changed mtime alone falls back to a content hash comparison.
+        """
+        if manifest.get("version") != CACHE_FORMAT_VERSION:
+            return False
+        return same_source(manifest["source"], csv_path)
+
+    @staticmethod
+    def _read_manifest(table_dir):
+        try:
+            with open(os.path.join(table_dir, MANIFEST_FILE)) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_table(table_dir, manifest, names=None):
+        entries = {column["name"]: column for column in manifest["columns"]}
+        if names is None:
+            names = list(entries)
+        missing = [name for name in names if name not in entries]
+        if missing:
+            raise KeyError(f"Columns not in cached table: {missing}")
+
+        columns = {}
+        for column in (entries[name] for name in names):
+            path = os.path.join(table_dir, column["file"])
+            values = np.load(path, mmap_mode="r")
+            if column["kind"] in ("text", "category"):
+                # Codes were checked when written; -1 marks missing
+                values = pd.Categorical.from_codes(
+                    values, dtype=pd.CategoricalDtype(column["categories"]),
+                    validate=False)
+            elif column["kind"] == "datetime":
+                values = values.view(column["dtype"])
+            columns[column["name"]] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def _write_table(self, table_dir, df, source):
+        """
+        Write every column to a temporary directory, then swap it in.
+        """
+        tmp_dir = f"{table_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        columns = []
+        for position, name in enumerate(df.columns):
+            entry = {"name": name, "file": f"col_{position}.npy"}
+            series = df[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy().astype(
+                    code_dtype(series.cat.categories))
+                entry.update(kind="category",
+                             categories=[str(value) for value
+                                         in series.cat.categories])
+            elif pd.api.types.is_datetime64_dtype(series):
+                values = series.to_numpy()
+                entry.update(kind="datetime", dtype=str(values.dtype))
+                values = values.view("int64")
+            elif pd.api.types.is_numeric_dtype(series):
+                values = series.to_numpy()
+                entry.update(kind="numeric", dtype=str(values.dtype))
+            else:
+                codes, categories = pd.factorize(series, sort=True,
+                                                 use_na_sentinel=True)
+                values = codes.astype(code_dtype(categories))
+                entry.update(kind="text",
+                             categories=[str(value) for value in categories])
+            np.save(os.path.join(tmp_dir, entry["file"]), values)
+            columns.append(entry)
+
+        manifest = {"version": CACHE_FORMAT_VERSION, "source": source,
+                    "rows": len(df), "columns": columns}
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as handle:
+            json.dump(manifest, handle)
+
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.replace(tmp_dir, table_dir)
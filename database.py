@@ -0,0 +1,288 @@
+# ======================================================
+# 📄 FILE: database.py
+# PURPOSE: PostgreSQL version of the repository layer
+# EXPECTED:
+# - Load DATABASE_URL from .env
+# - Factory Pattern around a thread-safe connection pool (Unit 12)
+# - Repository Pattern with the same interface as pipeline.py (Unit 12)
+# - Validate input using regex (Unit 9)
+# - Handle errors gracefully (Unit 8)
+# RULES:
+# - Do not hardcode connection details
+# - Keep raw SQL inside repository methods
+# - Only parameterized queries, never string-formatted values
+# OUTCOME:
+# - Swap the CSV "database" for PostgreSQL through configuration
+# ======================================================
+
+import os
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+from config import load_env
+from pipeline import is_valid_symbol
+from schema import (STOCK_SCHEMA, apply_schema, format_date,
+                    parse_market_cap, prepare_company_df, select_columns)
+from stock_index import sort_stock_df
+
+# Load environment variables
+load_env()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "8"))
+
+# Rows fetched per round trip by server-side cursors
+STOCK_FETCH_BATCH = int(os.getenv("STOCK_FETCH_BATCH", "10000"))
+
+# Table column -> CSV column, so both backends return the same frames
+COMPANY_COLUMNS = {
+    "symbol": "Symbol",
+    "company_name": "Company Name",
+    "industry": "Industry",
+    "market_cap": "Market Cap",
+}
+STOCK_COLUMNS = {
+    "date": "Date",
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adj_close": "Adj Close",
+    "volume": "Volume",
+    "name": "Name",
+    "company_name": "Company Name",
+}
+
+
+def stock_query(company_name, start=None, end=None, columns=None,
+                placeholder="%s"):
+    """
+    Build the stock_market_data query for one company.
+
+    Column names come from the STOCK_COLUMNS whitelist; values are
+    always bound parameters. placeholder is "%s" for psycopg2 or "$"
+    for numbered asyncpg parameters.
+
+    :return: (query, params, CSV column names of the result)
+    """
+    names = select_columns(columns) or list(STOCK_COLUMNS.values())
+    table_columns = {csv: table for table, csv in STOCK_COLUMNS.items()}
+    conditions = [("company_name =", company_name)]
+    if start is not None:
+        conditions.append(("date >=", format_date(start)))
+    if end is not None:
+        conditions.append(("date <=", format_date(end)))
+
+    params, clauses = [], []
+    for position, (condition, value) in enumerate(conditions, 1):
+        marker = f"${position}" if placeholder == "$" else placeholder
+        clauses.append(f"{condition} {marker}")
+        params.append(value)
+
+    select = ", ".join(table_columns[name] for name in names)
+    query = (f"SELECT {select} FROM stock_market_data "
+             f"WHERE {' AND '.join(clauses)} ORDER BY date")
+    return query, params, names
+
+
+def stock_frame(rows, names):
+    """
+    Turn fetched stock rows into the frame the CSV backend returns:
+    Date as ISO strings and the STOCK_SCHEMA dtypes. NUMERIC columns
+    arrive as Decimal and DATE columns as datetime.date objects.
+    """
+    stock_df = pd.DataFrame(rows, columns=names)
+    for column in stock_df.columns:
+        if STOCK_SCHEMA[column].startswith(("float", "int")):
+            stock_df[column] = pd.to_numeric(stock_df[column]).astype(
+                "float64")
+    stock_df = apply_schema(stock_df, STOCK_SCHEMA)
+    if "Date" in stock_df.columns:
+        # Same string dtype as the dates read from the CSV
+        stock_df["Date"] = pd.to_datetime(stock_df["Date"]).dt.strftime(
+            "%Y-%m-%d")
+    return stock_df
+
+
+class PostgresClientFactory:
+    """
+    Factory Pattern: hands out pooled PostgreSQL connections.
+    """
+    _pool = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls):
+        """
+        Create the shared connection pool on first use.
+        """
+        if not DATABASE_URL:
+            raise ValueError("DATABASE_URL is missing")
+        with cls._lock:
+            if cls._pool is None:
+                try:
+                    cls._pool = ThreadedConnectionPool(
+                        DB_POOL_MIN, DB_POOL_MAX, DATABASE_URL)
+                except psycopg2.Error as e:
+                    raise ConnectionError(
+                        f"Failed to connect to the database: {e}")
+            return cls._pool
+
+    @classmethod
+    @contextmanager
+    def connection(cls):
+        """
+        Borrow a connection; commit on success, roll back on error.
+        """
+        pool = cls.get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.closeall()
+                cls._pool = None
+
+
+class PostgresCompanyRepository:
+    """
+    Repository Pattern: same interface as pipeline.CompanyRepository,
+    backed by the company_info and stock_market_data tables.
+    """
+
+    def __init__(self, factory=PostgresClientFactory,
+                 batch_size=STOCK_FETCH_BATCH):
+        self.factory = factory
+        self.batch_size = batch_size
+
+    def preload(self):
+        """
+        Nothing to preload; connections are opened lazily per process.
+        """
+
+    def data_version(self):
+        """
+        Version of the loaded data: the bulk loader's checkpoints.
+        Returns None when the checkpoint table does not exist.
+        """
+        try:
+            with self.factory.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT count(*), max(loaded_at) FROM load_checkpoint")
+                    count, loaded_at = cursor.fetchone()
+        except psycopg2.Error:
+            return None
+        return count, str(loaded_at)
+
+    def get_company_by_symbol(self, symbol):
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+
+        columns = ", ".join(COMPANY_COLUMNS)
+        try:
+            with self.factory.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"SELECT {columns} FROM company_info "
+                        f"WHERE symbol = %s LIMIT 1", (symbol,))
+                    row = cursor.fetchone()
+            if row is None:
+                raise LookupError(f"{symbol} not found")
+        except Exception as e:
+            raise RuntimeError(f"Failed to query company by symbol: {e}")
+
+        company = dict(zip(COMPANY_COLUMNS.values(), row))
+        company["Market Cap"] = parse_market_cap(company["Market Cap"])
+        return pd.Series(company, dtype=object)
+
+    def get_company_df(self):
+        """
+        Return the whole company_info table, typed like the CSV one.
+        """
+        columns = ", ".join(COMPANY_COLUMNS)
+        try:
+            with self.factory.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"SELECT {columns} FROM company_info "
+                                   f"ORDER BY symbol")
+                    rows = cursor.fetchall()
+        except psycopg2.Error as e:
+            raise RuntimeError(f"Failed to query company_info: {e}")
+        return prepare_company_df(
+            pd.DataFrame(rows, columns=list(COMPANY_COLUMNS.values())))
+
+    def get_all_stock_data(self):
+        """
+        Return every stock row, ordered by (Company Name, Date).
+        """
+        names = list(STOCK_COLUMNS.values())
+        query = (f"SELECT {', '.join(STOCK_COLUMNS)} FROM stock_market_data "
+                 f"ORDER BY company_name, date")
+        rows = []
+        for batch in self._iter_rows(query, [], self.batch_size):
+            rows.extend(batch)
+        return sort_stock_df(stock_frame(rows, names))
+
+    def _iter_rows(self, query, params, batch_size):
+        """
+        Yield batches of rows from a named (server-side) cursor.
+        """
+        try:
+            with self.factory.connection() as conn:
+                with conn.cursor(name="stock_data_cursor") as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield rows
+        except psycopg2.Error as e:
+            raise RuntimeError(f"Failed to query stock data: {e}")
+
+    def _iter_stock_rows(self, company_name, batch_size, start, end,
+                         columns):
+        """
+        Yield (rows, names) batches of one company's stock rows.
+        """
+        query, params, names = stock_query(company_name, start, end,
+                                           columns, placeholder="%s")
+        for rows in self._iter_rows(query, params, batch_size):
+            yield rows, names
+
+    def iter_stock_data_by_company(self, company_name, batch_size=None,
+                                   start=None, end=None, columns=None):
+        """
+        Yield the company's stock rows as DataFrames of batch_size rows.
+        A server-side cursor keeps memory bounded. The date range and
+        column list are applied in the query itself.
+        """
+        for rows, names in self._iter_stock_rows(
+                company_name, batch_size or self.batch_size, start, end,
+                columns):
+            yield stock_frame(rows, names)
+
+    def get_stock_data_by_company(self, company_name, start=None, end=None,
+                                  columns=None):
+        # Typed once over all rows, so the categoricals share categories
+        rows = []
+        for batch, _ in self._iter_stock_rows(company_name, self.batch_size,
+                                              start, end, columns):
+            rows.extend(batch)
+        names = select_columns(columns) or list(STOCK_COLUMNS.values())
+        return stock_frame(rows, names)
@@ -0,0 +1,259 @@
+# ======================================================
+# 📄 FILE: feature_store.py
+# PURPOSE: Incremental feature engineering for appended trading days
+# EXPECTED:
+# - Persist the engineered feature rows of each ticker
+# - Keep the last five rows as the rolling state for new days
+# - Update only the new rows and the five rows before them
+# RULES:
+# - Finalized rows are append-only fixed-width column files
+# - The manifest (row count + rolling state) is the commit point
+# - Results match a full recompute of load_and_prepare_data
+# OUTCOME:
+# - Daily refresh cost scales with new rows, not history length
+# ======================================================
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import load_env
+from pipeline import ENGINEERED_COLUMNS, add_return_features
+
+# Load environment variables
+load_env()
+
+# Default directory for the persisted feature files
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "features")
+
+# Rows whose 5D Future Return still waits for future closes
+PENDING_ROWS = 5
+
+MANIFEST_FILE = "manifest.json"
+STORE_FORMAT_VERSION = 2
+
+# Dates are stored as int64 seconds
+DATE_DTYPE = "datetime64[s]"
+
+
+def column_file(column):
+    return column.lower().replace(" ", "_") + ".bin"
+
+
+def _layout(stock_df):
+    """
+    Return (dtypes, constants): the on-disk dtype of every numeric
+    column, and the single value of each text column (Name, ...).
+    """
+    dtypes, constants = {}, {}
+    for name in stock_df.columns:
+        series = stock_df[name]
+        if name == "Date":
+            dtypes[name] = "int64"
+        elif pd.api.types.is_numeric_dtype(series):
+            dtypes[name] = str(series.dtype)
+        else:
+            values = series.astype(str).unique()
+            if len(values) > 1:
+                raise ValueError(f"Column {name} must hold one value "
+                                 f"per ticker")
+            constants[name] = str(values[0]) if len(values) else None
+    return dtypes, constants
+
+
+class FeatureStore:
+    """
+    One directory per ticker: a binary file per numeric column holds
+    the finalized rows, and manifest.json their committed count plus
+    the last PENDING_ROWS rows (the rolling state), stored exactly.
+    """
+
+    def __init__(self, root=FEATURE_STORE_DIR):
+        self.root = root
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, symbol)
+
+    def _read_manifest(self, symbol):
+        path = os.path.join(self._dir(symbol), MANIFEST_FILE)
+        try:
+            with open(path) as handle:
+                manifest = json.load(handle)
+        except FileNotFoundError:
+            return None
+        # Older formats are rebuilt from the stock rows
+        if manifest.get("version") != STORE_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def has(self, symbol):
+        return self._read_manifest(symbol) is not None
+
+    def last_date(self, symbol):
+        """
+        Return the latest stored Date (as an ISO string) for symbol.
+        """
+        dates = self._read_manifest(symbol)["pending"]["Date"]
+        return dates[-1] if dates else None
+
+    def build(self, symbol, stock_df):
+        """
+        Compute features over the full history and persist them.
+        """
+        stock_df = stock_df.sort_values("Date", kind="stable").copy()
+        stock_df["Date"] = stock_df["Date"].astype(str)
+        stock_df = add_return_features(stock_df)
+
+        directory = self._dir(symbol)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        dtypes, constants = _layout(stock_df)
+        manifest = {"version": STORE_FORMAT_VERSION, "rows": 0,
+                    "columns": list(stock_df.columns), "dtypes": dtypes,
+                    "constants": constants}
+        self._write(symbol, manifest, self._arrays(stock_df, manifest))
+
+    def append(self, symbol, new_rows):
+        """
+        Add new trading days for symbol, touching only the tail.
+        Rows dated on or before the stored history are ignored.
+
+        The tail is a handful of rows, so it is handled as plain arrays
+        rather than DataFrames.
+        """
+        manifest = self._read_manifest(symbol)
+        pending = self._read_pending(manifest)
+        new_rows = new_rows.sort_values("Date", kind="stable")
+        new_rows = self._arrays(new_rows, manifest)
+        known = len(pending["Date"])
+        if known:
+            newer = new_rows["Date"] > pending["Date"][-1]
+            new_rows = {name: values[newer]
+                        for name, values in new_rows.items()}
+        added = len(new_rows["Date"])
+        if not added:
+            return 0
+
+        tail = {name: np.concatenate([pending[name], new_rows[name]])
+                for name in manifest["columns"]}
+        # Same float64 arithmetic as add_return_features
+        close = tail["Close"].astype(np.float64)
+
+        # New rows: daily return from the previous close, volatility
+        # from the last five returns (the pending rows hold four of them)
+        returns = np.full(len(close), np.nan)
+        returns[1:] = close[1:] / close[:-1] - 1
+        returns[:known] = pending["Daily Return"]
+        tail["Daily Return"] = returns
+        volatility = np.full(len(close), np.nan)
+        if len(close) >= 5:
+            volatility[4:] = sliding_window_view(returns, 5).std(
+                axis=1, ddof=1)
+        volatility[:known] = pending["5D Volatility"]
+        tail["5D Volatility"] = volatility
+
+        # Pending and new rows: close five rows ahead over today's close
+        future = np.full(len(close), np.nan)
+        future[:-PENDING_ROWS] = close[PENDING_ROWS:] / close[
+            :-PENDING_ROWS] - 1
+        tail["5D Future Return"] = future
+
+        self._write(symbol, manifest, tail)
+        return added
+
+    def load(self, symbol):
+        """
+        Return the finalized feature rows, as load_and_prepare_data
+        would before merging Market Cap. Numeric columns are read-only
+        memory-maps of the column files, so nothing is parsed.
+        """
+        manifest = self._read_manifest(symbol)
+        if manifest is None:
+            raise LookupError(f"No stored features for {symbol}")
+        rows = manifest["rows"]
+        data = {}
+        for name in manifest["columns"]:
+            if name in manifest["constants"]:
+                value = manifest["constants"][name]
+                data[name] = pd.Categorical.from_codes(
+                    np.zeros(rows, dtype=np.int8),
+                    categories=[] if value is None else [value])
+                continue
+            dtype = manifest["dtypes"][name]
+            path = os.path.join(self._dir(symbol), column_file(name))
+            values = (np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+                      if rows else np.empty(0, dtype=dtype))
+            if name == "Date":
+                values = values.view(DATE_DTYPE)
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    @staticmethod
+    def _arrays(stock_df, manifest):
+        """
+        The frame's columns as arrays of the stored dtypes; Date and
+        text columns as strings. Missing feature columns are NaN.
+        """
+        arrays = {}
+        for name in manifest["columns"]:
+            if name not in stock_df.columns:
+                arrays[name] = np.full(len(stock_df), np.nan)
+            elif name == "Date" or name in manifest["constants"]:
+                arrays[name] = stock_df[name].astype(str).to_numpy(object)
+            else:
+                arrays[name] = stock_df[name].to_numpy(
+                    manifest["dtypes"][name])
+        return arrays
+
+    @staticmethod
+    def _read_pending(manifest):
+        return {name: np.array(manifest["pending"][name],
+                               dtype=(object if name == "Date" or
+                                      name in manifest["constants"]
+                                      else manifest["dtypes"][name]))
+                for name in manifest["columns"]}
+
+    def _write(self, symbol, manifest, rows):
+        """
+        Split rows (arrays by column) into finalized rows and the new
+        pending rows. Finalized rows are appended past the committed
+        end of every column file, then committed with the pending rows
+        in one manifest replace; rows past the committed count are a
+        torn append and are overwritten by the next one.
+        """
+        pending = {name: values[-PENDING_ROWS:]
+                   for name, values in rows.items()}
+        complete = np.ones(max(len(rows["Date"]) - PENDING_ROWS, 0),
+                           dtype=bool)
+        for name in ENGINEERED_COLUMNS:
+            complete &= ~np.isnan(rows[name][:len(complete)])
+
+        directory = self._dir(symbol)
+        base = manifest["rows"]
+        for name, dtype in manifest["dtypes"].items():
+            values = rows[name][:len(complete)][complete]
+            if name == "Date":
+                values = values.astype(DATE_DTYPE).view("int64")
+            path = os.path.join(directory, column_file(name))
+            with open(path, "ab") as handle:
+                handle.truncate(base * np.dtype(dtype).itemsize)
+                handle.write(np.ascontiguousarray(values,
+                                                  dtype=dtype).tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        # tolist() upcasts float32 exactly, so the state round-trips
+        manifest = dict(manifest, rows=base + int(complete.sum()),
+                        pending={name: values.tolist()
+                                 for name, values in pending.items()})
+        path = os.path.join(directory, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump(manifest, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
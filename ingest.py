@@ -0,0 +1,247 @@
+# ======================================================
+# 📄 FILE: ingest.py
+# PURPOSE: Streaming ingestion of stock CSVs larger than memory
+# EXPECTED:
+# - Read the stock CSV in chunks with explicit, downcast dtypes
+# - Spill each ticker's rows to its own partition file on disk
+# - Serve one ticker at a time through the CSVClient interface
+# RULES:
+# - Chunk size is derived from a configurable memory budget
+#   (an estimate from a sample, not a hard limit)
+# - Never materialize the full table during ingestion
+# OUTCOME:
+# - Peak memory bounded by the chunk size, not the CSV size
+# ======================================================
+
+import json
+import os
+import shutil
+from functools import lru_cache
+
+import pandas as pd
+
+from config import load_env
+from csv_cache import ColumnarCache, same_source, source_fingerprint
+from pipeline import CSV_CACHE_DIR, CSVClient, source_version
+from schema import (STOCK_SCHEMA, apply_schema, prepare_stock_df,
+                    read_options)
+
+# Load environment variables
+load_env()
+
+# Peak memory budget (in MB) for one ingestion chunk
+STOCK_INGEST_MAX_MB = int(os.getenv("STOCK_INGEST_MAX_MB", "256"))
+
+# Explicit dtypes for stock_market_data, declared in schema.py
+STOCK_DTYPES = STOCK_SCHEMA
+
+# Directory holding one partition file per ticker
+STOCK_PARTITION_DIR = os.getenv("STOCK_PARTITION_DIR", "partitions")
+
+# Partition files keep the source's full (float64) price precision;
+# loads apply the float32 STOCK_SCHEMA unless asked for this one
+PRECISE_SCHEMA = {column: "float64" if dtype == "float32" else dtype
+                  for column, dtype in STOCK_SCHEMA.items()}
+
+# Fingerprint of the CSV a partition store was ingested from
+SOURCE_FILE = "source.json"
+
+# Heuristic: parsing needs about this many times the parsed chunk's
+# size in scratch space. Not measured per file, so the budget can be
+# exceeded for unusual rows; lower STOCK_INGEST_MAX_MB to compensate
+PARSE_OVERHEAD = 3
+SAMPLE_ROWS = 10000
+
+
+def estimate_chunk_rows(csv_path, max_memory_mb=None, schema=STOCK_DTYPES):
+    """
+    Return roughly how many CSV rows fit in the memory budget at once.
+    The per-row cost is measured on a small sample of the file; the
+    parse scratch space is the PARSE_OVERHEAD estimate.
+    """
+    max_memory_mb = max_memory_mb or STOCK_INGEST_MAX_MB
+    sample = pd.read_csv(csv_path, nrows=SAMPLE_ROWS,
+                         **read_options(schema))
+    if sample.empty:
+        return SAMPLE_ROWS
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    budget = max_memory_mb * 1024 * 1024 / PARSE_OVERHEAD
+    return max(1, int(budget // bytes_per_row))
+
+
+def iter_stock_chunks(csv_path, max_memory_mb=None, schema=STOCK_DTYPES):
+    """
+    Yield the stock CSV as typed, validated chunks within the budget.
+    """
+    chunk_rows = estimate_chunk_rows(csv_path, max_memory_mb, schema)
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows,
+                             **read_options(schema)):
+        yield prepare_stock_df(chunk, schema)
+
+
+def empty_stock_df():
+    """
+    Return an empty frame with the stock_market_data columns.
+    """
+    return pd.DataFrame({column: pd.Series(dtype=dtype)
+                         for column, dtype in STOCK_DTYPES.items()})
+
+
+class StockPartitionStore:
+    """
+    One CSV partition file per ticker, written by a streaming ingest.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, symbol):
+        return os.path.join(self.root, f"{symbol}.csv")
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.root)
+                      if name.endswith(".csv"))
+
+    def is_current(self, csv_path):
+        """
+        Check that the partitions were ingested from csv_path as it is
+        on disk now.
+        """
+        try:
+            with open(os.path.join(self.root, SOURCE_FILE)) as handle:
+                source = json.load(handle)
+        except (OSError, ValueError):
+            return False
+        return same_source(source, csv_path)
+
+    def ingest(self, csv_path, max_memory_mb=None):
+        """
+        Stream csv_path into per-ticker partitions and return the row
+        count. Partitions are built aside and swapped in at the end.
+        """
+        tmp_root = f"{self.root}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        os.makedirs(tmp_root)
+        source = source_fingerprint(csv_path)
+
+        rows = 0
+        for chunk in iter_stock_chunks(csv_path, max_memory_mb,
+                                       PRECISE_SCHEMA):
+            for symbol, part in chunk.groupby("Name", observed=True):
+                path = os.path.join(tmp_root, f"{symbol}.csv")
+                part.to_csv(path, mode="a", index=False,
+                            header=not os.path.exists(path))
+            rows += len(chunk)
+        with open(os.path.join(tmp_root, SOURCE_FILE), "w") as handle:
+            json.dump(source, handle)
+
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.replace(tmp_root, self.root)
+        return rows
+
+    def load(self, symbol, columns=None, schema=STOCK_DTYPES):
+        """
+        Load one ticker's rows, or an empty frame for unknown tickers.
+        Only the given columns are parsed when columns is set; pass
+        schema=PRECISE_SCHEMA for float64 prices.
+        """
+        path = self.path_for(symbol)
+        if not os.path.exists(path):
+            stock_df = empty_stock_df()
+            return stock_df if columns is None else stock_df[columns]
+        return apply_schema(pd.read_csv(path, usecols=columns,
+                                        **read_options(schema)),
+                            schema)
+
+
+class PartitionIndex:
+    """
+    StockIndex counterpart that reads stock rows from partitions.
+    """
+
+    def __init__(self, company_df, partitions):
+        self.company_df = company_df
+        self.partitions = partitions
+        self._symbol_rows = {symbol: position for position, symbol
+                             in enumerate(company_df["Symbol"])}
+        self._company_symbols = {}
+        for name, symbol in zip(company_df["Company Name"],
+                                company_df["Symbol"]):
+            self._company_symbols.setdefault(name, []).append(symbol)
+
+    def get_company_row(self, symbol):
+        position = self._symbol_rows.get(symbol)
+        if position is None:
+            return None
+        return self.company_df.iloc[position]
+
+    def get_stock_slice(self, company_name, start=None, end=None,
+                        columns=None):
+        symbols = self._company_symbols.get(company_name, [])
+        # Date is always parsed for ordering and the range filter
+        read_columns = None if columns is None else list(
+            dict.fromkeys(["Date", *columns]))
+        frames = [self.partitions.load(symbol, read_columns)
+                  for symbol in symbols]
+        if not frames:
+            stock_df = empty_stock_df()
+            return stock_df if columns is None else stock_df[columns]
+        stock_df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        stock_df = stock_df.sort_values("Date", kind="stable")
+        if start is not None:
+            stock_df = stock_df[stock_df["Date"] >= start]
+        if end is not None:
+            stock_df = stock_df[stock_df["Date"] <= end]
+        return stock_df if columns is None else stock_df[columns]
+
+
+class PartitionedCSVClient(CSVClient):
+    """
+    CSVClient that loads one ticker at a time from a partition store.
+    """
+
+    def __init__(self, partitions, cache=None):
+        super().__init__(cache=cache)
+        self.partitions = partitions
+
+    def get_stock_df(self):
+        """
+        Materialize every partition; prefer repository lookups instead.
+        """
+        frames = [self.partitions.load(symbol)
+                  for symbol in self.partitions.symbols()]
+        if not frames:
+            return empty_stock_df()
+        return pd.concat(frames, ignore_index=True)
+
+    def data_version(self):
+        """
+        Ingest swaps in a new partition directory, changing its stat.
+        """
+        company_version, _ = super().data_version()
+        return company_version, source_version(self.partitions.root)
+
+    def get_stock_index(self):
+        return self._memoized("stock_index", lambda: PartitionIndex(
+            self.get_company_df(), self.partitions))
+
+
+class PartitionedClientFactory:
+    """
+    Factory Pattern: one PartitionedCSVClient per process.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_client():
+        return PartitionedCSVClient(
+            StockPartitionStore(STOCK_PARTITION_DIR),
+            cache=ColumnarCache(CSV_CACHE_DIR))
+
+
+if __name__ == "__main__":
+    store = StockPartitionStore(STOCK_PARTITION_DIR)
+    total = store.ingest(os.getenv("STOCK_CSV_PATH"))
+    print(f"Ingested {total} rows into {STOCK_PARTITION_DIR}")
@@ -0,0 +1,203 @@
+# ======================================================
+# 📄 FILE: instrumentation.py
+# PURPOSE: Per-stage timing and memory metrics for the hot path
+# EXPECTED:
+# - Spans/decorators around loading, lookups, features, strategies
+#   and model fitting
+# - Record wall time, rows processed and memory per stage: the RSS
+#   change over the stage, the process RSS high-water mark, and the
+#   stage's own traced peak when tracemalloc is running
+# - Write one JSON line per stage to a metrics file
+# - Optional cProfile + tracemalloc capture for a whole run
+# RULES:
+# - Disabled unless PIPELINE_METRICS_FILE is set in .env
+# - When disabled a decorated call costs one flag check
+# OUTCOME:
+# - Slow runs can be attributed to a stage instead of guessed at
+# ======================================================
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from config import load_env
+
+# Load environment variables
+load_env()
+
+
+class _Settings:
+    """
+    Module-wide switches, read from the environment at import time.
+    """
+    metrics_file = os.getenv("PIPELINE_METRICS_FILE")
+    profile = os.getenv("PIPELINE_PROFILE", "0") == "1"
+    enabled = bool(metrics_file)
+
+
+settings = _Settings()
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def configure(metrics_file=None, profile=False):
+    """
+    Turn metrics on (metrics_file set) or off at runtime.
+    """
+    settings.metrics_file = metrics_file
+    settings.profile = profile
+    settings.enabled = bool(metrics_file)
+
+
+def _max_rss_mb():
+    """
+    Process-wide RSS high-water mark; it never goes down, so it is not
+    a per-stage figure.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _rss_bytes():
+    """
+    Current resident set size, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as handle:
+            resident = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident * _PAGE_SIZE
+
+
+def _row_count(value):
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+def _write(record):
+    line = json.dumps(record, default=str)
+    with _write_lock:
+        with open(settings.metrics_file, "a") as handle:
+            handle.write(line + "\n")
+
+
+@contextmanager
+def span(stage, **fields):
+    """
+    Time a block as one stage. The yielded dict may be updated with
+    extra fields, e.g. span_info["rows"] = len(frame).
+    """
+    if not settings.enabled:
+        yield {}
+        return
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    info = dict(fields)
+    frame = {"child_peak": 0}
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # Keep the parent's peak before resetting it for this stage
+        if stack:
+            stack[-1]["child_peak"] = max(stack[-1]["child_peak"],
+                                          tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    stack.append(frame)
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        wall = time.perf_counter() - start
+        rss_after = _rss_bytes()
+        stack.pop()
+        record = {
+            "stage": stage,
+            "wall_ms": round(wall * 1000, 3),
+            "rows": info.pop("rows", None),
+            "rss_delta_mb": (None if rss_before is None
+                             or rss_after is None else
+                             round((rss_after - rss_before) / 2 ** 20, 3)),
+            "max_rss_mb": _max_rss_mb(),
+            "depth": len(stack),
+            "pid": os.getpid(),
+            "ts": time.time(),
+        }
+        if tracing:
+            peak = max(tracemalloc.get_traced_memory()[1],
+                       frame["child_peak"])
+            record["traced_peak_mb"] = round(peak / 2 ** 20, 3)
+            if stack:
+                stack[-1]["child_peak"] = max(stack[-1]["child_peak"], peak)
+        record.update(info)
+        _write(record)
+
+
+def timed(stage):
+    """
+    Decorator: run the function inside span(stage). Rows are taken
+    from the result, or else from the first DataFrame argument.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.enabled:
+                return func(*args, **kwargs)
+            with span(stage) as info:
+                result = func(*args, **kwargs)
+                rows = _row_count(result)
+                if rows is None:
+                    rows = next((_row_count(arg) for arg in args
+                                 if _row_count(arg) is not None), None)
+                info["rows"] = rows
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(name):
+    """
+    Capture cProfile stats and tracemalloc top allocations for a run
+    when PIPELINE_PROFILE=1. Files go next to the metrics file.
+    """
+    if not (settings.enabled and settings.profile):
+        yield
+        return
+
+    directory = os.path.dirname(os.path.abspath(settings.metrics_file))
+    prefix = os.path.join(directory, f"{name}-{int(time.time())}")
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        with span(f"run.{name}"):
+            yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{prefix}.prof")
+        snapshot = tracemalloc.take_snapshot()
+        with open(f"{prefix}.tracemalloc.txt", "w") as handle:
+            for stat in snapshot.statistics("lineno")[:25]:
+                handle.write(f"{stat}\n")
+        if started_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,235 @@
+# ======================================================
+# 📄 FILE: loaders/bulkloader.py
+# PURPOSE: Bulk upload of the CSV data into PostgreSQL
+# EXPECTED:
+# - Stream DataFrames through COPY FROM STDIN into a staging table
+# - Merge staging rows with INSERT ... ON CONFLICT DO NOTHING
+# - Load ticker partitions in parallel from a connection pool
+# - Record finished partitions in a checkpoint table to resume
+# - Key checkpoints on the partition contents and date range, so a
+#   changed source is uploaded again instead of skipped
+# RULES:
+# - Run from the project root: python -m loaders.bulkloader
+# - Connection details come from .env only
+# - Prices are uploaded at the source's float64 precision
+# OUTCOME:
+# - Full uploads in minutes instead of hours, safely restartable
+# ======================================================
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+from psycopg2.pool import ThreadedConnectionPool
+
+from config import load_env
+from csv_cache import file_hash
+from ingest import PRECISE_SCHEMA, STOCK_PARTITION_DIR, StockPartitionStore
+
+# Load environment variables
+load_env()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+COMPANY_INFO_CSV = os.getenv("COMPANY_INFO_CSV_PATH")
+STOCK_MARKET_CSV = os.getenv("STOCK_CSV_PATH")
+BULK_LOAD_WORKERS = int(os.getenv("BULK_LOAD_WORKERS", "4"))
+
+# Hex digits of the content hash kept in a checkpoint key
+KEY_HASH_LENGTH = 16
+
+# CSV column -> table column, in COPY order
+COMPANY_COLUMNS = {
+    "Symbol": "symbol",
+    "Company Name": "company_name",
+    "Industry": "industry",
+    "Market Cap": "market_cap",
+}
+STOCK_COLUMNS = {
+    "Date": "date",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume",
+    "Name": "name",
+    "Company Name": "company_name",
+}
+
+CHECKPOINT_DDL = """
+    CREATE TABLE IF NOT EXISTS load_checkpoint (
+        table_name TEXT NOT NULL,
+        partition_key TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (table_name, partition_key)
+    )
+"""
+
+
+def ensure_checkpoint_table(conn):
+    """
+    Create the checkpoint table used to resume interrupted uploads.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(CHECKPOINT_DDL)
+    conn.commit()
+
+
+def completed_partitions(conn, table):
+    """
+    Return the partitions of table that were already loaded.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT partition_key FROM load_checkpoint WHERE table_name = %s",
+            (table,))
+        return {row[0] for row in cursor.fetchall()}
+
+
+def partition_key(store, symbol):
+    """
+    Checkpoint key of one ticker partition: its date range plus a hash
+    of its contents, so re-ingested or extended data gets a new key.
+    """
+    dates = store.load(symbol, columns=["Date"])["Date"]
+    digest = file_hash(store.path_for(symbol))[:KEY_HASH_LENGTH]
+    return f"{symbol}:{dates.min()}:{dates.max()}:{digest}"
+
+
+def copy_frame(cursor, df, table, columns):
+    """
+    COPY df into a temporary staging table, then merge it into table.
+    Returns the number of newly inserted rows.
+    """
+    column_list = ", ".join(columns.values())
+    cursor.execute(f"CREATE TEMP TABLE staging (LIKE {table}) "
+                   f"ON COMMIT DROP")
+
+    buffer = io.StringIO()
+    df[list(columns)].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY staging ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    cursor.execute(f"INSERT INTO {table} ({column_list}) "
+                   f"SELECT {column_list} FROM staging "
+                   f"ON CONFLICT DO NOTHING")
+    return cursor.rowcount
+
+
+def load_partition(pool, table, partition, df, columns):
+    """
+    Load one partition and its checkpoint row in a single transaction.
+    """
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            inserted = copy_frame(cursor, df, table, columns)
+            cursor.execute(
+                "INSERT INTO load_checkpoint "
+                "(table_name, partition_key, row_count) VALUES (%s, %s, %s)",
+                (table, partition, len(df)))
+        conn.commit()
+        return inserted
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def load_company_info(pool, csv_path=COMPANY_INFO_CSV):
+    """
+    Upload company_info as a single partition.
+    """
+    conn = pool.getconn()
+    try:
+        done = completed_partitions(conn, "company_info")
+    finally:
+        pool.putconn(conn)
+    key = f"all:{file_hash(csv_path)[:KEY_HASH_LENGTH]}"
+    if key in done:
+        print("  ⏭️ company_info already loaded.")
+        return 0
+
+    company_df = pd.read_csv(csv_path)
+    inserted = load_partition(pool, "company_info", key, company_df,
+                              COMPANY_COLUMNS)
+    print(f"  💾 Inserted {inserted} rows into company_info.")
+    return inserted
+
+
+def load_stock_market_data(pool, store, workers=BULK_LOAD_WORKERS):
+    """
+    Upload every ticker partition that has no checkpoint yet.
+    Returns a dict of symbol -> error message for failed partitions.
+    """
+    conn = pool.getconn()
+    try:
+        done = completed_partitions(conn, "stock_market_data")
+    finally:
+        pool.putconn(conn)
+
+    keys = {symbol: partition_key(store, symbol)
+            for symbol in store.symbols()}
+    pending = [symbol for symbol, key in keys.items() if key not in done]
+    print(f"  ⏭️ Skipping {len(keys) - len(pending)} loaded partitions, "
+          f"{len(pending)} to go.")
+
+    def upload(symbol):
+        return load_partition(pool, "stock_market_data", keys[symbol],
+                              store.load(symbol, schema=PRECISE_SCHEMA),
+                              STOCK_COLUMNS)
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(upload, symbol): symbol
+                   for symbol in pending}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                inserted = future.result()
+                print(f"  💾 {symbol}: inserted {inserted} rows.")
+            except Exception as e:
+                errors[symbol] = str(e)
+                print(f"  ❌ {symbol}: {e}")
+    return errors
+
+
+def open_pool(workers=BULK_LOAD_WORKERS):
+    """
+    Create a thread-safe pool with one connection per worker.
+    """
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL is missing")
+    pool = ThreadedConnectionPool(1, workers + 1, DATABASE_URL)
+    conn = pool.getconn()
+    try:
+        ensure_checkpoint_table(conn)
+    finally:
+        pool.putconn(conn)
+    return pool
+
+
+def prepare_partitions(csv_path=STOCK_MARKET_CSV):
+    """
+    Return the ticker partition store, ingesting the CSV when the
+    partitions are missing or were built from a different version.
+    """
+    store = StockPartitionStore(STOCK_PARTITION_DIR)
+    if not store.is_current(csv_path):
+        print("📂 Splitting stock CSV into ticker partitions...")
+        rows = store.ingest(csv_path)
+        print(f"✅ Partitioned {rows} rows.")
+    return store
+
+
+if __name__ == "__main__":
+    pool = open_pool()
+    try:
+        load_company_info(pool)
+        load_stock_market_data(pool, prepare_partitions())
+    finally:
+        pool.closeall()
@@ -11,15 +11,35 @@
 # OUTCOME:
 # - Learn to architect modular apps with pattern-based structure
 # ======================================================
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import contextmanager
+
 import pandas as pd
 
-from pipeline import CSVClientFactory, CompanyRepository, is_valid_symbol
-import tkinter as tk
-from tkinter import simpledialog
-from models import Company, StockRecord
-from utils import StrategyContext, calculate_average_close, filter_high_volume, sort_by_close
+from pipeline import (CSV_CACHE_DIR, STOCK_MARKET_CSV, CSVClient,
+                      CSVClientFactory, CompanyRepository, get_repository,
+                      is_valid_symbol)
+from models import Company, StockRecordBatch
+from utils import (StrategyPipeline, AverageCloseStrategy, HighVolumeStrategy,
+                   TopCloseStrategy)
 from pipeline import load_and_prepare_data
-from ml_model import ReturnPredictor
+from ml_model import FEATURES
+from model_store import ModelStore
+from instrumentation import profile_run, timed
+from result_cache import RESULT_CACHE
+from report_generator import (PDFReport, REPORT_OUTPUT_DIR, RECENT_ROWS,
+                              init_worker, render_chart)
+
+# Tk, sklearn, fpdf and the optional backends are imported where they
+# are used, so headless commands start without them
+
+# Subcommands of the command line interface
+COMMANDS = ("report", "predict", "ingest", "gui")
 
 
 class StockAnalysisService:
@@ -28,61 +48,460 @@ class StockAnalysisService:
     Handles input, validation, transformation, and reporting.
     """
 
-    def __init__(self, company_repo):
+    def __init__(self, company_repo, cache=RESULT_CACHE):
         self.repo = company_repo
+        # Per-symbol report results, invalidated when the data changes
+        self.cache = cache
 
-    def run_report_for_symbol(self, symbol):
+    def analyze_symbol(self, symbol, loaded=None):
+        """
+        Fetch one symbol's data and run the report strategies.
+        Returns the company, first record and strategy results.
+        loaded is a (company row, stock data) pair from load_symbol
+        that the caller already holds; it is fetched when needed.
+        """
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid stock symbol format: {symbol}")
 
-        # TODO: Generate PDF using injected strategy and singleton
+        def compute():
+            company_row, stock_df = loaded or self.load_symbol(symbol)
+            return self._analyze_symbol(stock_df, company_row)
 
-        if not is_valid_symbol(symbol):
-            print("Invalid stock symbol format.")
-            return
+        report = self.cache.get_or_compute(
+            ("report", symbol), compute, version=self.repo.data_version())
+        return dict(report)
 
-        # TODO: Wrap company, fetch and map stock data
+    def load_symbol(self, symbol):
+        """
+        Return the company row and stock data of symbol.
+        """
         company_by_symbol = self.repo.get_company_by_symbol(symbol)
-        # if not company_by_symbol:
-        #     print("Company not found.")
-        #     return
+        # Get timeseries of stock data
+        stock_data_timeseries = self.repo.get_stock_data_by_company(
+            company_name=company_by_symbol["Company Name"])
+        return company_by_symbol, stock_data_timeseries
+
+    @timed("service.analyze_symbol")
+    def _analyze_symbol(self, stock_data_timeseries, company_by_symbol):
+        # TODO: Wrap company, fetch and map stock data
 
         company_details = Company(symbol=company_by_symbol["Symbol"],
                                   name=company_by_symbol["Company Name"],
                                   industry=company_by_symbol["Industry"],
                                   market_cap=company_by_symbol["Market Cap"])
-        print(company_details)
 
-        # Get timeseries of stock data
-        stock_data_timeseries = self.repo.get_stock_data_by_company(company_name=company_by_symbol["Company Name"])
-        # print(stock_data_timeseries.head(3))
+        # Wrap only the first row; the record is all the report uses
+        record = StockRecordBatch.from_frame(
+            stock_data_timeseries.iloc[:1])[0]
+
+        # TODO: Filter/sort if needed, then calculate average
+        # One StrategyPipeline pass computes the average close, the
+        # high-volume days and the five highest closes
+        strategies = StrategyPipeline()
+        strategies.register("average_close", AverageCloseStrategy())
+        strategies.register("high_volume",
+                            HighVolumeStrategy(threshold=50000000))
+        strategies.register("top_closes",
+                            TopCloseStrategy(k=5, descending=True))
+        results = strategies.run(stock_data_timeseries)
 
-        # Convert row to dict
-        record_data = stock_data_timeseries.iloc[0].to_dict()
+        return {
+            "company": company_details,
+            "record": record,
+            **results,
+        }
 
-        # Create StockRecord object
-        record = StockRecord(record_data)
-        # print(record.summary())
+    def run_report_for_symbol(self, symbol, pdf=False):
+        """
+        Print the report of one symbol; with pdf=True also write it to
+        REPORT_OUTPUT_DIR.
+        """
+        # TODO: Generate PDF using injected strategy and singleton
 
-        # TODO: Filter/sort if needed, then calculate average
-        # Using StrategyContext to calculate average close
-        context = StrategyContext(strategy=calculate_average_close)
-        average = context.execute(stock_data_timeseries)
+        if not is_valid_symbol(symbol):
+            print("Invalid stock symbol format.")
+            return
 
-        # Using StrategyContext to indicate where volume is over threshold
-        context = StrategyContext(strategy=filter_high_volume)
-        high_volume = context.execute(stock_data_timeseries, threshold=50000000)
+        loaded = self.load_symbol(symbol)
+        report = self.analyze_symbol(symbol, loaded)
+        print(report["company"])
+        print(f"Average close price: {round(report['average_close'], 2)}")
+        print(report["high_volume"].head(5))
+        print(report["top_closes"]['Close'])
 
-        # Using StrategyContext to sort close price
-        context = StrategyContext(strategy=sort_by_close)
-        close_sorted = context.execute(stock_data_timeseries, descending=False)
+        if pdf:
+            os.makedirs(REPORT_OUTPUT_DIR, exist_ok=True)
+            path = self.write_pdf_report(symbol, REPORT_OUTPUT_DIR,
+                                         loaded=loaded)
+            print(f"PDF report: {path}")
 
-        print(f"Average close price: {round(average, 2)}")
-        print(high_volume.head(5))
-        print(close_sorted['Close'].head(5))
+    def write_pdf_report(self, symbol, output_dir=REPORT_OUTPUT_DIR,
+                         charts=False, loaded=None):
+        """
+        Write <output_dir>/<symbol>_report.pdf and return its path.
+        The symbol's data is fetched once unless loaded is given.
+        """
+        loaded = loaded or self.load_symbol(symbol)
+        report = self.analyze_symbol(symbol, loaded)
+        stock_df = loaded[1]
 
-        pass
+        chart_path = render_chart(symbol, stock_df) if charts else None
+        recent = StockRecordBatch.from_frame(stock_df.tail(RECENT_ROWS))
+        stats = {
+            "High-volume days": len(report["high_volume"]),
+            "Top closes": ", ".join(
+                f"{close:.2f}" for close in report["top_closes"]["Close"]),
+        }
+        pdf = PDFReport(report["company"], recent, report["average_close"],
+                        stats=stats, chart_path=chart_path)
+        return pdf.write(os.path.join(output_dir, f"{symbol}_report.pdf"))
 
+    def summarize_symbol(self, symbol):
+        """
+        Compact, picklable version of analyze_symbol for batch runs.
+        """
+        report = self.analyze_symbol(symbol)
+        return {
+            "company": str(report["company"]),
+            "average_close": float(report["average_close"]),
+            "high_volume_days": len(report["high_volume"]),
+            "top_closes": report["top_closes"]["Close"].tolist(),
+        }
+
+    def run_reports(self, symbols, workers=1, shared=False):
+        """
+        Run the report for many symbols across a process pool.
+
+        Stock data is loaded once in this process; forked workers
+        inherit it read-only instead of receiving pickled frames.
+        With shared=True the tables are published to shared memory and
+        fresh workers attach to them (see shared_table).
+        Returns {"results": {symbol: summary}, "errors": {symbol: msg}}.
+        """
+        batch = {"results": {}, "errors": {}}
+        self.repo.preload()
+
+        if workers <= 1:
+            for symbol in symbols:
+                _collect(batch, *_run_summary((self, symbol)))
+            return batch
+
+        with _worker_pool(self, workers, shared=shared) as executor:
+            for outcome in executor.map(_run_worker_summary, symbols,
+                                        chunksize=8):
+                _collect(batch, *outcome)
+        return batch
+
+    def generate_pdf_reports(self, symbols, output_dir=REPORT_OUTPUT_DIR,
+                             workers=1, charts=False, shared=False):
+        """
+        Write one PDF per symbol across a process pool.
+
+        Returns {"results": {symbol: {"path", "seconds"}},
+                 "errors": {symbol: msg}, "wall_seconds": total}.
+        """
+        start = time.perf_counter()
+        batch = {"results": {}, "errors": {}}
+        os.makedirs(output_dir, exist_ok=True)
+        self.repo.preload()
+        jobs = [(symbol, output_dir, charts) for symbol in symbols]
+
+        if workers <= 1:
+            init_worker()
+            for job in jobs:
+                _collect(batch, *_run_pdf((self, job)))
+        else:
+            with _worker_pool(self, workers, init_worker,
+                              shared=shared) as executor:
+                for outcome in executor.map(_run_worker_pdf, jobs,
+                                            chunksize=4):
+                    _collect(batch, *outcome)
+
+        batch["wall_seconds"] = time.perf_counter() - start
+        return batch
+
+
+# Service used by worker processes, set by _worker_pool
+_worker_service = None
+
+
+def _run_summary(job):
+    service, symbol = job
+    try:
+        return symbol, service.summarize_symbol(symbol), None
+    except Exception as e:
+        return symbol, None, f"{type(e).__name__}: {e}"
+
+
+def _run_worker_summary(symbol):
+    service = _worker_service
+    if service is None:
+        # Spawned (not forked) workers build their own service
+        service = StockAnalysisService(get_repository())
+    return _run_summary((service, symbol))
+
+
+def _run_pdf(job):
+    service, (symbol, output_dir, charts) = job
+    start = time.perf_counter()
+    try:
+        path = service.write_pdf_report(symbol, output_dir, charts)
+    except Exception as e:
+        return symbol, None, f"{type(e).__name__}: {e}"
+    return symbol, {"path": path,
+                    "seconds": time.perf_counter() - start}, None
+
+
+def _run_worker_pdf(job):
+    service = _worker_service
+    if service is None:
+        service = StockAnalysisService(get_repository())
+    return _run_pdf((service, job))
+
+
+def _process_pool(workers, initializer=None, initargs=(),
+                  start_method=None):
+    """
+    Process pool that forks where possible, so workers inherit the
+    loaded data instead of reloading it.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if start_method is None:
+        start_methods = multiprocessing.get_all_start_methods()
+        start_method = "fork" if "fork" in start_methods else None
+    context = multiprocessing.get_context(start_method)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=initializer, initargs=initargs)
+
+
+def _attach_worker(descriptor, initializer=None):
+    """
+    Shared-memory pool initializer: serve from the published tables.
+    """
+    global _worker_service
+    from shared_table import SharedCSVClient
+
+    client = SharedCSVClient(descriptor)
+    _worker_service = StockAnalysisService(CompanyRepository(client))
+    if initializer is not None:
+        initializer()
+
+
+@contextmanager
+def _worker_pool(service, workers, initializer=None, shared=False):
+    """
+    Process pool whose workers run jobs against service's data.
+
+    Forked workers reach the service through a module global. Shared
+    workers are spawned and attach to the tables in shared memory, so
+    the stock table exists once however many workers run.
+    """
+    global _worker_service
+    if not shared:
+        _worker_service = service
+        try:
+            with _process_pool(workers, initializer) as executor:
+                yield executor
+        finally:
+            _worker_service = None
+        return
+
+    client = getattr(service.repo, "client", None)
+    if not isinstance(client, CSVClient):
+        raise ValueError("Shared memory workers need the CSV backend")
+    from shared_table import share_client_tables
+
+    tables, descriptor = share_client_tables(client)
+    try:
+        with _process_pool(workers, _attach_worker,
+                           (descriptor, initializer),
+                           start_method="spawn") as executor:
+            yield executor
+    finally:
+        for table in tables:
+            table.close()
+
+
+def _collect(batch, symbol, summary, error):
+    if error is None:
+        batch["results"][symbol] = summary
+    else:
+        batch["errors"][symbol] = error
+
+
+def run_batch_cli(args):
+    """
+    Headless batch mode: report on many symbols without the GUI.
+    """
+    symbols = [symbol.strip().upper()
+               for symbol in [*args.tickers, *args.symbols]]
+    if args.symbols_file:
+        with open(args.symbols_file) as handle:
+            symbols += [line.strip().upper() for line in handle
+                        if line.strip()]
+
+    if args.workers is None:
+        args.workers = max(1, min(os.cpu_count() or 1, len(symbols)))
+
+    service = StockAnalysisService(get_repository())
+    if args.pdf_dir:
+        return run_pdf_batch(service, symbols, args)
+    batch = service.run_reports(symbols, workers=args.workers,
+                                shared=args.shared_memory)
+
+    for symbol, summary in batch["results"].items():
+        print(f"{symbol}: average close {round(summary['average_close'], 2)}"
+              f", {summary['high_volume_days']} high-volume days")
+    for symbol, error in batch["errors"].items():
+        print(f"{symbol}: ERROR {error}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(batch, handle, indent=2)
+    return batch
+
+
+def run_pdf_batch(service, symbols, args):
+    """
+    Write PDF reports for every symbol and print the timings.
+    """
+    batch = service.generate_pdf_reports(symbols, args.pdf_dir,
+                                         workers=args.workers,
+                                         charts=args.charts,
+                                         shared=args.shared_memory)
+    seconds = [result["seconds"] for result in batch["results"].values()]
+    for symbol, error in batch["errors"].items():
+        print(f"{symbol}: ERROR {error}")
+    if seconds:
+        print(f"{len(seconds)} reports in {batch['wall_seconds']:.2f}s wall,"
+              f" {1000 * sum(seconds) / len(seconds):.1f} ms mean, "
+              f"{1000 * max(seconds):.1f} ms max per report")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(batch, handle, indent=2)
+    return batch
+
+
+def run_prediction(symbol, features=FEATURES, rows=5):
+    """
+    Predict the 5D Future Return of the last `rows` days of symbol
+    with its saved model, training one only if needed.
+    """
+    # Features beyond the defaults are computed as indicators
+    indicators = [name for name in features if name not in FEATURES]
+    stock_df = load_and_prepare_data(symbol, indicators=indicators)
+
+    # Reuses the saved model unless the data has changed
+    predictor = ModelStore().get_or_train(symbol, stock_df, features)
+    predictions = predictor.predict(stock_df[predictor.features].tail(rows))
+
+    print()
+    print("Sample Predictions:")
+    for i, pred in enumerate(predictions, 1):
+        print(f"Day {i}: Predicted 5D Future Return = {round(pred, 4)}")
+    return predictions
+
+
+def run_predict_cli(args):
+    """
+    Headless prediction for one symbol.
+    """
+    symbol = args.symbol.strip().upper()
+    if not is_valid_symbol(symbol):
+        raise SystemExit(f"Invalid stock symbol format: {symbol}")
+    predictions = run_prediction(symbol, args.features, args.rows)
+    if args.output:
+        pd.DataFrame(predictions).to_csv(args.output, index=False)
+    return predictions
+
+
+def run_ingest_cli(args):
+    """
+    Build the selected storage from the stock CSV.
+    """
+    if args.store == "cache":
+        client = CSVClientFactory.get_client()
+        rows = len(client.get_stock_index().stock_df)
+        print(f"Cached {rows} rows in {CSV_CACHE_DIR}")
+    elif args.store == "partitions":
+        from ingest import STOCK_PARTITION_DIR, StockPartitionStore
+        rows = StockPartitionStore(STOCK_PARTITION_DIR).ingest(
+            STOCK_MARKET_CSV, args.max_memory_mb)
+        print(f"Ingested {rows} rows into {STOCK_PARTITION_DIR}")
+    else:
+        from tick_store import TICK_STORE_DIR, TickStore
+        rows = TickStore(TICK_STORE_DIR).ingest(STOCK_MARKET_CSV,
+                                                args.max_memory_mb)
+        print(f"Stored {rows} rows in {TICK_STORE_DIR}")
+    return rows
+
+
+def parse_args(argv=None):
+    """
+    Parse `python -m main <command> ...`. The older flag-only form
+    (--symbols AAPL ...) runs the report command; no arguments at all
+    open the GUI.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        argv = ["gui"]
+    elif argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["report", *argv]
+
+    parser = argparse.ArgumentParser(prog="python -m main",
+                                     description="Stock analysis reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report",
+                                 help="Headless batch reports")
+    report.add_argument("tickers", nargs="*", metavar="SYMBOL",
+                        help="Symbols to report on")
+    report.add_argument("--symbols", nargs="*", default=[],
+                        help="Run headless batch reports for these symbols")
+    report.add_argument("--symbols-file",
+                        help="File with one symbol per line")
+    report.add_argument("--workers", type=int,
+                        help="Worker processes for batch reports "
+                             "(default: one per CPU, at most one per "
+                             "symbol)")
+    report.add_argument("--output", help="Write batch results as JSON")
+    report.add_argument("--pdf-dir",
+                        help="Write a PDF report per symbol to this folder")
+    report.add_argument("--charts", action="store_true",
+                        help="Include a close price chart in PDF reports")
+    report.add_argument("--shared-memory", action="store_true",
+                        help="Share the loaded tables with the workers "
+                             "through shared memory")
+
+    predict = commands.add_parser(
+        "predict", help="Predict the 5D future return of one symbol")
+    predict.add_argument("symbol")
+    predict.add_argument("--features", nargs="+", default=FEATURES,
+                         help="Model features: columns or indicator "
+                              "names such as 'RSI 14'")
+    predict.add_argument("--rows", type=int, default=5,
+                         help="Predict this many of the latest days")
+    predict.add_argument("--output", help="Write predictions as CSV")
+
+    ingest = commands.add_parser(
+        "ingest", help="Build a storage backend from the stock CSV")
+    ingest.add_argument("--store", default="cache",
+                        choices=["cache", "partitions", "tickstore"],
+                        help="Columnar CSV cache, per-ticker partitions "
+                             "or the memory-mapped tick store")
+    ingest.add_argument("--max-memory-mb", type=int,
+                        help="Memory budget per ingestion chunk")
+
+    commands.add_parser("gui", help="Ask for a symbol in a dialog")
+    return parser.parse_args(argv)
+
+
+def run_gui():
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
 
-if __name__ == "__main__":
     # GUI input
     root = tk.Tk()
     root.withdraw()
@@ -90,34 +509,35 @@ if __name__ == "__main__":
     symbol = symbol.strip().upper()
 
     # DI: Setup repository and service manually
-    client = CSVClientFactory.get_client()
-    repository = CompanyRepository(client)
+    repository = get_repository()
     service = StockAnalysisService(repository)
 
     if symbol:
-        service.run_report_for_symbol(symbol)
+        pdf = messagebox.askyesno("PDF report",
+                                  f"Also write a PDF report for {symbol}?")
+        service.run_report_for_symbol(symbol, pdf=pdf)
         
     # Machine Learning Model Operations
-    # TODO: Load and prepare the data by calling the pipeline function
-    stock_df = load_and_prepare_data(symbol)
-
-    # TODO: Instantiate and train the prediction model
-    predictor = ReturnPredictor()
-    predictor.train(stock_df)
-
-    # TODO: Select last N rows to simulate “new” data for prediction
-    prediction_input = stock_df[["Daily Return", "5D Volatility", "Market Cap"]].tail(5)
-
-    # TODO: Run predictions on these rows
-    predictions = predictor.predict(prediction_input)
-
-    print()
-    print("Sample Predictions:")
-    for i, pred in enumerate(predictions, 1):
-        print(f"Day {i}: Predicted 5D Future Return = {round(pred, 4)}")
+    # TODO: Load and prepare the data, train or load the model and
+    # predict the last 5 rows to simulate "new" data
+    predictions = run_prediction(symbol)
 
     # TODO: Add predictions to DataFrame and save results to CSV
     predictions_df = pd.DataFrame(predictions)
     predictions_df.to_csv('Predictions Result.csv', index=False)
 
-    pass
+
+def main(argv=None):
+    args = parse_args(argv)
+    handlers = {
+        "report": run_batch_cli,
+        "predict": run_predict_cli,
+        "ingest": run_ingest_cli,
+        "gui": lambda _: run_gui(),
+    }
+    with profile_run(args.command):
+        return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
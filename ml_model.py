@@ -13,28 +13,73 @@
 # - Understand ML abstraction via class-based design
 # ======================================================
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
+import pandas as pd
+
+from instrumentation import timed
+
+# Model inputs and target produced by pipeline.load_and_prepare_data
+FEATURES = ["Daily Return", "5D Volatility", "Market Cap"]
+TARGET = "5D Future Return"
+
+
+class LinearModel:
+    """
+    Fitted linear model from saved coefficients. Scoring needs only
+    NumPy, so loading a saved model never imports sklearn.
+    """
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
 
 class ReturnPredictor:
-    def __init__(self):
+    def __init__(self, features=FEATURES):
         # TODO: Initialize a LinearRegression model
-        self.model = LinearRegression()
+        # Created by train(); sklearn is imported only to fit a model
+        self.model = None
+        # Frame columns or indicator names (see indicators.py)
+        self.features = list(features)
         self.is_trained = False
+        self.mse = None
 
-        pass
+    @classmethod
+    def from_params(cls, coef, intercept, features, mse=None):
+        """
+        Rebuild a trained predictor from saved coefficients and the
+        test-set MSE it was saved with.
+        """
+        predictor = cls(features)
+        predictor.model = LinearModel(coef, intercept)
+        predictor.is_trained = True
+        predictor.mse = mse
+        return predictor
 
+    @timed("predictor.train")
     def train(self, stock_df):
+        """
+        Fit on the oldest 80% of rows and score on the newest 20%.
+        Returns the test-set metrics: {"mse": ..., "rmse": ...}.
+        """
+        from sklearn.linear_model import LinearRegression
+        from sklearn.metrics import mean_squared_error
+        from sklearn.model_selection import train_test_split
 
         # TODO: Extract X (features) and y (target)
-        X = stock_df[["Daily Return", "5D Volatility", "Market Cap"]]
-        y = stock_df["5D Future Return"]
+        X = stock_df[self.features]
+        y = stock_df[TARGET]
 
         # TODO: Split data into training and testing sets
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        # Chronological split: the test set is the most recent 20%, so
+        # the model never trains on days after the ones it is scored on
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, shuffle=False)
 
         # TODO: Fit the model on training data
+        self.model = LinearRegression()
         self.model.fit(X_train, y_train)
         self.is_trained = True
     
@@ -45,18 +90,98 @@ class ReturnPredictor:
         # The lower the MSE, the better your model is performing.
         y_pred = self.model.predict(X_test)
         mse = mean_squared_error(y_test, y_pred)
+        self.mse = mse
 
         # TODO: Print or log the MSE
-        return print(f"MSE on Test Set: {round(mse,4)}. RMSE on Test Set: {round(np.sqrt(mse))}")
+        rmse = float(np.sqrt(mse))
+        print(f"MSE on Test Set: {round(mse, 4)}. "
+              f"RMSE on Test Set: {round(rmse, 4)}")
+        return {"mse": float(mse), "rmse": rmse}
 
+    @timed("predictor.predict")
     def predict(self, input_df):
         # TODO: Predict using the trained model on new input features
         if not self.is_trained:
             raise RuntimeError("Model has not been trained yet. Call `train()` before `predict()`.")
 
-        required_features = ["Daily Return", "5D Volatility", "Market Cap"]
+        return self.model.predict(input_df[self.features])
 
-        return self.model.predict(input_df[required_features])
 
-    
-    
\ No newline at end of file
+class BatchedReturnPredictor:
+    """
+    One linear model per ticker, fitted for all tickers at once.
+
+    Each ticker's least-squares problem is solved through its own
+    (centered) normal equations, stacked into one batched solve, which
+    gives the same fit as a per-ticker LinearRegression on all rows.
+    """
+
+    def __init__(self, features=FEATURES, group_column="Name"):
+        self.features = list(features)
+        self.group_column = group_column
+        self.coefficients = None
+        self.mse = None
+
+    def _design(self, stock_df):
+        codes, groups = pd.factorize(stock_df[self.group_column])
+        X = stock_df[self.features].to_numpy(np.float64)
+        return codes, groups, X
+
+    @timed("batched_predictor.train")
+    def train(self, stock_df):
+        """
+        Fit every ticker in stock_df (e.g. load_and_prepare_universe).
+        Returns the coefficient frame and the per-ticker in-sample MSE.
+        """
+        codes, groups, X = self._design(stock_df)
+        y = stock_df[TARGET].to_numpy(np.float64)
+        counts = np.bincount(codes, minlength=len(groups))
+
+        # Center per ticker so the intercept separates out, as in sklearn
+        x_mean = np.stack([np.bincount(codes, X[:, j], len(groups))
+                           for j in range(X.shape[1])], axis=1)
+        x_mean /= counts[:, None]
+        y_mean = np.bincount(codes, y, len(groups)) / counts
+        Xc = X - x_mean[codes]
+        yc = y - y_mean[codes]
+
+        # Stacked normal equations: one (p x p) system per ticker
+        order = np.argsort(codes, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        Xs, ys = Xc[order], yc[order]
+        xtx = np.add.reduceat(Xs[:, :, None] * Xs[:, None, :], starts)
+        xty = np.add.reduceat(Xs * ys[:, None], starts)
+        coef = np.einsum("gij,gj->gi",
+                         np.linalg.pinv(xtx, rcond=1e-12), xty)
+        intercept = y_mean - np.einsum("gi,gi->g", x_mean, coef)
+
+        residuals = y - intercept[codes] - np.einsum("ij,ij->i", X,
+                                                     coef[codes])
+        mse = np.bincount(codes, residuals ** 2, len(groups)) / counts
+
+        self.coefficients = pd.DataFrame(
+            np.column_stack([intercept, coef]), index=groups,
+            columns=["Intercept"] + self.features)
+        self.mse = pd.Series(mse, index=groups, name="MSE")
+        return self.coefficients, self.mse
+
+    @timed("batched_predictor.predict")
+    def predict(self, input_df):
+        """
+        Score every row with its own ticker's model in one pass.
+        """
+        if self.coefficients is None:
+            raise RuntimeError("Model has not been trained yet. "
+                               "Call `train()` before `predict()`.")
+        params = self.coefficients.reindex(
+            input_df[self.group_column]).to_numpy()
+        X = input_df[self.features].to_numpy(np.float64)
+        return params[:, 0] + np.einsum("ij,ij->i", X, params[:, 1:])
+
+    def predict_latest(self, stock_df, rows=5):
+        """
+        Predict the last `rows` rows of every ticker.
+        """
+        latest = stock_df.groupby(self.group_column, sort=False,
+                                  observed=True).tail(rows)
+        return latest.assign(Prediction=self.predict(latest))
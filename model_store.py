@@ -0,0 +1,150 @@
+# ======================================================
+# 📄 FILE: model_store.py
+# PURPOSE: Persisted, versioned registry of trained ReturnPredictors
+# EXPECTED:
+# - Save trained models keyed by symbol, feature set and data
+# - Reload a saved model lazily instead of retraining it
+# - Detect and report when the training data has changed
+# RULES:
+# - Store only coefficients (NumPy .npz), never pickled objects
+# - Keep training logic in ml_model.py
+# OUTCOME:
+# - Warm predictions in milliseconds instead of a load-train cycle
+# ======================================================
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from config import load_env
+from ml_model import FEATURES, TARGET, ReturnPredictor
+
+# Load environment variables
+load_env()
+
+# Default directory for saved models
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", "saved_models")
+
+
+class StaleModelError(Exception):
+    """
+    Raised when a saved model was trained on different data.
+    """
+
+
+def data_fingerprint(stock_df, features=FEATURES):
+    """
+    Hash the feature and target values a model would be trained on.
+    """
+    columns = list(features) + [TARGET]
+    values = np.ascontiguousarray(stock_df[columns].to_numpy(np.float64))
+    digest = hashlib.sha1(values.tobytes())
+    digest.update(json.dumps(columns).encode())
+    return digest.hexdigest()
+
+
+def feature_key(features):
+    """
+    Short stable name for a feature set, used in file names.
+    """
+    return hashlib.sha1(json.dumps(list(features)).encode()).hexdigest()[:12]
+
+
+class ModelStore:
+    """
+    Saves one model file per (symbol, feature set) with a version
+    counter and the fingerprint of the data it was trained on.
+    """
+
+    def __init__(self, root=MODEL_STORE_DIR):
+        self.root = root
+        # (symbol, feature key) -> (fingerprint, version, predictor)
+        self._loaded = {}
+
+    def _path(self, symbol, features):
+        return os.path.join(self.root, symbol, f"{feature_key(features)}.npz")
+
+    def save(self, symbol, predictor, fingerprint):
+        """
+        Persist a trained predictor and return its new version number.
+        """
+        features = predictor.features
+        previous = self._read(symbol, features)
+        version = 1 if previous is None else previous["version"] + 1
+
+        path = self._path(symbol, features)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, coef=predictor.model.coef_,
+                 intercept=predictor.model.intercept_,
+                 features=np.asarray(features),
+                 fingerprint=fingerprint, version=version,
+                 mse=np.nan if predictor.mse is None else predictor.mse)
+        os.replace(tmp_path, path)
+
+        key = (symbol, feature_key(features))
+        self._loaded[key] = (fingerprint, version, predictor)
+        return version
+
+    def get(self, symbol, stock_df, features=FEATURES):
+        """
+        Return the saved predictor for symbol trained on stock_df.
+
+        Raises LookupError when no model is saved and StaleModelError
+        when the saved model was trained on different data.
+        """
+        fingerprint = data_fingerprint(stock_df, features)
+        key = (symbol, feature_key(features))
+        if key not in self._loaded:
+            saved = self._read(symbol, features)
+            if saved is None:
+                raise LookupError(f"No saved model for {symbol}")
+            predictor = ReturnPredictor.from_params(
+                saved["coef"], saved["intercept"], features, saved["mse"])
+            self._loaded[key] = (saved["fingerprint"], saved["version"],
+                                 predictor)
+
+        saved_fingerprint, version, predictor = self._loaded[key]
+        if saved_fingerprint != fingerprint:
+            raise StaleModelError(
+                f"Model v{version} for {symbol} was trained on different "
+                f"data (fingerprint {saved_fingerprint[:10]}, current data "
+                f"{fingerprint[:10]}); retrain it")
+        return predictor
+
+    def get_or_train(self, symbol, stock_df, features=FEATURES):
+        """
+        Return a predictor for stock_df, training one only if no
+        up-to-date model is saved.
+        """
+        try:
+            return self.get(symbol, stock_df, features)
+        except LookupError:
+            print(f"No saved model for {symbol}; training a new one.")
+        except StaleModelError as e:
+            print(f"{e}. Retraining.")
+
+        predictor = ReturnPredictor(features)
+        predictor.train(stock_df)
+        version = self.save(symbol, predictor,
+                            data_fingerprint(stock_df, features))
+        print(f"Saved model v{version} for {symbol}.")
+        return predictor
+
+    def _read(self, symbol, features):
+        path = self._path(symbol, features)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as saved:
+            # NaN marks a model saved without a test score; files from
+            # before mse was stored have no entry
+            mse = float(saved["mse"]) if "mse" in saved.files else np.nan
+            return {
+                "coef": saved["coef"],
+                "intercept": float(saved["intercept"]),
+                "fingerprint": str(saved["fingerprint"]),
+                "version": int(saved["version"]),
+                "mse": None if np.isnan(mse) else mse,
+            }
@@ -10,7 +10,12 @@
 # - Learn reusable data models with encapsulation
 # ======================================================
 
+import numpy as np
+
+
 class Company:
+    __slots__ = ("symbol", "name", "industry", "market_cap")
+
     def __init__(self, symbol, name, industry, market_cap):
         # Validate symbol
         if isinstance(symbol, str):
@@ -40,20 +45,99 @@ class Company:
         # TODO: Return a string like "Apple Inc. (AAPL) - Tech, $2T"
         return f"{self.name} ({self.symbol}) - {self.industry}, ${self.market_cap}T"
 
+
+def _to_price(value):
+    # Missing or falsy values fall back to 0.0, as in the record dicts
+    return round(float(value or 0.0), 2)
+
+
 class StockRecord:
+    __slots__ = ("date", "name", "open", "close", "high", "low", "volume")
+
     def __init__(self, record):
         # TODO: Extract fields from record dictionary and assign
         try:
-            self.date = record.get("Date", "Unknown")
-            self.name = record.get("Name", "Unknown")
-            self.open = round(float(record.get("Open", 0.0) or 0.0), 2)
-            self.close = round(float(record.get("Close", 0.0) or 0.0), 2)
-            self.high = round(float(record.get("High",0.0) or 0.0), 2)
-            self.low = round(float(record.get("Low", 0.0) or 0.0), 2)
-            self.volume = round(float(record.get("Volume", 0) or 0.0), 2)
+            self._assign(record.get("Date", "Unknown"),
+                         record.get("Name", "Unknown"),
+                         record.get("Open", 0.0), record.get("Close", 0.0),
+                         record.get("High", 0.0), record.get("Low", 0.0),
+                         record.get("Volume", 0))
         except KeyError as e:
             print(f"Missing key: {e}")
 
+    @classmethod
+    def from_values(cls, date, name, open, close, high, low, volume):
+        """
+        Build a record from field values without an intermediate dict.
+        """
+        record = cls.__new__(cls)
+        record._assign(date, name, open, close, high, low, volume)
+        return record
+
+    def _assign(self, date, name, open, close, high, low, volume):
+        self.date = date
+        self.name = name
+        self.open = _to_price(open)
+        self.close = _to_price(close)
+        self.high = _to_price(high)
+        self.low = _to_price(low)
+        self.volume = _to_price(volume)
+
     def summary(self):
         # TODO: Format a string showing open, close, volume for the day
-        return f"On {self.date} {self.name} opened at {self.open}, closed at {self.close}, volume was {self.volume}"
\ No newline at end of file
+        return f"On {self.date} {self.name} opened at {self.open}, closed at {self.close}, volume was {self.volume}"
+
+
+class StockRecordBatch:
+    """
+    Column-oriented collection of stock records.
+
+    Holds one NumPy array per field and hands out StockRecord objects
+    only when they are requested.
+    """
+    __slots__ = ("dates", "names", "open", "close", "high", "low",
+                 "volume")
+
+    def __init__(self, dates, names, open, close, high, low, volume):
+        self.dates = dates
+        self.names = names
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+
+    @classmethod
+    def from_frame(cls, stock_df):
+        """
+        Wrap the columns of a repository DataFrame (slice).
+        NumPy-backed columns are taken as zero-copy views; categorical
+        and string columns keep their pandas array, so a value is only
+        decoded when its record is requested.
+        """
+        def column(name, default):
+            if name not in stock_df.columns:
+                return np.full(len(stock_df), default, dtype=object)
+            series = stock_df[name]
+            if isinstance(series.dtype, np.dtype):
+                return series.to_numpy(copy=False)
+            return series.array
+
+        return cls(column("Date", "Unknown"), column("Name", "Unknown"),
+                   column("Open", 0.0), column("Close", 0.0),
+                   column("High", 0.0), column("Low", 0.0),
+                   column("Volume", 0))
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, position):
+        return StockRecord.from_values(
+            self.dates[position], self.names[position],
+            self.open[position], self.close[position],
+            self.high[position], self.low[position],
+            self.volume[position])
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
@@ -5,17 +5,34 @@
 
 import os
 import re
+import numpy as np
 import pandas as pd
-from dotenv import load_dotenv
 from functools import lru_cache
 
+from config import load_env
+from csv_cache import ColumnarCache, file_fingerprint
+from indicators import add_indicators
+from instrumentation import timed
+from result_cache import RESULT_CACHE
+from schema import (COMPANY_SCHEMA, STOCK_SCHEMA, format_date,
+                    prepare_company_df, prepare_stock_df, read_options,
+                    select_columns)
+from stock_index import INDEX_COLUMNS, StockIndex, sort_stock_df
+
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Read CSV paths from environment variables
 COMPANY_INFO_CSV = os.getenv("COMPANY_INFO_CSV_PATH")
 STOCK_MARKET_CSV = os.getenv("STOCK_CSV_PATH")
 
+# Repository backend: "csv" (default), "postgres", "partitions" or
+# "tickstore"
+DATA_BACKEND = os.getenv("DATA_BACKEND", "csv")
+
+# Directory for the columnar cache built from the CSV files
+CSV_CACHE_DIR = os.getenv("CSV_CACHE_DIR", ".csv_cache")
+
 
 # Factory to load DataFrames instead of DB connection
 class CSVClientFactory:
@@ -26,45 +43,114 @@ class CSVClientFactory:
     @staticmethod
     @lru_cache(maxsize=1)
     def get_client():
-        return CSVClient()
+        return CSVClient(cache=ColumnarCache(CSV_CACHE_DIR))
+
+
+def prepare_sorted_stock_df(stock_df):
+    """
+    Apply the stock schema and order rows by (Company Name, Date).
+    """
+    return sort_stock_df(prepare_stock_df(stock_df))
+
+
+def source_version(path):
+    """
+    Return (mtime_ns, size) of a source file, or None if unavailable.
+    """
+    try:
+        fingerprint = file_fingerprint(path)
+    except (OSError, TypeError):
+        return None
+    return fingerprint["mtime_ns"], fingerprint["size"]
+
 
 class CSVClient:
-    @lru_cache(maxsize=1)
+    def __init__(self, cache=None):
+        # Optional ColumnarCache; without one every load parses the CSV
+        self.cache = cache
+        # Loaded tables per instance: name -> (data version, value)
+        self._tables = {}
+
+    def data_version(self):
+        """
+        Version of the source data; changes when either CSV changes.
+        """
+        return (source_version(COMPANY_INFO_CSV),
+                source_version(STOCK_MARKET_CSV))
+
+    def _memoized(self, name, load):
+        """
+        Return the loaded table, reloading it when the data changed.
+        """
+        version = self.data_version()
+        loaded = self._tables.get(name)
+        if loaded is None or loaded[0] != version:
+            loaded = self._tables[name] = (version, load())
+        return loaded[1]
+
+    def get_derived(self, name, build):
+        """
+        Return a value built from this client's tables by build(),
+        rebuilt only when the data version changes.
+        """
+        return self._memoized(("derived", name), build)
+
     def get_company_df(self):
+        return self._memoized("company_df", self._load_company_df)
+
+    def get_stock_df(self):
+        return self._memoized("stock_df", self._load_stock_df)
+
+    def get_stock_index(self):
+        """
+        Build the symbol/company lookup index once per data version.
+        """
+        return self._memoized("stock_index", self._build_stock_index)
+
+    @timed("csv.get_company_df")
+    def _load_company_df(self):
         try:
-            company_df = pd.read_csv(COMPANY_INFO_CSV)
-            company_df = company_df.drop(columns=['Unnamed: 0'])
-
-            # Function to normalize market cap to billions
-            def normalize_market_cap(value):
-                value = str(value).replace(",", "").strip()
-                if value.endswith("T"):
-                    return float(value[:-1]) * 1000
-                elif value.endswith("B"):
-                    return float(value[:-1])
-                elif value.endswith("M"):
-                    return float(value[:-1]) / 1000
-                else:
-                    try:
-                        return float(value)
-                    except ValueError:
-                        return None  # or handle error/log
-
-            # Apply normalization
-            company_df["Market Cap"] = company_df["Market Cap"].apply(normalize_market_cap)
-
-            return company_df
+            if self.cache is not None:
+                return self.cache.load(COMPANY_INFO_CSV, "company_info",
+                                       prepare=prepare_company_df,
+                                       **read_options(COMPANY_SCHEMA))
+            return prepare_company_df(
+                pd.read_csv(COMPANY_INFO_CSV, **read_options(COMPANY_SCHEMA)))
         except Exception as e:
             raise IOError(f"Failed to load company CSV: {e}")
 
-    @lru_cache(maxsize=1)
-    def get_stock_df(self):
+    @timed("csv.get_stock_df")
+    def _load_stock_df(self):
         try:
-            stock_df = pd.read_csv(STOCK_MARKET_CSV)
-            return stock_df
+            if self.cache is not None:
+                return self._load_stock_columns(None)
+            stock_df = pd.read_csv(STOCK_MARKET_CSV,
+                                   **read_options(STOCK_SCHEMA))
+            return prepare_stock_df(stock_df)
         except Exception as e:
             raise IOError(f"Failed to load stock CSV: {e}")
 
+    def _load_stock_columns(self, columns):
+        """
+        Open only the given columns (None for all) of the cached table.
+        """
+        # Cached pre-sorted so the index build can skip the sort
+        return self.cache.load(STOCK_MARKET_CSV, "stock_market_data",
+                               prepare=prepare_sorted_stock_df,
+                               columns=columns,
+                               **read_options(STOCK_SCHEMA))
+
+    @timed("csv.get_stock_index")
+    def _build_stock_index(self):
+        if self.cache is None:
+            return StockIndex(self.get_company_df(), self.get_stock_df())
+        # Other columns are opened when a lookup first asks for them
+        try:
+            index_df = self._load_stock_columns(INDEX_COLUMNS)
+        except Exception as e:
+            raise IOError(f"Failed to load stock CSV: {e}")
+        return StockIndex(self.get_company_df(), index_df,
+                          load_columns=self._load_stock_columns)
 
 
 # Regex validation
@@ -86,6 +172,34 @@ class CompanyRepository:
         # TODO: Store connection and create a cursor
         self.client = client
 
+    def preload(self):
+        """
+        Load the tables and build the index ahead of batch work.
+        """
+        self.client.get_stock_index()
+
+    def data_version(self):
+        """
+        Version of the underlying data, used to invalidate results.
+        """
+        return self.client.data_version()
+
+    def get_company_df(self):
+        """
+        Return the whole company_info table.
+        """
+        return self.client.get_company_df()
+
+    def get_all_stock_data(self):
+        """
+        Return every stock row, ordered by (Company Name, Date).
+        """
+        stock_df = getattr(self.client.get_stock_index(), "stock_df", None)
+        if stock_df is None:
+            stock_df = sort_stock_df(self.client.get_stock_df())
+        return stock_df
+
+    @timed("repository.get_company_by_symbol")
     def get_company_by_symbol(self, symbol):
         # TODO: Validate symbol using regex
         if not is_valid_symbol(symbol):
@@ -93,32 +207,109 @@ class CompanyRepository:
 
         # TODO: Query company_info table by symbol
         # TODO: Handle any errors using try/except
-        company_df = self.client.get_company_df()
+        index = self.client.get_stock_index()
         try:
-            result = company_df[company_df['Symbol'] == symbol].iloc[0]
-            if result.empty:
-                return None
+            result = index.get_company_row(symbol)
+            if result is None:
+                raise LookupError(f"{symbol} not found")
             return result
         except Exception as e:
             raise RuntimeError(f"Failed to query company by symbol: {e}")
 
-    def get_stock_data_by_company(self, company_name):
+    @timed("repository.get_stock_data_by_company")
+    def get_stock_data_by_company(self, company_name, start=None, end=None,
+                                  columns=None):
+        """
+        Return the company's stock rows, optionally only the dates from
+        start to end (inclusive) and only the given columns.
+        """
         # TODO: Query stock_market_data table by company name
         # TODO: Return result list or handle errors
-        stock_df = self.client.get_stock_df()
+        columns = select_columns(columns)
+        index = self.client.get_stock_index()
         try:
-            result = stock_df[stock_df['Company Name'] == company_name]
+            # Rows are already ordered by date within the company
+            result = index.get_stock_slice(
+                company_name, start=format_date(start),
+                end=format_date(end), columns=columns)
             return result
         except Exception as e:
             raise RuntimeError(f"Failed to query stock data by company: {e}")
 
-        
-def load_and_prepare_data(symbol):
+
+def get_repository(backend=None):
+    """
+    Return the company repository for the configured data backend.
+    """
+    backend = backend or DATA_BACKEND
+    if backend == "csv":
+        return CompanyRepository(CSVClientFactory.get_client())
+    if backend == "postgres":
+        # Imported lazily so the CSV backend never needs psycopg2
+        from database import PostgresCompanyRepository
+        return PostgresCompanyRepository()
+    if backend == "partitions":
+        from ingest import PartitionedClientFactory
+        return CompanyRepository(PartitionedClientFactory.get_client())
+    if backend == "tickstore":
+        from tick_store import TickStoreClientFactory
+        return CompanyRepository(TickStoreClientFactory.get_client())
+    raise ValueError(f"Unknown data backend: {backend}")
+
+
+# Columns produced by add_return_features
+ENGINEERED_COLUMNS = ["Daily Return", "5D Volatility", "5D Future Return"]
+
+
+@timed("pipeline.add_return_features")
+def add_return_features(stock_df):
+    """
+    Add Daily Return, 5D Volatility and 5D Future Return per company.
+
+    stock_df must be sorted by (Company Name, Date). Every window and
+    shift is computed within one company, so no values leak across
+    the boundary between two companies.
+    """
+    groups = stock_df.groupby("Company Name", sort=False, observed=True)
+    # Prices are stored as float32; compute the features in float64
+    close = stock_df["Close"].astype("float64")
+    close_groups = close.groupby(stock_df["Company Name"], sort=False,
+                                 observed=True)
+
+    # Daily return: today's close over the previous close of the company
+    stock_df["Daily Return"] = close / close_groups.shift(1) - 1
+
+    # 5-day rolling volatility (standard deviation of daily returns)
+    stock_df["5D Volatility"] = (
+        groups["Daily Return"].rolling(window=5).std()
+        .reset_index(level=0, drop=True))
+
+    # 5-day future return: close five rows ahead over today's close
+    stock_df["5D Future Return"] = close_groups.shift(-5) / close - 1
+    return stock_df
+
+
+def add_requested_indicators(stock_df, indicators):
+    """
+    Add the named indicators (see indicators.py) that stock_df lacks
+    and drop the warm-up rows in which any of them is still missing.
+    """
+    names = [name for name in indicators if name not in stock_df.columns]
+    if not names:
+        return stock_df
+    return add_indicators(stock_df, names).dropna(subset=names)
+
+
+@timed("pipeline.load_and_prepare_data")
+def load_and_prepare_data(symbol, feature_store=None, indicators=()):
     """
     Skeleton for loading and preparing stock and company data.
     
-    :param stock_data_path: Path to the stock market data CSV.
-    :param company_info_path: Path to the company info CSV.
+    :param symbol: Ticker symbol to prepare.
+    :param feature_store: Optional feature_store.FeatureStore; when
+                          given, only days newer than the stored
+                          features are engineered.
+    :param indicators: Extra indicator names to add, e.g. "RSI 14".
     :return: Prepared and merged DataFrame.
     """
      #Either you choose a company you want to focus on or you choose top 3 companies
@@ -127,14 +318,32 @@ def load_and_prepare_data(symbol):
     if is_valid_symbol(symbol):
         print(f"{symbol} is a valid symbol")
 
-    # Get CSV client and repositories
-    client = CSVClientFactory.get_client()
-    repo = CompanyRepository(client)
+    # Get the repository for the configured backend
+    repo = get_repository()
+
+    # Reuse the prepared frame of an earlier call on the same data
+    indicators = tuple(indicators)
+    cache_key = ("prepared", symbol, indicators)
+    version = repo.data_version()
+    if feature_store is None:
+        cached = RESULT_CACHE.get(cache_key, version)
+        if cached is not None:
+            # Copy-on-write: edits to the shallow copy never reach the cache
+            return cached.copy(deep=False)
 
     # Get company record
     company_info = repo.get_company_by_symbol(symbol)
     company_name = company_info["Company Name"]
 
+    if feature_store is not None:
+        # Only days from the last stored one on need to be fetched
+        start = (feature_store.last_date(symbol)
+                 if feature_store.has(symbol) else None)
+        stock_df = repo.get_stock_data_by_company(company_name, start=start)
+        stock_df = update_feature_store(feature_store, symbol, stock_df)
+        stock_df["Market Cap"] = company_info["Market Cap"]
+        return add_requested_indicators(stock_df, indicators)
+
     # Get stock data for this company
     stock_df = repo.get_stock_data_by_company(company_name)
 
@@ -142,20 +351,76 @@ def load_and_prepare_data(symbol):
     stock_df = stock_df.sort_values(by=["Company Name", "Date"]).copy()
     stock_df["Date"] = pd.to_datetime(stock_df["Date"])
 
-    # TODO: Calculate daily return using pct_change()
-    stock_df["Daily Return"] = stock_df["Close"].pct_change()
-
-    # TODO: Calculate 5-day rolling volatility (standard deviation of daily returns)
-    stock_df["5D Volatility"] = stock_df["Daily Return"].rolling(window=5).std()
-
-    # TODO: Calculate 5-day future return (shift -5 and calculate percent change)
-    stock_df["5D Future Return"] = stock_df["Close"].shift(-5).pct_change(periods=5, fill_method=None)
+    # TODO: Calculate daily return, 5-day volatility and 5-day future return
+    stock_df = add_return_features(stock_df)
+    stock_df = add_requested_indicators(stock_df, indicators)
 
     # TODO: Validate rows with missing values in engineered columns
-    stock_df = stock_df.dropna(subset=["Daily Return", "5D Volatility", "5D Future Return"])
+    stock_df = stock_df.dropna(subset=ENGINEERED_COLUMNS)
 
     # TODO: Merge Market_Cap from company_info using Name = Symbol
     stock_df["Market Cap"] = company_info["Market Cap"]
 
     # TODO: Return the cleaned, merged DataFrame
+    RESULT_CACHE.put(cache_key, stock_df, version)
+    return stock_df.copy(deep=False)
+
+
+def update_feature_store(feature_store, symbol, stock_df):
+    """
+    Bring the stored features of symbol up to date with stock_df and
+    return them. Only rows after the stored history are processed.
+    """
+    if not feature_store.has(symbol):
+        feature_store.build(symbol, stock_df)
+    else:
+        last_date = feature_store.last_date(symbol)
+        new_rows = stock_df[stock_df["Date"].astype(str) > last_date]
+        feature_store.append(symbol, new_rows)
+    return feature_store.load(symbol)
+
+
+@timed("pipeline.load_and_prepare_universe")
+def load_and_prepare_universe(symbols=None, indicators=()):
+    """
+    Batch version of load_and_prepare_data for many tickers at once.
+
+    Features are computed in one grouped pass over the index's
+    (Company Name, Date) sorted frame instead of once per symbol.
+
+    :param symbols: Ticker symbols to include, or None for all.
+    :param indicators: Extra indicator names to add, computed for all
+                       tickers at once; betas are against the
+                       equal-weight index of the included tickers.
+    :return: Prepared DataFrame covering every requested company.
+    """
+    # Get the repository for the configured backend
+    repo = get_repository()
+    company_df = repo.get_company_df()
+
+    if symbols is None:
+        stock_df = repo.get_all_stock_data()
+    else:
+        # Tickers of one company share its rows; fetch them once
+        company_names = dict.fromkeys(
+            repo.get_company_by_symbol(symbol)["Company Name"]
+            for symbol in symbols)
+        stock_df = pd.concat([repo.get_stock_data_by_company(name)
+                              for name in company_names])
+
+    stock_df = stock_df.copy()
+    # Plain strings in, so a categorical Date still parses to datetime64
+    stock_df["Date"] = pd.to_datetime(np.asarray(stock_df["Date"]))
+    stock_df = add_return_features(stock_df)
+    stock_df = add_requested_indicators(stock_df, indicators)
+    stock_df = stock_df.dropna(subset=ENGINEERED_COLUMNS)
+
+    # Merge Market Cap from company_info by company name, as float64
+    # values rather than through the categorical Company Name
+    companies = company_df.drop_duplicates("Company Name")
+    market_caps = pd.Series(
+        companies["Market Cap"].to_numpy(np.float64),
+        index=np.asarray(companies["Company Name"], dtype=object))
+    stock_df["Market Cap"] = market_caps.reindex(
+        np.asarray(stock_df["Company Name"], dtype=object)).to_numpy()
     return stock_df
@@ -4,26 +4,207 @@
 # EXPECTED:
 # - Class for formatting and exporting reports
 # - Summary line and recent stock data
+# - Optional close-price chart, cached by a hash of its data
 # RULES:
 # - Handle errors, external packages (Unit 8)
+# - Fonts and layout are loaded once per process (Singleton)
+# - Reports are written to disk, never returned as bytes
 # OUTCOME:
 # - Build readable, exportable business reports
 # ======================================================
 
-from fpdf import FPDF
+import hashlib
+import os
+
+import numpy as np
+
+from config import load_env
+from instrumentation import timed
+
+# Load environment variables
+load_env()
+
+# Output directory for reports and cache directory for chart images
+REPORT_OUTPUT_DIR = os.getenv("REPORT_OUTPUT_DIR", "reports")
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", "charts")
+
+# Recent trading days listed in the report table
+RECENT_ROWS = 10
+
+
+class ReportTemplate:
+    """
+    Singleton: fonts and layout shared by every report of a process.
+    """
+    _instance = None
+
+    FONT = "Helvetica"
+    TABLE_COLUMNS = [("Date", 32), ("Open", 26), ("High", 26), ("Low", 26),
+                     ("Close", 26), ("Volume", 40)]
+
+    def __init__(self):
+        # fpdf is imported on first use, not when this module loads
+        from fpdf import FPDF
+        self.FPDF = FPDF
+        # Selecting each font once loads its metrics for the process
+        warmup = FPDF()
+        for style in ("", "B"):
+            warmup.set_font(self.FONT, style, 10)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+
+def init_worker():
+    """
+    Process pool initializer: load the template before the first job.
+    matplotlib stays unloaded until a chart is missing from the cache.
+    """
+    ReportTemplate.instance()
+
+
+def _load_pyplot():
+    """
+    Import matplotlib lazily: it is optional and slow to import.
+    Returns pyplot, or None when matplotlib is not installed.
+    """
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    return plt
+
+
+def chart_key(symbol, stock_df):
+    """
+    Hash of the data a chart is drawn from.
+    """
+    digest = hashlib.sha1(symbol.encode())
+    digest.update("|".join(stock_df["Date"].astype(str)).encode())
+    digest.update(np.ascontiguousarray(
+        stock_df["Close"].to_numpy(np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+@timed("report.render_chart")
+def render_chart(symbol, stock_df, cache_dir=CHART_CACHE_DIR):
+    """
+    Return a JPEG of the close price history, drawing it only if no
+    chart of the same data exists. Returns None without matplotlib.
+
+    JPEG rather than PNG: FPDF embeds JPEGs as-is but decodes PNG
+    alpha channels row by row in Python.
+    """
+    path = os.path.join(cache_dir, f"{chart_key(symbol, stock_df)}.jpg")
+    if os.path.exists(path):
+        return path
+    plt = _load_pyplot()
+    if plt is None:
+        return None
+
+    os.makedirs(cache_dir, exist_ok=True)
+    figure, axes = plt.subplots(figsize=(7, 2.6), dpi=100)
+    try:
+        axes.plot(np.asarray(stock_df["Date"], dtype="datetime64[D]"),
+                  stock_df["Close"].to_numpy(np.float64), linewidth=1)
+        axes.set_title(f"{symbol} close price")
+        axes.grid(alpha=0.3)
+        figure.tight_layout()
+        tmp_path = f"{path}.tmp-{os.getpid()}.jpg"
+        figure.savefig(tmp_path, pil_kwargs={"quality": 90})
+        os.replace(tmp_path, path)
+    finally:
+        plt.close(figure)
+    return path
+
+
+def _text(value):
+    # Core PDF fonts only cover Latin-1
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+def _volume_text(volume):
+    # Volume is float64 with NaN where the source had no value
+    if volume is None or np.isnan(volume):
+        return "n/a"
+    return str(int(volume))
+
 
 class PDFReport:
     """
     Generates a simple PDF report for stock summary.
     Contains company info and recent stock prices.
     """
-    def __init__(self, company, stock_records, avg_close):
+    def __init__(self, company, stock_records, avg_close, stats=None,
+                 chart_path=None):
         # TODO: Save params, initialize FPDF instance
-        pass
+        self.company = company
+        self.stock_records = stock_records
+        self.avg_close = avg_close
+        self.stats = stats or {}
+        self.chart_path = chart_path
+        self.template = ReportTemplate.instance()
+        self.pdf = self.template.FPDF()
 
     def generate(self, filename):
+        """
+        Write the report to filename. Returns filename, or None if the
+        PDF could not be created.
+        """
         try:
             # TODO: Add company summary and stock stats to PDF
-            pass
+            return self.write(filename)
         except Exception as e:
             print(f"PDF error: {e}")
+            return None
+
+    @timed("report.write_pdf")
+    def write(self, filename):
+        """
+        Build the PDF and write it to filename; errors are raised.
+        """
+        pdf = self.pdf
+        pdf.add_page()
+        self._add_summary()
+        if self.chart_path:
+            pdf.image(self.chart_path, w=180)
+            pdf.ln(4)
+        self._add_records()
+
+        # Write next to the target, then swap in the finished file
+        tmp_path = f"{filename}.tmp-{os.getpid()}"
+        pdf.output(tmp_path, "F")
+        os.replace(tmp_path, filename)
+        return filename
+
+    def _add_summary(self):
+        pdf, font = self.pdf, self.template.FONT
+        pdf.set_font(font, "B", 16)
+        pdf.cell(0, 10, _text(f"Stock report: {self.company.symbol}"), ln=1)
+        pdf.set_font(font, "", 11)
+        pdf.cell(0, 7, _text(self.company), ln=1)
+        pdf.cell(0, 7, f"Average close price: {round(self.avg_close, 2)}",
+                 ln=1)
+        for label, value in self.stats.items():
+            pdf.cell(0, 7, _text(f"{label}: {value}"), ln=1)
+        pdf.ln(4)
+
+    def _add_records(self):
+        pdf, font = self.pdf, self.template.FONT
+        columns = self.template.TABLE_COLUMNS
+        pdf.set_font(font, "B", 10)
+        for name, width in columns:
+            pdf.cell(width, 7, name, border=1)
+        pdf.ln()
+        pdf.set_font(font, "", 10)
+        for record in self.stock_records:
+            values = [str(record.date)[:10], record.open, record.high,
+                      record.low, record.close, _volume_text(record.volume)]
+            for (_, width), value in zip(columns, values):
+                pdf.cell(width, 7, _text(value), border=1)
+            pdf.ln()
@@ -0,0 +1,156 @@
+# ======================================================
+# 📄 FILE: result_cache.py
+# PURPOSE: Bounded cache for derived per-symbol results
+# EXPECTED:
+# - Cache prepared feature frames and report analytics per symbol
+# - Bound the cache by memory size (bytes), not entry count
+# - Expire entries after a TTL and when the source data changes
+# - Expose hit/miss statistics
+# RULES:
+# - Least recently used entries are evicted first
+# - Results larger than the whole budget are never stored
+# OUTCOME:
+# - Repeat requests for popular tickers skip the recomputation
+# ======================================================
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import load_env
+
+# Load environment variables
+load_env()
+
+# Memory budget in MB (0 disables caching) and entry lifetime in seconds
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "256"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "900"))
+
+
+def estimate_size(value):
+    """
+    Approximate memory footprint of a cached value in bytes.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item)
+            for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item)
+                                          for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache bounded by bytes, with a TTL per entry.
+
+    Every entry remembers the data version it was computed from;
+    looking it up with a different version drops it.
+    """
+
+    def __init__(self, max_bytes=None, ttl=None, clock=time.monotonic):
+        if max_bytes is None:
+            max_bytes = int(RESULT_CACHE_MAX_MB * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.ttl = RESULT_CACHE_TTL if ttl is None else ttl
+        self.clock = clock
+        self.size = 0
+        # key -> (value, size, expires_at, version), oldest use first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ["hits", "misses", "expired", "invalidated", "evicted"], 0)
+
+    def get(self, key, version=None):
+        """
+        Return the cached value, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counts["misses"] += 1
+                return None
+            value, _, expires_at, entry_version = entry
+            if entry_version != version:
+                self._drop(key)
+                self._counts["invalidated"] += 1
+                self._counts["misses"] += 1
+                return None
+            if self.clock() >= expires_at:
+                self._drop(key)
+                self._counts["expired"] += 1
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+            return value
+
+    def put(self, key, value, version=None):
+        """
+        Store value, evicting least recently used entries to fit.
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            while self.size + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._counts["evicted"] += 1
+            self._entries[key] = (value, size, self.clock() + self.ttl,
+                                  version)
+            self.size += size
+
+    def get_or_compute(self, key, compute, version=None):
+        """
+        Return the cached value for key, computing and storing it on a
+        miss. Concurrent misses may compute the value more than once.
+        """
+        value = self.get(key, version)
+        if value is None:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def invalidate(self, key=None):
+        """
+        Drop one entry, or every entry when key is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.size = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                **self._counts,
+                "hit_rate": self._counts["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _drop(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self.size -= size
+
+
+# Process-wide cache shared by the pipeline and the service layer
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,179 @@
+# ======================================================
+# 📄 FILE: schema.py
+# PURPOSE: Declared column types for the company_info and
+#          stock_market_data tables
+# EXPECTED:
+# - One schema per table: column -> dtype
+# - Vectorized "Market Cap" parsing ("2.1T", "350B", "900M")
+# - Validate tables when they are loaded
+# RULES:
+# - Symbols and company names are categoricals
+# - Prices are float32, volumes int64 (float64 with NaN for missing)
+# - Fail loudly (SchemaError) on a malformed table
+# OUTCOME:
+# - Faster loads and a much smaller stock table in memory
+# ======================================================
+
+import numpy as np
+import pandas as pd
+
+COMPANY_SCHEMA = {
+    "Symbol": "category",
+    "Company Name": "category",
+    "Industry": "category",
+    # Raw strings such as "2.1T"; parsed to billions by parse_market_cap
+    "Market Cap": "object",
+}
+
+STOCK_SCHEMA = {
+    # Kept as ISO strings; the pipeline converts to datetime per symbol
+    "Date": "object",
+    "Open": "float32",
+    "High": "float32",
+    "Low": "float32",
+    "Close": "float32",
+    "Adj Close": "float32",
+    # Missing volumes keep the column float64, see apply_schema
+    "Volume": "int64",
+    "Name": "category",
+    "Company Name": "category",
+}
+
+# Columns that must be present and non-null in every row
+COMPANY_KEYS = ["Symbol", "Company Name"]
+STOCK_KEYS = ["Date", "Name", "Company Name"]
+
+# Market Cap suffix -> multiplier to billions
+MARKET_CAP_MULTIPLIERS = {"T": 1000.0, "B": 1.0, "M": 0.001, "": 1.0}
+MARKET_CAP_PATTERN = (r"^([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+                      r"\s*([TBM]?)$")
+
+# Integer columns are parsed as float64 so blank and "1.5e6" cells
+# load; apply_schema casts them back once the values are checked
+PARSE_DTYPES = {"int64": "float64"}
+
+# Index column written by DataFrame.to_csv
+INDEX_COLUMN = "Unnamed: 0"
+
+
+class SchemaError(ValueError):
+    """
+    Raised when a table does not match its declared schema.
+    """
+
+
+def select_columns(columns):
+    """
+    Validate a requested stock column list; None means all columns.
+    """
+    if columns is None:
+        return None
+    columns = list(columns)
+    unknown = [column for column in columns if column not in STOCK_SCHEMA]
+    if unknown:
+        raise SchemaError(f"Unknown stock columns: {unknown}")
+    return columns
+
+
+def format_date(value):
+    """
+    Normalize a date bound to the ISO "YYYY-MM-DD" string used by the
+    Date column; None stays None.
+    """
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def parse_market_cap(values):
+    """
+    Convert Market Cap values to billions in one vectorized pass.
+    Values that cannot be parsed become NaN. A single value gives a
+    float, e.g. for one company row.
+    """
+    if pd.api.types.is_scalar(values):
+        return float(parse_market_cap([values]).iloc[0])
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = values.astype("string").str.replace(",", "", regex=False)
+    parts = text.str.strip().str.extract(MARKET_CAP_PATTERN)
+    number = pd.to_numeric(parts[0], errors="coerce")
+    multiplier = parts[1].map(MARKET_CAP_MULTIPLIERS)
+    return (number * multiplier).astype("float64")
+
+
+def read_options(schema):
+    """
+    Keyword arguments for pd.read_csv that apply schema while parsing.
+    Columns missing from the file are left for validation to report.
+    """
+    return {"dtype": {column: PARSE_DTYPES.get(dtype, dtype)
+                      for column, dtype in schema.items()}}
+
+
+def validate(df, schema, keys, table):
+    """
+    Check required columns and key columns; raise SchemaError if bad.
+    """
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise SchemaError(f"{table} is missing columns: {missing}")
+    null_keys = {column: int(count) for column, count
+                 in df[keys].isna().sum().items() if count}
+    if null_keys:
+        raise SchemaError(f"{table} has empty key values: {null_keys}")
+
+
+def _checked_integer_dtype(values, column):
+    """
+    Return int64 for float values that are all whole numbers, or None
+    (stay float64) when some are missing. Fractions are an error.
+    """
+    present = values.dropna().to_numpy()
+    if not np.array_equal(present, np.trunc(present)):
+        raise SchemaError(f"{column} has fractional values")
+    return "int64" if len(present) == len(values) else None
+
+
+def apply_schema(df, schema):
+    """
+    Cast the schema columns of df that do not have their dtype yet.
+    Integer columns with missing values stay float64 (NaN).
+    """
+    casts = {}
+    for column, dtype in schema.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        if dtype == "int64" and pd.api.types.is_float_dtype(df[column]):
+            dtype = _checked_integer_dtype(df[column], column)
+        if dtype is not None:
+            casts[column] = dtype
+    try:
+        return df.astype(casts) if casts else df
+    except (TypeError, ValueError) as e:
+        raise SchemaError(f"Cannot apply schema: {e}")
+
+
+def prepare_company_df(company_df):
+    """
+    Validate company_info, drop the CSV index column if present and
+    normalize "Market Cap" to billions.
+    """
+    if INDEX_COLUMN in company_df.columns:
+        company_df = company_df.drop(columns=[INDEX_COLUMN])
+    validate(company_df, COMPANY_SCHEMA, COMPANY_KEYS, "company_info")
+    if company_df["Symbol"].duplicated().any():
+        raise SchemaError("company_info has duplicate symbols")
+    company_df = apply_schema(company_df, COMPANY_SCHEMA)
+    company_df["Market Cap"] = parse_market_cap(company_df["Market Cap"])
+    return company_df
+
+
+def prepare_stock_df(stock_df, schema=STOCK_SCHEMA):
+    """
+    Validate stock_market_data and apply the declared dtypes (or those
+    of another stock schema, e.g. with float64 prices).
+    """
+    validate(stock_df, schema, STOCK_KEYS, "stock_market_data")
+    return apply_schema(stock_df, schema)
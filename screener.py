@@ -0,0 +1,242 @@
+# ======================================================
+# 📄 FILE: screener.py
+# PURPOSE: Cross-sectional screens over the whole stock table
+# EXPECTED:
+# - Date-major index: every ticker's row on a date as one slice
+# - Industry and market-cap buckets built from company_info
+# - Top N by any column or indicator on a date, per bucket
+# - Close crossing its N-day moving average between two sessions
+# RULES:
+# - Build the index once per data version, never per screen
+# - Screens touch one date slice, not every ticker's history
+# - History-based values (moving averages) are computed once
+# OUTCOME:
+# - "Top 20 by volume in Tech on D" without scanning the table
+# ======================================================
+
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorEngine
+from pipeline import CSVClientFactory
+from schema import format_date
+
+# Market cap buckets in billions: (name, lower bound), largest first
+CAP_BUCKETS = [("Mega", 200.0), ("Large", 10.0), ("Mid", 2.0),
+               ("Small", 0.3), ("Micro", 0.0)]
+
+
+def cap_bucket(market_caps):
+    """
+    Map Market Cap values (in billions) to CAP_BUCKETS names; unknown
+    values map to None.
+    """
+    market_caps = np.asarray(market_caps, dtype=np.float64)
+    buckets = np.full(len(market_caps), None, dtype=object)
+    # Smallest first, so larger buckets overwrite
+    for name, lower in reversed(CAP_BUCKETS):
+        buckets[market_caps >= lower] = name
+    return buckets
+
+
+def sort_by_ticker(stock_df):
+    """
+    Return stock_df ordered by (Company Name, Name, Date), so each
+    ticker's history is one run even when a company has several.
+    Frames that are already in order are returned unchanged.
+    """
+    keys = [pd.factorize(stock_df[column], sort=True)[0]
+            for column in ("Date", "Name", "Company Name")]
+    order = np.lexsort(keys)
+    if np.array_equal(order, np.arange(len(order))):
+        return stock_df
+    return stock_df.take(order)
+
+
+def _top_positions(keys, n):
+    """
+    Positions of the n smallest keys in order; NaN keys rank last.
+    """
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    n = min(n, len(keys))
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+    top = np.argpartition(keys, n - 1)[:n]
+    return top[np.argsort(keys[top], kind="stable")]
+
+
+class UniverseScreener:
+    """
+    Screens over a stock table sorted by (Company Name, Name, Date).
+
+    Rows stay in that ticker-major order; a permutation sorted by
+    (Date, ticker) serves as the date-major index, so a date's rows
+    are one contiguous run of it.
+    """
+
+    def __init__(self, company_df, stock_df):
+        self.stock_df = sort_by_ticker(stock_df)
+        self.engine = IndicatorEngine(self.stock_df, group_column="Name")
+
+        # Tickers and their company_info attributes
+        ticker_codes, self.symbols = pd.factorize(self.stock_df["Name"])
+        self._ticker_codes = ticker_codes
+        companies = company_df.drop_duplicates("Symbol").set_index(
+            "Symbol").reindex(np.asarray(self.symbols, dtype=object))
+        self.industries = np.asarray(companies["Industry"], dtype=object)
+        self.market_caps = companies["Market Cap"].to_numpy(np.float64)
+        self.cap_buckets = cap_bucket(self.market_caps)
+        self._buckets = {}
+        for kind, labels in (("industry", self.industries),
+                             ("cap", self.cap_buckets)):
+            for code, label in enumerate(labels):
+                self._buckets.setdefault((kind, label), []).append(code)
+
+        # Date-major index
+        date_codes, dates = pd.factorize(self.stock_df["Date"], sort=True)
+        self.dates = pd.Index(
+            pd.to_datetime(np.asarray(dates)).strftime("%Y-%m-%d"))
+        self._order = np.lexsort((ticker_codes, date_codes))
+        self._date_starts = np.searchsorted(date_codes[self._order],
+                                            np.arange(len(dates) + 1))
+
+    @classmethod
+    def from_client(cls, client):
+        """
+        Build a screener over the tables of a CSVClient-like client.
+        """
+        index = client.get_stock_index()
+        stock_df = getattr(index, "stock_df", None)
+        if stock_df is None:
+            stock_df = client.get_stock_df()
+        return cls(client.get_company_df(), stock_df)
+
+    # ---- Index lookups -----------------------------------------------
+
+    def _date_position(self, date):
+        """
+        Position of a trading date in self.dates; None means the last.
+        """
+        if date is None:
+            if not len(self.dates):
+                raise LookupError("The stock table is empty")
+            return len(self.dates) - 1
+        key = format_date(date)
+        position = self.dates.searchsorted(key)
+        if position == len(self.dates) or self.dates[position] != key:
+            raise LookupError(f"No trading data on {key}")
+        return position
+
+    def rows_on(self, date=None):
+        """
+        Ticker-major row positions of every ticker traded on date.
+        """
+        position = self._date_position(date)
+        start, stop = self._date_starts[position:position + 2]
+        return self._order[start:stop]
+
+    def bucket(self, industry=None, cap=None):
+        """
+        Boolean mask over tickers for an industry and/or cap bucket.
+        """
+        allowed = np.ones(len(self.symbols), dtype=bool)
+        for kind, label in (("industry", industry), ("cap", cap)):
+            if label is not None:
+                members = np.zeros(len(self.symbols), dtype=bool)
+                members[self._buckets.get((kind, label), [])] = True
+                allowed &= members
+        return allowed
+
+    def values(self, column):
+        """
+        A stock column or an indicator name (see indicators.py) as one
+        array over the whole table; indicators are computed once.
+        """
+        return self.engine.compute(column)
+
+    def _result(self, rows, **extra):
+        tickers = self._ticker_codes[rows]
+        result = self.stock_df.iloc[rows].assign(
+            Industry=self.industries[tickers],
+            **{"Market Cap": self.market_caps[tickers],
+               "Cap Bucket": self.cap_buckets[tickers]},
+            **extra)
+        return result.reset_index(drop=True)
+
+    # ---- Screens -----------------------------------------------------
+
+    def on_date(self, date=None, industry=None, cap=None):
+        """
+        Every ticker's row on date, optionally within one bucket.
+        """
+        rows = self.rows_on(date)
+        rows = rows[self.bucket(industry, cap)[self._ticker_codes[rows]]]
+        return self._result(rows)
+
+    def top(self, column, date=None, n=20, industry=None, cap=None,
+            ascending=False):
+        """
+        The n tickers with the highest (or lowest) column on date.
+
+        :param column: Stock column or indicator name, e.g. "Volume"
+                       or "RSI 14".
+        :param date: Trading date; None for the latest one.
+        :param industry: Only tickers of this Industry.
+        :param cap: Only tickers of this CAP_BUCKETS bucket.
+        """
+        rows = self.rows_on(date)
+        rows = rows[self.bucket(industry, cap)[self._ticker_codes[rows]]]
+        values = self.values(column)[rows]
+        rows = rows[_top_positions(values if ascending else -values, n)]
+        extra = ({} if column in self.stock_df.columns
+                 else {column: self.values(column)[rows]})
+        return self._result(rows, **extra)
+
+    def sma_crossovers(self, date=None, window=50, direction="up",
+                       industry=None, cap=None):
+        """
+        Tickers whose close crossed its window-day moving average from
+        the previous session to date.
+
+        :param direction: "up" (crossed above), "down" or "both".
+        """
+        if direction not in ("up", "down", "both"):
+            raise ValueError(f"Unknown crossover direction: {direction}")
+        rows = self.rows_on(date)
+        rows = rows[self.bucket(industry, cap)[self._ticker_codes[rows]]]
+        # The previous session is the previous row of the same ticker
+        rows = rows[self.engine.position[rows] > 0]
+
+        close = self.values("Close")
+        average = self.values(f"{window}D SMA")
+        above = close[rows] > average[rows]
+        was_above = close[rows - 1] > average[rows - 1]
+        known = ~np.isnan(average[rows]) & ~np.isnan(average[rows - 1])
+        crossed = {"up": above & ~was_above, "down": ~above & was_above,
+                   "both": above != was_above}[direction] & known
+
+        rows = rows[crossed]
+        return self._result(rows, **{f"{window}D SMA": average[rows],
+                                     "Crossed": np.where(above[crossed],
+                                                         "up", "down")})
+
+
+def get_screener(client=None):
+    """
+    Return the screener over client's tables (by default the CSV
+    client), rebuilt only when the data version changes.
+    """
+    client = client or CSVClientFactory.get_client()
+    return client.get_derived(
+        "screener", lambda: UniverseScreener.from_client(client))
+
+
+if __name__ == "__main__":
+    screener = get_screener()
+    date = screener.dates[-1]
+    print(f"Top 10 by volume on {date}:")
+    print(screener.top("Volume", date, n=10)[
+        ["Name", "Industry", "Cap Bucket", "Close", "Volume"]])
+    print("Crossed above their 50-day average:")
+    print(screener.sma_crossovers(date, window=50)[
+        ["Name", "Close", "50D SMA"]])
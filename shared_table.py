@@ -0,0 +1,214 @@
+# ======================================================
+# 📄 FILE: shared_table.py
+# PURPOSE: Share the loaded CSV "tables" between processes
+# EXPECTED:
+# - One process copies each table into shared memory once
+# - Typed column arrays; text columns as codes plus a string dictionary
+# - Workers attach zero-copy through the CSVClient interface
+# RULES:
+# - Attached columns are read-only views of the shared block
+# - Text columns attach as categoricals with a sorted dictionary
+# - The publishing process owns (closes and unlinks) the blocks
+# OUTCOME:
+# - N worker processes hold one copy of the stock table, not N
+# ======================================================
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from csv_cache import code_dtype
+from pipeline import CSVClient
+
+# Column offsets inside a block are aligned to this many bytes
+ALIGNMENT = 8
+
+
+def _encode_column(series):
+    """
+    Return (values, entry): the array stored in shared memory and the
+    metadata needed to rebuild the column from it.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return (series.cat.codes.to_numpy(),
+                {"kind": "category",
+                 "categories": series.cat.categories.tolist()})
+    if pd.api.types.is_datetime64_dtype(series):
+        values = series.to_numpy()
+        return values.view("int64"), {"kind": "datetime",
+                                      "dtype": str(values.dtype)}
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(), {"kind": "numeric"}
+    # Sorted dictionary: code order matches the order of the strings
+    codes, categories = pd.factorize(series, sort=True)
+    return (codes.astype(code_dtype(categories)),
+            {"kind": "category", "categories": categories.tolist()})
+
+
+def _decode_column(values, entry):
+    if entry["kind"] == "category":
+        # Codes were validated when published; skipping it keeps the
+        # shared array instead of a checked copy
+        return pd.Categorical.from_codes(
+            values, dtype=pd.CategoricalDtype(entry["categories"]),
+            validate=False)
+    if entry["kind"] == "datetime":
+        return values.view(entry["dtype"])
+    return values
+
+
+def _open_block(name):
+    """
+    Attach to an existing block without handing it to this process's
+    resource tracker, which would unlink it when the process exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks; forked/spawned pool workers
+        # share the owner's tracker, so the block is not unlinked early
+        return shared_memory.SharedMemory(name=name)
+
+
+class _BlockView:
+    """
+    Array interface over part of an attached block. Arrays made from
+    it (and every view of them) keep the block, so the mapping is
+    released only when the last of them is gone.
+    """
+
+    def __init__(self, block, values):
+        self.block = block
+        interface = dict(values.__array_interface__)
+        interface["data"] = (interface["data"][0], True)  # read-only
+        self.__array_interface__ = interface
+
+
+class SharedTable:
+    """
+    Owner side: a copy of one DataFrame in a shared memory block.
+
+    The descriptor is a small picklable dict; pass it to worker
+    processes and open it there with AttachedTable. The row index is
+    not shared: attached frames get a RangeIndex.
+    """
+
+    def __init__(self, df):
+        encoded = [(name, *_encode_column(df[name])) for name in df.columns]
+
+        columns, size = [], 0
+        for name, values, entry in encoded:
+            size += -size % ALIGNMENT
+            entry.update(name=name, offset=size, storage=str(values.dtype))
+            columns.append(entry)
+            size += values.nbytes
+
+        # Zero-sized blocks are not allowed
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (_, values, _), entry in zip(encoded, columns):
+            target = np.ndarray(values.shape, dtype=values.dtype,
+                                buffer=self.shm.buf, offset=entry["offset"])
+            target[:] = values
+        self.descriptor = {"block": self.shm.name, "rows": len(df),
+                           "columns": columns}
+
+    def close(self):
+        """
+        Release the block; attached workers must have detached first.
+        """
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AttachedTable:
+    """
+    Worker side: a read-only DataFrame over a SharedTable's block.
+    The block stays mapped while any column of the frame is in use.
+    """
+
+    def __init__(self, descriptor):
+        self.shm = _open_block(descriptor["block"])
+        rows = descriptor["rows"]
+        columns = {}
+        for entry in descriptor["columns"]:
+            values = np.asarray(_BlockView(self.shm, np.ndarray(
+                (rows,), dtype=entry["storage"], buffer=self.shm.buf,
+                offset=entry["offset"])))
+            columns[entry["name"]] = _decode_column(values, entry)
+        self.frame = pd.DataFrame(columns, copy=False)
+        self._check_zero_copy()
+
+    def _check_zero_copy(self):
+        """
+        Fail loudly if pandas copied a column out of the block, which
+        would give every worker a private copy of it.
+        """
+        block = np.ndarray((self.shm.size,), dtype=np.uint8,
+                           buffer=self.shm.buf)
+        for name in self.frame.columns:
+            column = self.frame[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                values = column.array.codes
+            else:
+                values = column.to_numpy(copy=False)
+            if len(values) and not np.shares_memory(values, block):
+                raise RuntimeError(f"Column {name} was copied out of "
+                                   f"shared memory")
+
+
+def share_client_tables(client):
+    """
+    Publish the company and stock tables of a loaded CSVClient.
+
+    Returns (tables, descriptor): the SharedTable objects the caller
+    must close when done, and the picklable descriptor for workers.
+    """
+    stock_df = getattr(client.get_stock_index(), "stock_df", None)
+    if stock_df is None:
+        raise ValueError("Shared tables need an in-memory stock table")
+    company = SharedTable(client.get_company_df())
+    try:
+        stock = SharedTable(stock_df)
+    except BaseException:
+        company.close()
+        raise
+    descriptor = {"company_df": company.descriptor,
+                  "stock_df": stock.descriptor,
+                  "version": client.data_version()}
+    return [company, stock], descriptor
+
+
+class SharedCSVClient(CSVClient):
+    """
+    CSVClient over tables published by share_client_tables.
+
+    Nothing is read from the CSV files: the tables and their data
+    version are those of the publishing process.
+    """
+
+    def __init__(self, descriptor):
+        super().__init__()
+        self.descriptor = descriptor
+        self._attached = {}
+
+    def data_version(self):
+        return self.descriptor["version"]
+
+    def _attach(self, name):
+        if name not in self._attached:
+            self._attached[name] = AttachedTable(self.descriptor[name])
+        return self._attached[name].frame
+
+    def _load_company_df(self):
+        return self._attach("company_df")
+
+    def _load_stock_df(self):
+        # Published already sorted by (Company Name, Date)
+        return self._attach("stock_df")
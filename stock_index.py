@@ -0,0 +1,174 @@
+# ======================================================
+# 📄 FILE: stock_index.py
+# PURPOSE: Precomputed lookup index over the CSV "tables"
+# EXPECTED:
+# - Map each symbol to its row in company_info
+# - Sort stock_market_data by (Company Name, Date) once
+# - Map each company name to a contiguous row slice
+# RULES:
+# - Build once per client load, never per lookup
+# - Lookups return slices (views), not filtered copies
+# - Date ranges are binary searches within a company's slice
+# OUTCOME:
+# - O(1) repository lookups instead of full-frame masks
+# ======================================================
+
+import numpy as np
+import pandas as pd
+
+
+def stock_order(stock_df):
+    """
+    Return the row order that sorts stock_df by (Company Name, Date),
+    or None if it is already in that order.
+    """
+    company_codes, _ = pd.factorize(stock_df["Company Name"], sort=True)
+    date_codes, _ = pd.factorize(stock_df["Date"], sort=True)
+    order = np.lexsort((date_codes, company_codes))
+    if np.array_equal(order, np.arange(len(order))):
+        return None
+    return order
+
+
+def sort_stock_df(stock_df):
+    """
+    Return stock_df ordered by (Company Name, Date).
+    Frames that are already in order are returned unchanged.
+    """
+    order = stock_order(stock_df)
+    return stock_df if order is None else stock_df.take(order)
+
+
+def build_slice_offsets(sorted_keys):
+    """
+    Map each key of an already sorted column to its (start, stop) rows.
+    """
+    codes, uniques = pd.factorize(sorted_keys)
+    starts = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], starts)) if len(codes) else starts
+    stops = np.append(starts[1:], len(codes))
+    return {uniques[codes[start]]: (int(start), int(stop))
+            for start, stop in zip(starts, stops) if codes[start] >= 0}
+
+
+# Columns the index itself reads: company slices and date searches
+INDEX_COLUMNS = ["Company Name", "Date"]
+
+
+class StockIndex:
+    """
+    Symbol -> company row and company name -> stock row slice lookups.
+
+    Built from the whole stock table, or from its INDEX_COLUMNS plus a
+    loader that opens the other columns when a lookup first asks for
+    them (column pushdown into a columnar cache).
+    """
+
+    def __init__(self, company_df, stock_df, load_columns=None):
+        """
+        :param stock_df: The stock table; with load_columns, a frame
+                         holding at least INDEX_COLUMNS.
+        :param load_columns: Optional callable: list of column names
+                             (None for all) -> frame of those columns,
+                             rows in the same order as stock_df.
+        """
+        self.company_df = company_df
+        self._symbol_rows = {symbol: position for position, symbol
+                             in enumerate(company_df["Symbol"])}
+        self._order = stock_order(stock_df)
+        if self._order is not None:
+            stock_df = stock_df.take(self._order)
+        self._rows = len(stock_df)
+        self._index = stock_df.index
+        self._columns = {name: values.array
+                         for name, values in stock_df.items()}
+        self._load_columns = load_columns
+
+        self._company_slices = build_slice_offsets(
+            stock_df["Company Name"])
+        # ISO date strings, ordered within each company slice
+        dates = stock_df["Date"]
+        self._date_categories = None
+        if (isinstance(dates.dtype, pd.CategoricalDtype)
+                and dates.cat.categories.is_monotonic_increasing):
+            # Sorted dictionary: search the codes, not decoded strings
+            self._date_categories = dates.cat.categories
+            self._date_strings = np.asarray(dates.cat.categories,
+                                            dtype=object)
+            dates = dates.cat.codes
+        self._dates = dates.to_numpy()
+
+    @property
+    def stock_df(self):
+        """
+        The whole stock table in (Company Name, Date) order.
+        """
+        return self._frame(self._load(None), slice(None))
+
+    def _load(self, names):
+        """
+        Return the requested column names (None for all), loading the
+        ones the index does not hold yet.
+        """
+        if self._load_columns is not None:
+            missing = (None if names is None else
+                       [name for name in names if name not in self._columns])
+            if missing is None or missing:
+                loaded = self._load_columns(missing)
+                if len(loaded) != self._rows:
+                    raise RuntimeError("The stock table changed after its "
+                                       "index was built")
+                if self._order is not None:
+                    loaded = loaded.take(self._order)
+                for name, values in loaded.items():
+                    self._columns.setdefault(name, values.array)
+                if missing is None:
+                    # Every column is held now, in the table's order
+                    self._columns = {name: self._columns[name]
+                                     for name in loaded.columns}
+                    self._load_columns = None
+        return list(self._columns) if names is None else names
+
+    def _frame(self, names, rows):
+        return pd.DataFrame({name: self._columns[name][rows]
+                             for name in names},
+                            index=self._index[rows], copy=False)
+
+    def get_company_row(self, symbol):
+        """
+        Return the company_info row for symbol, or None if unknown.
+        """
+        position = self._symbol_rows.get(symbol)
+        if position is None:
+            return None
+        return self.company_df.iloc[position]
+
+    def get_stock_slice(self, company_name, start=None, end=None,
+                        columns=None):
+        """
+        Return the date-ordered stock rows of one company.
+
+        :param start: First date to include (ISO string), or None.
+        :param end: Last date to include (ISO string), or None.
+        :param columns: Columns to return, or None for all of them;
+                        only these columns are loaded.
+        """
+        first, stop = self._company_slices.get(company_name, (0, 0))
+        dates = self._dates[first:stop]
+        if end is not None:
+            stop = first + self._search_dates(dates, end, "right")
+        if start is not None:
+            first += self._search_dates(dates, start, "left")
+        rows = slice(first, max(first, stop))
+        stock_df = self._frame(self._load(columns), rows)
+        if "Date" in stock_df.columns and self._date_categories is not None:
+            # Decode only this slice's dates back to ISO strings
+            stock_df["Date"] = self._date_strings[self._dates[rows]]
+        return stock_df
+
+    def _search_dates(self, dates, bound, side):
+        if self._date_categories is None:
+            return int(np.searchsorted(dates, bound, side=side))
+        # Codes below this one stand for dates before the bound
+        code = self._date_categories.searchsorted(bound, side=side)
+        return int(np.searchsorted(dates, code, side="left"))
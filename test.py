@@ -1,16 +1,14 @@
 from pipeline import load_and_prepare_data
-from ml_model import ReturnPredictor
+from model_store import ModelStore
 
 symbol = "AAPL"
 
 # Step 1: Load and prepare the data for the given symbol
 stock_df = load_and_prepare_data(symbol)
 
-# Step 2: Initialize the ML model (in this case is LinearRegression model)
-predictor = ReturnPredictor()
-
-# Step 3: Train the model using the calculated features: "Daily Return", "5D Volatility"
-predictor.train(stock_df)
+# Step 2 and 3: Load the saved LinearRegression model for this data,
+# training it on "Daily Return", "5D Volatility" only if it is missing or stale
+predictor = ModelStore().get_or_train(symbol, stock_df)
 
 # Step 4: Test a small sample of data
 prediction_input = stock_df[["Daily Return", "5D Volatility", "Market Cap"]].tail(5)
@@ -0,0 +1,158 @@
+# Tests import the flat top-level modules from the project root
+import os
+import sys
+import uuid
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+# Database for the integration tests, read before .env is loaded: only
+# a DATABASE_URL set in the shell is used, never the configured one.
+# Each test works in its own schema, dropped afterwards.
+TEST_DATABASE_URL = os.environ.get("DATABASE_URL")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+import pipeline  # noqa: E402
+from csv_cache import ColumnarCache  # noqa: E402
+
+TABLES_DDL = """
+    CREATE TABLE company_info (
+        symbol TEXT PRIMARY KEY,
+        company_name TEXT NOT NULL,
+        industry TEXT,
+        market_cap TEXT
+    );
+    CREATE TABLE stock_market_data (
+        date DATE NOT NULL,
+        open NUMERIC,
+        high NUMERIC,
+        low NUMERIC,
+        close NUMERIC,
+        adj_close NUMERIC,
+        volume BIGINT,
+        name TEXT NOT NULL,
+        company_name TEXT NOT NULL,
+        PRIMARY KEY (name, date)
+    );
+"""
+
+
+@pytest.fixture
+def csv_tables(tmp_path, monkeypatch):
+    """
+    Small company_info / stock_market_data CSVs used by pipeline.
+    Stock rows are deliberately out of (Company Name, Date) order.
+    """
+    company_path = tmp_path / "company.csv"
+    pd.DataFrame({
+        "Symbol": ["AAPL", "MSFT"], "Company Name": ["Apple", "Microsoft"],
+        "Industry": ["Tech", "Tech"], "Market Cap": ["2.1T", "350B"],
+    }).to_csv(company_path, index=False)
+    stock_path = tmp_path / "stock.csv"
+    prices = [2.0, 1.0, 3.0, 4.0]
+    pd.DataFrame({
+        "Date": ["2016-01-05", "2016-01-04", "2016-01-04", "2016-01-06"],
+        "Open": prices, "High": prices, "Low": prices, "Close": prices,
+        "Adj Close": prices, "Volume": [20, 10, 30, 40],
+        "Name": ["AAPL", "AAPL", "MSFT", "AAPL"],
+        "Company Name": ["Apple", "Apple", "Microsoft", "Apple"],
+    }).to_csv(stock_path, index=False)
+    monkeypatch.setattr(pipeline, "COMPANY_INFO_CSV", str(company_path))
+    monkeypatch.setattr(pipeline, "STOCK_MARKET_CSV", str(stock_path))
+    return str(company_path), str(stock_path)
+
+
+@pytest.fixture
+def market_tables(tmp_path, monkeypatch):
+    """
+    40 trading days of random prices for four tickers of three
+    companies (Alphabet has two), served by the default repository.
+    Returns the company_info frame.
+    """
+    company_df = pd.DataFrame({
+        "Symbol": ["AAPL", "MSFT", "GOOG", "GOOGL"],
+        "Company Name": ["Apple", "Microsoft", "Alphabet", "Alphabet"],
+        "Industry": ["Hardware", "Software", "Software", "Software"],
+        "Market Cap": ["2.1T", "350B", "800B", "800B"],
+    })
+    company_path = tmp_path / "company.csv"
+    company_df.to_csv(company_path, index=False)
+
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2016-01-04", periods=40).strftime("%Y-%m-%d")
+    frames = []
+    for symbol, company in zip(company_df["Symbol"],
+                               company_df["Company Name"]):
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        frames.append(pd.DataFrame({
+            "Date": dates, "Open": close * 0.99, "High": close * 1.01,
+            "Low": close * 0.98, "Close": close, "Adj Close": close,
+            "Volume": rng.integers(1_000, 100_000, len(dates)),
+            "Name": symbol, "Company Name": company,
+        }))
+    stock_path = tmp_path / "stock.csv"
+    # Shuffled, as the loaders must not rely on the file order
+    pd.concat(frames).sample(frac=1, random_state=0).to_csv(
+        stock_path, index=False)
+
+    monkeypatch.setattr(pipeline, "COMPANY_INFO_CSV", str(company_path))
+    monkeypatch.setattr(pipeline, "STOCK_MARKET_CSV", str(stock_path))
+    monkeypatch.setattr(pipeline, "DATA_BACKEND", "csv")
+    client = pipeline.CSVClient(cache=ColumnarCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(pipeline.CSVClientFactory, "get_client",
+                        lambda: client)
+    return company_df
+
+
+@pytest.fixture
+def postgres_url():
+    """
+    URL of an empty schema holding company_info and stock_market_data
+    in the DATABASE_URL database; skips when DATABASE_URL is unset.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("DATABASE_URL is not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(TEST_DATABASE_URL)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+    try:
+        with admin.cursor() as cursor:
+            cursor.execute(f"SET search_path TO {schema}")
+            cursor.execute(TABLES_DDL)
+        separator = "&" if "?" in TEST_DATABASE_URL else "?"
+        options = quote(f"-csearch_path={schema}")
+        yield f"{TEST_DATABASE_URL}{separator}options={options}"
+    finally:
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+@pytest.fixture
+def postgres_tables(postgres_url, csv_tables):
+    """
+    postgres_url with the csv_tables rows loaded into its tables.
+    """
+    import psycopg2
+
+    company_path, stock_path = csv_tables
+    conn = psycopg2.connect(postgres_url)
+    try:
+        with conn, conn.cursor() as cursor:
+            for row in pd.read_csv(company_path).itertuples(index=False):
+                cursor.execute("INSERT INTO company_info VALUES "
+                               "(%s, %s, %s, %s)", tuple(row))
+            for row in pd.read_csv(stock_path).itertuples(index=False):
+                cursor.execute(
+                    "INSERT INTO stock_market_data VALUES "
+                    "(%s, %s, %s, %s, %s, %s, %s, %s, %s)", tuple(row))
+    finally:
+        conn.close()
+    return postgres_url
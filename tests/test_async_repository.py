@@ -0,0 +1,74 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+import pipeline
+from async_repository import (AsyncCSVCompanyRepository,
+                              AsyncPostgresClientFactory,
+                              AsyncPostgresCompanyRepository, fetch_many)
+
+
+class CountingRepository(pipeline.CompanyRepository):
+    """
+    Blocking CSV repository that counts the stock fetches reaching it.
+    """
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.stock_fetches = 0
+
+    def get_stock_data_by_company(self, *args, **kwargs):
+        self.stock_fetches += 1
+        return super().get_stock_data_by_company(*args, **kwargs)
+
+
+def test_concurrent_identical_requests_share_one_fetch(csv_tables):
+    blocking = CountingRepository(pipeline.CSVClient())
+    repo = AsyncCSVCompanyRepository(blocking)
+
+    async def burst():
+        return await asyncio.gather(*(
+            repo.get_stock_data_by_company("Apple") for _ in range(10)))
+
+    frames = asyncio.run(burst())
+    assert blocking.stock_fetches == 1
+    assert repo.stats == {"fetches": 1, "coalesced": 9}
+    assert all(frame is frames[0] for frame in frames)
+    assert list(frames[0]["Date"]) == ["2016-01-04", "2016-01-05",
+                                       "2016-01-06"]
+
+    # Finished requests are not cached: the next burst fetches again
+    asyncio.run(burst())
+    assert blocking.stock_fetches == 2
+
+
+def test_fetch_many_reports_errors_per_symbol(csv_tables):
+    repo = AsyncCSVCompanyRepository(
+        pipeline.CompanyRepository(pipeline.CSVClient()))
+    batch = asyncio.run(fetch_many(repo, ["AAPL", "MSFT", "ZZZZ"]))
+    assert batch["results"] == {"AAPL": 3, "MSFT": 1}
+    assert list(batch["errors"]) == ["ZZZZ"]
+
+
+def test_asyncpg_repository_matches_the_csv_backend(postgres_tables,
+                                                    csv_tables):
+    pytest.importorskip("asyncpg")
+    csv_repo = pipeline.CompanyRepository(pipeline.CSVClient())
+
+    async def query():
+        repo = AsyncPostgresCompanyRepository(
+            AsyncPostgresClientFactory(dsn=postgres_tables))
+        try:
+            company, stock_df = await asyncio.gather(
+                repo.get_company_by_symbol("AAPL"),
+                repo.get_stock_data_by_company("Apple", end="2016-01-05"))
+        finally:
+            await repo.factory.close()
+        return company, stock_df
+
+    company, stock_df = asyncio.run(query())
+    assert company["Market Cap"] == 2100.0
+    expected = csv_repo.get_stock_data_by_company("Apple", end="2016-01-05")
+    pd.testing.assert_frame_equal(stock_df, expected.reset_index(drop=True),
+                                  check_categorical=False)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import RecursiveLeastSquares, walk_forward
+from ml_model import FEATURES, TARGET, ReturnPredictor
+
+
+def ticker_frame(rows=120, seed=3):
+    rng = np.random.default_rng(seed)
+    daily = rng.normal(0, 0.02, rows)
+    volatility = rng.uniform(0.01, 0.03, rows)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2016-01-04", periods=rows),
+        "Daily Return": daily,
+        "5D Volatility": volatility,
+        "Market Cap": 350.0,
+        TARGET: 0.5 * daily - volatility + rng.normal(0, 0.01, rows),
+    })
+
+
+def test_recursive_updates_match_a_batch_fit():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([np.ones(200), rng.normal(size=(200, 3))])
+    y = X @ [0.1, 1.0, -2.0, 0.5] + rng.normal(0, 0.1, 200)
+
+    model = RecursiveLeastSquares(X[:20], y[:20])
+    for row in range(20, 200):
+        model.update(X[row], y[row])
+    expected, *_ = np.linalg.lstsq(X, y, rcond=None)
+    np.testing.assert_allclose(model.beta, expected, rtol=1e-8)
+
+
+@pytest.mark.parametrize("horizon", [1, 5, 10])
+def test_walk_forward_trains_only_on_known_targets(horizon):
+    stock_df = ticker_frame()
+    result = walk_forward(stock_df, min_train=30, horizon=horizon)
+    first = 30 + horizon - 1
+    assert len(result) == len(stock_df) - first
+    assert result["Date"].iloc[0] == stock_df["Date"].iloc[first]
+
+    # Day t is predicted from a batch fit on rows 0 .. t - horizon
+    X = np.column_stack([np.ones(len(stock_df)),
+                         stock_df[["Daily Return", "5D Volatility"]]])
+    y = stock_df[TARGET].to_numpy()
+    for step, t in enumerate(range(first, len(stock_df))):
+        beta, *_ = np.linalg.lstsq(X[:t - horizon + 1],
+                                   y[:t - horizon + 1], rcond=None)
+        assert result["Predicted"].iloc[step] == pytest.approx(X[t] @ beta)
+
+    # Targets that are not known yet never change a prediction
+    leaked = stock_df.copy()
+    leaked.loc[first - horizon + 1:, TARGET] = 1.0
+    assert walk_forward(leaked, min_train=30, horizon=horizon)[
+        "Predicted"].iloc[0] == result["Predicted"].iloc[0]
+
+
+def test_train_returns_test_set_metrics():
+    metrics = ReturnPredictor(FEATURES).train(ticker_frame())
+    assert set(metrics) == {"mse", "rmse"}
+    assert metrics["rmse"] == pytest.approx(np.sqrt(metrics["mse"]))
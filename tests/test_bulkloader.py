@@ -0,0 +1,154 @@
+import pandas as pd
+
+import ingest
+from loaders import bulkloader
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        if sql.startswith("INSERT INTO load_checkpoint"):
+            self.conn.checkpoints.add(params[1])
+
+    def copy_expert(self, sql, buffer):
+        self.conn.copied.append(buffer.getvalue())
+
+    def fetchall(self):
+        return [(key,) for key in self.conn.checkpoints]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements, self.copied, self.checkpoints = [], [], set()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn):
+        pass
+
+
+def write_stock_csv(path, closes):
+    pd.DataFrame({
+        "Date": [f"2016-01-{day:02d}" for day in range(4, 4 + len(closes))],
+        "Open": closes, "High": closes, "Low": closes, "Close": closes,
+        "Adj Close": closes, "Volume": [100] * len(closes),
+        "Name": "AAPL", "Company Name": "Apple",
+    }).to_csv(path, index=False)
+
+
+def test_upload_keeps_precision_and_resumes(tmp_path):
+    csv_path = tmp_path / "stock.csv"
+    write_stock_csv(csv_path, [1234.5678, 1234.5679])
+    store = ingest.StockPartitionStore(str(tmp_path / "partitions"))
+    store.ingest(str(csv_path))
+    pool = FakePool()
+
+    assert bulkloader.load_stock_market_data(pool, store, workers=1) == {}
+    [key] = pool.conn.checkpoints
+    assert key.startswith("AAPL:2016-01-04:2016-01-05:")
+    assert "1234.5678,1234.5678" in pool.conn.copied[0]
+    assert "1234.5679" in pool.conn.copied[0]
+
+    # Nothing changed: the partition is skipped
+    bulkloader.load_stock_market_data(pool, store, workers=1)
+    assert len(pool.conn.copied) == 1
+
+
+def test_changed_source_is_uploaded_again(tmp_path):
+    csv_path = tmp_path / "stock.csv"
+    write_stock_csv(csv_path, [10.0, 11.0])
+    store = ingest.StockPartitionStore(str(tmp_path / "partitions"))
+    store.ingest(str(csv_path))
+    assert store.is_current(str(csv_path))
+    pool = FakePool()
+    bulkloader.load_stock_market_data(pool, store, workers=1)
+
+    write_stock_csv(csv_path, [10.0, 11.0, 12.0])
+    assert not store.is_current(str(csv_path))
+    store.ingest(str(csv_path))
+    bulkloader.load_stock_market_data(pool, store, workers=1)
+    assert len(pool.conn.copied) == 2
+    assert any(key.startswith("AAPL:2016-01-04:2016-01-06:")
+               for key in pool.conn.checkpoints)
+
+
+def count_rows(pool, table):
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {table}")
+            return cursor.fetchone()[0]
+    finally:
+        pool.putconn(conn)
+
+
+def test_load_reload_and_resume_in_postgres(postgres_url, csv_tables,
+                                            tmp_path, monkeypatch):
+    company_path, stock_path = csv_tables
+    store = ingest.StockPartitionStore(str(tmp_path / "partitions"))
+    store.ingest(stock_path)
+    monkeypatch.setattr(bulkloader, "DATABASE_URL", postgres_url)
+    pool = bulkloader.open_pool(workers=2)
+    try:
+        # MSFT fails on the first run; AAPL is committed and checkpointed
+        copy_frame = bulkloader.copy_frame
+
+        def failing_copy(cursor, df, table, columns):
+            if table == "stock_market_data" and (df["Name"] == "MSFT").any():
+                raise RuntimeError("connection lost")
+            return copy_frame(cursor, df, table, columns)
+
+        monkeypatch.setattr(bulkloader, "copy_frame", failing_copy)
+        assert bulkloader.load_company_info(pool, company_path) == 2
+        errors = bulkloader.load_stock_market_data(pool, store, workers=2)
+        assert list(errors) == ["MSFT"]
+        assert count_rows(pool, "stock_market_data") == 3
+
+        # The rerun resumes: only MSFT is copied
+        monkeypatch.setattr(bulkloader, "copy_frame", copy_frame)
+        assert bulkloader.load_stock_market_data(pool, store) == {}
+        assert count_rows(pool, "stock_market_data") == 4
+        assert count_rows(pool, "load_checkpoint") == 3
+
+        # Nothing changed: a reload is a no-op
+        copied = []
+        monkeypatch.setattr(bulkloader, "copy_frame",
+                            lambda *args: copied.append(args))
+        assert bulkloader.load_company_info(pool, company_path) == 0
+        assert bulkloader.load_stock_market_data(pool, store) == {}
+        assert copied == []
+
+        # Rows already present are skipped by ON CONFLICT DO NOTHING
+        monkeypatch.setattr(bulkloader, "copy_frame", copy_frame)
+        assert bulkloader.load_partition(
+            pool, "stock_market_data", "AAPL:again",
+            store.load("AAPL", schema=ingest.PRECISE_SCHEMA),
+            bulkloader.STOCK_COLUMNS) == 0
+        assert count_rows(pool, "stock_market_data") == 4
+    finally:
+        pool.closeall()
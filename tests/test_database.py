@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import pipeline
+
+database = pytest.importorskip("database")
+
+
+@pytest.fixture
+def postgres_repo(postgres_tables, monkeypatch):
+    """
+    PostgresCompanyRepository over the csv_tables rows.
+    """
+    monkeypatch.setattr(database, "DATABASE_URL", postgres_tables)
+    database.PostgresClientFactory.close_all()
+    yield database.PostgresCompanyRepository(batch_size=2)
+    database.PostgresClientFactory.close_all()
+
+
+def test_postgres_frames_match_the_csv_backend(postgres_repo, csv_tables):
+    csv_repo = pipeline.CompanyRepository(pipeline.CSVClient())
+    for columns in (None, ["Date", "Close", "Volume"]):
+        expected = csv_repo.get_stock_data_by_company(
+            "Apple", start="2016-01-05", columns=columns)
+        result = postgres_repo.get_stock_data_by_company(
+            "Apple", start="2016-01-05", columns=columns)
+        pd.testing.assert_frame_equal(
+            result, expected.reset_index(drop=True),
+            check_categorical=False)
+
+    company = postgres_repo.get_company_by_symbol("AAPL")
+    assert company["Company Name"] == "Apple"
+    assert company["Market Cap"] == 2100.0
+
+
+def test_postgres_batches_are_typed(postgres_repo):
+    batches = list(postgres_repo.iter_stock_data_by_company("Apple"))
+    assert [len(batch) for batch in batches] == [2, 1]
+    for batch in batches:
+        assert batch["Close"].dtype == "float32"
+        assert isinstance(batch["Date"].iloc[0], str)
+
+
+def test_postgres_tables_match_the_csv_backend(postgres_repo, csv_tables):
+    csv_repo = pipeline.CompanyRepository(pipeline.CSVClient())
+    pd.testing.assert_frame_equal(
+        postgres_repo.get_company_df(), csv_repo.get_company_df(),
+        check_categorical=False)
+    pd.testing.assert_frame_equal(
+        postgres_repo.get_all_stock_data().reset_index(drop=True),
+        csv_repo.get_all_stock_data().reset_index(drop=True),
+        check_categorical=False)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from feature_store import FeatureStore
+from pipeline import ENGINEERED_COLUMNS, add_return_features
+
+
+def make_stock_df(days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2016-01-04", periods=days).strftime(
+            "%Y-%m-%d"),
+        "Close": close.astype(np.float32),
+        "Volume": rng.integers(1_000, 100_000, days),
+        "Name": "AAPL",
+        "Company Name": "Apple Inc.",
+    })
+
+
+def full_recompute(stock_df):
+    stock_df = stock_df.copy()
+    stock_df["Date"] = pd.to_datetime(stock_df["Date"])
+    stock_df = add_return_features(stock_df)
+    return stock_df.dropna(subset=ENGINEERED_COLUMNS).reset_index(
+        drop=True)
+
+
+def test_appends_match_a_full_recompute(tmp_path):
+    stock_df = make_stock_df()
+    store = FeatureStore(str(tmp_path))
+    store.build("AAPL", stock_df.iloc[:40])
+    assert store.append("AAPL", stock_df.iloc[38:43]) == 3
+    assert store.append("AAPL", stock_df.iloc[43:]) == 17
+    assert store.append("AAPL", stock_df.iloc[50:]) == 0
+
+    stored = store.load("AAPL")
+    expected = full_recompute(stock_df)
+    assert len(stored) == len(expected)
+    np.testing.assert_array_equal(stored["Date"], expected["Date"])
+    np.testing.assert_array_equal(stored["Close"], expected["Close"])
+    np.testing.assert_array_equal(stored["Volume"], expected["Volume"])
+    for column in ("Daily Return", "5D Future Return"):
+        np.testing.assert_array_equal(stored[column], expected[column])
+    # np.std per window versus the running sums of pandas rolling
+    np.testing.assert_allclose(stored["5D Volatility"],
+                               expected["5D Volatility"], rtol=1e-12)
+    assert list(stored["Name"].unique()) == ["AAPL"]
+    assert store.last_date("AAPL") == stock_df["Date"].iloc[-1]
@@ -0,0 +1,13 @@
+from benchmarks.import_budget import check_budget, measure_import
+
+
+def test_import_main_within_budget():
+    # check_budget imports main in fresh interpreters
+    best_ms, problems = check_budget("main", repeat=3)
+    assert problems == [], f"best run {best_ms:.0f} ms"
+
+
+def test_async_repository_does_not_load_psycopg2():
+    # database.py (psycopg2) is imported by the postgres backend only
+    result = measure_import("async_repository", ["psycopg2"])
+    assert result["loaded"] == []
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorEngine
+
+WINDOW = 10
+
+
+def stock_frame(days=60, seed=5):
+    """
+    Three tickers sorted by (Name, Date), as IndicatorEngine expects.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2016-01-04", periods=days).strftime("%Y-%m-%d")
+    frames = []
+    for symbol in ["AAPL", "GOOG", "MSFT"]:
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        frames.append(pd.DataFrame({
+            "Date": dates, "Name": symbol, "Close": close,
+            "High": close * rng.uniform(1.0, 1.03, days),
+            "Low": close * rng.uniform(0.97, 1.0, days),
+            "Volume": rng.integers(1_000, 100_000, days).astype(float),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def wilder(values, window):
+    return values.ewm(alpha=1 / window, adjust=False,
+                      min_periods=window).mean()
+
+
+def reference_return(group):
+    return group["Close"].pct_change(WINDOW)
+
+
+def reference_sma(group):
+    return group["Close"].rolling(WINDOW).mean()
+
+
+def reference_volatility(group):
+    return group["Close"].pct_change().rolling(WINDOW).std()
+
+
+def reference_rsi(group):
+    change = group["Close"].diff()
+    gains = wilder(change.clip(lower=0), WINDOW)
+    losses = wilder(-change.clip(upper=0), WINDOW)
+    return 100 * gains / (gains + losses)
+
+
+def reference_atr(group):
+    previous = group["Close"].shift()
+    true_range = pd.concat([group["High"] - group["Low"],
+                            (group["High"] - previous).abs(),
+                            (group["Low"] - previous).abs()],
+                           axis=1).max(axis=1)
+    return wilder(true_range, WINDOW)
+
+
+def reference_volume_z(group):
+    rolling = group["Volume"].rolling(WINDOW)
+    return (group["Volume"] - rolling.mean()) / rolling.std()
+
+
+def reference_beta(group):
+    rolling = group["Daily Return"].rolling(WINDOW)
+    return (rolling.cov(group["Market"])
+            / group["Market"].rolling(WINDOW).var())
+
+
+@pytest.mark.parametrize("name, reference", [
+    (f"{WINDOW}D Return", reference_return),
+    (f"{WINDOW}D SMA", reference_sma),
+    (f"{WINDOW}D Volatility", reference_volatility),
+    (f"RSI {WINDOW}", reference_rsi),
+    (f"ATR {WINDOW}", reference_atr),
+    (f"{WINDOW}D Volume Z", reference_volume_z),
+    (f"{WINDOW}D Beta", reference_beta),
+])
+def test_indicator_matches_pandas(name, reference):
+    stock_df = stock_frame()
+    daily = stock_df.groupby("Name")["Close"].pct_change()
+    # Equal-weight index: the mean daily return of all tickers per date
+    stock_df = stock_df.assign(**{
+        "Daily Return": daily,
+        "Market": daily.groupby(stock_df["Date"]).transform("mean"),
+    })
+    expected = pd.concat([reference(group) for _, group
+                          in stock_df.groupby("Name", sort=False)])
+
+    values = IndicatorEngine(stock_df, group_column="Name").compute(name)
+    np.testing.assert_allclose(values, expected.to_numpy(), rtol=1e-9,
+                               atol=1e-12)
+    # Windows never reach back into the previous ticker
+    assert np.isnan(values[60:60 + WINDOW - 1]).all()
@@ -0,0 +1,26 @@
+import ingest
+import pipeline
+from schema import STOCK_SCHEMA
+
+
+def test_empty_partition_store_gives_an_empty_table(tmp_path):
+    client = ingest.PartitionedCSVClient(
+        ingest.StockPartitionStore(str(tmp_path / "missing")))
+    stock_df = client.get_stock_df()
+    assert stock_df.empty
+    assert list(stock_df.columns) == list(STOCK_SCHEMA)
+
+
+def test_partitions_backend_is_selectable(csv_tables, tmp_path,
+                                          monkeypatch):
+    _, stock_path = csv_tables
+    store = ingest.StockPartitionStore(str(tmp_path / "partitions"))
+    assert store.ingest(stock_path) == 4
+
+    client = ingest.PartitionedCSVClient(store)
+    monkeypatch.setattr(ingest.PartitionedClientFactory, "get_client",
+                        lambda: client)
+    repo = pipeline.get_repository("partitions")
+    stock_df = repo.get_stock_data_by_company("Apple")
+    assert list(stock_df["Date"]) == ["2016-01-04", "2016-01-05",
+                                      "2016-01-06"]
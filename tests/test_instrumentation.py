@@ -0,0 +1,79 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import instrumentation
+from instrumentation import span, timed
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    """
+    Turn metrics on for one test; returns a reader of the records.
+    """
+    path = tmp_path / "metrics.jsonl"
+    instrumentation.configure(str(path))
+
+    def read():
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text().splitlines()]
+    yield read
+    instrumentation.configure()
+
+
+@timed("test.frame")
+def make_frame(rows):
+    return pd.DataFrame({"Close": np.arange(rows, dtype=float)})
+
+
+def test_stages_record_wall_time_rows_and_depth(metrics):
+    with span("test.outer", symbol="AAPL") as info:
+        make_frame(25)
+        info["rows"] = 3
+
+    inner, outer = metrics()
+    assert (inner["stage"], inner["rows"], inner["depth"]) == (
+        "test.frame", 25, 1)
+    assert (outer["stage"], outer["rows"], outer["depth"]) == (
+        "test.outer", 3, 0)
+    assert outer["symbol"] == "AAPL"
+    assert outer["wall_ms"] >= inner["wall_ms"] >= 0
+
+
+def test_traced_peaks_include_child_stages(metrics):
+    tracemalloc.start()
+    try:
+        with span("test.outer"):
+            with span("test.inner"):
+                np.ones(1 << 20)
+    finally:
+        tracemalloc.stop()
+
+    inner, outer = metrics()
+    assert inner["traced_peak_mb"] >= 8
+    assert outer["traced_peak_mb"] >= inner["traced_peak_mb"]
+
+
+def test_nothing_is_recorded_when_disabled(metrics):
+    instrumentation.configure()
+    assert len(make_frame(5)) == 5
+    with span("test.disabled") as info:
+        info["rows"] = 1
+    assert metrics() == []
+
+
+def test_rss_change_is_per_stage(metrics):
+    with span("test.allocate"):
+        block = np.ones(1 << 22)
+    with span("test.idle"):
+        pass
+
+    allocate, idle = metrics()
+    assert allocate["rss_delta_mb"] >= 30
+    assert abs(idle["rss_delta_mb"]) < 5
+    assert idle["max_rss_mb"] >= allocate["max_rss_mb"]
+    del block
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+import pipeline
+from main import StockAnalysisService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """
+    A service over two companies' CSVs; returns it and the stock rows.
+    """
+    company_path = tmp_path / "company.csv"
+    # With its index column, like the shipped company_info CSV
+    pd.DataFrame({
+        "Symbol": ["AAPL", "MSFT"], "Company Name": ["Apple", "Microsoft"],
+        "Industry": ["Tech", "Tech"], "Market Cap": ["2.1T", "350B"],
+    }).to_csv(company_path)
+    dates = pd.bdate_range("2016-01-04", periods=8).strftime("%Y-%m-%d")
+    stock_df = pd.concat([pd.DataFrame({
+        "Date": dates, "Open": 1.0, "High": 1.0, "Low": 1.0,
+        "Close": [float(offset + day) for day in range(len(dates))],
+        "Adj Close": 1.0,
+        "Volume": [60_000_000 if day % 3 == 0 else 1_000
+                   for day in range(len(dates))],
+        "Name": symbol, "Company Name": company,
+    }) for offset, symbol, company in [(100, "AAPL", "Apple"),
+                                       (20, "MSFT", "Microsoft")]])
+    stock_path = tmp_path / "stock.csv"
+    stock_df.to_csv(stock_path, index=False)
+    monkeypatch.setattr(pipeline, "COMPANY_INFO_CSV", str(company_path))
+    monkeypatch.setattr(pipeline, "STOCK_MARKET_CSV", str(stock_path))
+    repo = pipeline.CompanyRepository(pipeline.CSVClient())
+    return StockAnalysisService(repo), stock_df
+
+
+def test_run_reports_summarizes_each_symbol_and_collects_errors(service):
+    service, stock_df = service
+    batch = service.run_reports(["AAPL", "MSFT", "ZZZZ", "bad"])
+
+    assert sorted(batch["results"]) == ["AAPL", "MSFT"]
+    assert sorted(batch["errors"]) == ["ZZZZ", "bad"]
+    for symbol, rows in stock_df.groupby("Name"):
+        summary = batch["results"][symbol]
+        assert summary["average_close"] == pytest.approx(
+            rows["Close"].mean())
+        assert summary["high_volume_days"] == 3
+        assert summary["top_closes"] == sorted(rows["Close"],
+                                               reverse=True)[:5]
+
+
+def test_worker_processes_give_the_serial_results(service):
+    service, _ = service
+    symbols = ["AAPL", "MSFT", "ZZZZ"]
+    assert service.run_reports(symbols, workers=2) == service.run_reports(
+        symbols, workers=1)
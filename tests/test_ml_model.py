@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from ml_model import FEATURES, TARGET, BatchedReturnPredictor
+
+
+def universe_frame(rows=80, seed=11):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for symbol, market_cap, slope in [("AAPL", 2100.0, 0.5),
+                                      ("MSFT", 350.0, -1.0),
+                                      ("GOOG", 800.0, 2.0)]:
+        daily = rng.normal(0, 0.02, rows)
+        volatility = rng.uniform(0.01, 0.03, rows)
+        frames.append(pd.DataFrame({
+            "Date": pd.bdate_range("2016-01-04", periods=rows),
+            "Name": symbol,
+            "Daily Return": daily,
+            "5D Volatility": volatility,
+            "Market Cap": market_cap,
+            TARGET: slope * daily + volatility + rng.normal(0, 0.01, rows),
+        }))
+    # Tickers interleaved, as in load_and_prepare_universe output
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+
+def test_batched_fit_matches_per_ticker_linear_regression():
+    universe_df = universe_frame()
+    predictor = BatchedReturnPredictor(FEATURES)
+    coefficients, mse = predictor.train(universe_df)
+    predictions = predictor.predict(universe_df)
+
+    for symbol, group in universe_df.groupby("Name"):
+        expected = LinearRegression().fit(group[FEATURES], group[TARGET])
+        row = coefficients.loc[symbol]
+        assert row["Intercept"] == pytest.approx(expected.intercept_)
+        np.testing.assert_allclose(row[FEATURES], expected.coef_,
+                                   atol=1e-10)
+        expected_predictions = expected.predict(group[FEATURES])
+        np.testing.assert_allclose(
+            predictions[(universe_df["Name"] == symbol).to_numpy()],
+            expected_predictions, rtol=1e-10)
+        assert mse[symbol] == pytest.approx(
+            np.mean((group[TARGET] - expected_predictions) ** 2))
+
+
+def test_predict_before_train_fails():
+    with pytest.raises(RuntimeError):
+        BatchedReturnPredictor().predict(universe_frame())
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from ml_model import FEATURES, TARGET, LinearModel, ReturnPredictor
+from model_store import ModelStore, data_fingerprint
+
+
+def make_feature_df(rows=20):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(rows, len(FEATURES) + 1)),
+                        columns=[*FEATURES, TARGET])
+
+
+def test_save_and_get_round_trip(tmp_path):
+    stock_df = make_feature_df()
+    predictor = ReturnPredictor()
+    predictor.model = LinearModel(np.arange(len(FEATURES)), 0.5)
+    predictor.is_trained = True
+    predictor.mse = 0.0123
+    fingerprint = data_fingerprint(stock_df)
+    assert ModelStore(str(tmp_path)).save("AAPL", predictor,
+                                          fingerprint) == 1
+
+    # A fresh store reads the file back instead of its memo
+    loaded = ModelStore(str(tmp_path)).get("AAPL", stock_df)
+    assert loaded.is_trained
+    assert loaded.mse == 0.0123
+    np.testing.assert_array_equal(loaded.model.coef_,
+                                  predictor.model.coef_)
+    assert loaded.model.intercept_ == 0.5
+    X = stock_df[FEATURES]
+    np.testing.assert_array_equal(loaded.model.predict(X),
+                                  predictor.model.predict(X))
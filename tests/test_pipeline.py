@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+import pipeline
+
+
+@pytest.mark.parametrize("all_symbols", [True, False])
+def test_universe_matches_load_and_prepare_data(market_tables, all_symbols):
+    symbols = list(market_tables["Symbol"])
+    universe = pipeline.load_and_prepare_universe(
+        None if all_symbols else symbols)
+    assert universe["Date"].dtype.kind == "M"
+    assert universe["Market Cap"].dtype == "float64"
+
+    for symbol, company in zip(symbols, market_tables["Company Name"]):
+        expected = pipeline.load_and_prepare_data(symbol)
+        rows = universe[universe["Company Name"] == company]
+        pd.testing.assert_frame_equal(rows, expected)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+import main
+from models import Company, StockRecordBatch
+from report_generator import PDFReport
+
+
+def test_pdf_with_a_missing_volume(tmp_path):
+    records = StockRecordBatch.from_frame(pd.DataFrame({
+        "Date": ["2016-01-04", "2016-01-05"], "Name": "AAPL",
+        "Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+        "Close": [1.0, 2.0], "Volume": [100.0, np.nan],
+    }))
+    company = Company("AAPL", "Apple", "Hardware", 2100.0)
+    path = PDFReport(company, records, 1.5).write(
+        str(tmp_path / "AAPL_report.pdf"))
+    with open(path, "rb") as handle:
+        assert handle.read(5) == b"%PDF-"
+
+
+def test_console_report_writes_no_pdf_unless_asked(market_tables,
+                                                   tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "REPORT_OUTPUT_DIR", str(tmp_path / "out"))
+    service = main.StockAnalysisService(main.get_repository())
+    service.run_report_for_symbol("AAPL")
+    assert not (tmp_path / "out").exists()
+
+    service.run_report_for_symbol("AAPL", pdf=True)
+    assert (tmp_path / "out" / "AAPL_report.pdf").exists()
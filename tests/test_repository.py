@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+import pipeline
+
+COMPANIES = pd.DataFrame({
+    "Symbol": ["AAPL", "MSFT", "GOOG", "GOOGL"],
+    "Company Name": ["Apple", "Microsoft", "Alphabet", "Alphabet"],
+    "Industry": ["Hardware", "Software", "Software", "Software"],
+    "Market Cap": ["2.1T", "350B", "800B", "800B"],
+})
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """
+    A repository over small CSVs whose stock rows are shuffled.
+    """
+    dates = pd.bdate_range("2016-01-04", periods=6).strftime("%Y-%m-%d")
+    stock_df = pd.concat([pd.DataFrame({
+        "Date": dates, "Open": 1.0, "High": 1.0, "Low": 1.0,
+        "Close": [float(day + 10 * number) for day in range(len(dates))],
+        "Adj Close": 1.0, "Volume": 100, "Name": symbol,
+        "Company Name": company,
+    }) for number, (symbol, company) in enumerate(
+        zip(COMPANIES["Symbol"], COMPANIES["Company Name"]))])
+    stock_df = stock_df.sample(frac=1, random_state=0)
+    company_path = tmp_path / "company.csv"
+    stock_path = tmp_path / "stock.csv"
+    # With its index column, like the shipped company_info CSV
+    COMPANIES.to_csv(company_path)
+    stock_df.to_csv(stock_path, index=False)
+    monkeypatch.setattr(pipeline, "COMPANY_INFO_CSV", str(company_path))
+    monkeypatch.setattr(pipeline, "STOCK_MARKET_CSV", str(stock_path))
+    return pipeline.CompanyRepository(pipeline.CSVClient()), stock_df
+
+
+def test_symbol_lookup_returns_the_company_row(repo):
+    repo, _ = repo
+    for symbol, company in zip(COMPANIES["Symbol"],
+                               COMPANIES["Company Name"]):
+        row = repo.get_company_by_symbol(symbol)
+        assert (row["Symbol"], row["Company Name"]) == (symbol, company)
+    with pytest.raises(RuntimeError):
+        repo.get_company_by_symbol("ZZZZ")
+    with pytest.raises(ValueError):
+        repo.get_company_by_symbol("aapl")
+
+
+def test_company_lookup_matches_a_full_frame_mask(repo):
+    repo, stock_df = repo
+    for company in ["Apple", "Microsoft", "Alphabet"]:
+        expected = stock_df[stock_df["Company Name"] == company]
+        expected = expected.sort_values(["Date", "Name"])
+        result = repo.get_stock_data_by_company(company)
+        assert list(result["Date"]) == list(expected["Date"])
+        assert sorted(zip(result["Date"], result["Close"])) == sorted(
+            zip(expected["Date"], expected["Close"]))
+    assert repo.get_stock_data_by_company("Unknown").empty
+    # The index is built once per client load
+    assert repo.client.get_stock_index() is repo.client.get_stock_index()
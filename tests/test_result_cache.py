@@ -0,0 +1,85 @@
+import numpy as np
+
+from result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def kilobyte():
+    return np.zeros(128)
+
+
+def test_least_recently_used_entries_are_evicted_by_bytes():
+    cache = ResultCache(max_bytes=3 * 1024, ttl=60)
+    for key in "abc":
+        cache.put(key, kilobyte())
+    assert cache.get("a") is not None
+    cache.put("d", kilobyte())
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert cache.stats()["bytes"] == 3 * 1024
+    # Larger than the whole budget: never stored, nothing evicted
+    cache.put("e", np.zeros(1024))
+    assert cache.get("e") is None
+    assert cache.stats()["entries"] == 3
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = ResultCache(max_bytes=1 << 20, ttl=10, clock=clock)
+    cache.put("a", kilobyte())
+    clock.now = 9.9
+    assert cache.get("a") is not None
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_another_data_version_invalidates_the_entry():
+    cache = ResultCache(max_bytes=1 << 20, ttl=60)
+    cache.put("a", kilobyte(), version=("v1",))
+    assert cache.get("a", version=("v1",)) is not None
+    assert cache.get("a", version=("v2",)) is None
+    assert cache.get("a", version=("v1",)) is None
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return kilobyte()
+
+    cache.get_or_compute("b", compute, version=1)
+    cache.get_or_compute("b", compute, version=1)
+    cache.get_or_compute("b", compute, version=2)
+    assert len(calls) == 2
+
+
+def test_stats_count_every_outcome():
+    clock = FakeClock()
+    cache = ResultCache(max_bytes=2 * 1024, ttl=10, clock=clock)
+    cache.put("a", kilobyte(), version=1)
+    cache.put("b", kilobyte())
+    cache.get("a", version=1)
+    cache.get("a", version=2)
+    cache.get("missing")
+    cache.put("c", kilobyte())
+    cache.put("d", kilobyte())
+    clock.now = 10.0
+    cache.get("c")
+
+    stats = cache.stats()
+    assert {name: stats[name] for name in
+            ["hits", "misses", "expired", "invalidated", "evicted"]} == {
+        "hits": 1, "misses": 3, "expired": 1, "invalidated": 1,
+        "evicted": 1}
+    assert stats["hit_rate"] == 0.25
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 1024
+    assert stats["max_bytes"] == 2 * 1024
@@ -0,0 +1,44 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import (STOCK_SCHEMA, SchemaError, parse_market_cap,
+                    prepare_stock_df, read_options)
+
+STOCK_CSV = """Date,Open,High,Low,Close,Adj Close,Volume,Name,Company Name
+2016-01-04,1,1,1,1,1,{first},AAPL,Apple
+2016-01-05,2,2,2,2,2,{second},AAPL,Apple
+"""
+
+
+def read_stock(first, second):
+    text = STOCK_CSV.format(first=first, second=second)
+    return prepare_stock_df(pd.read_csv(io.StringIO(text),
+                                        **read_options(STOCK_SCHEMA)))
+
+
+def test_whole_volumes_load_as_int64():
+    stock_df = read_stock("100", "1.5e6")
+    assert stock_df["Volume"].dtype == np.int64
+    assert list(stock_df["Volume"]) == [100, 1_500_000]
+
+
+def test_missing_volume_loads_as_nan():
+    stock_df = read_stock("100", "")
+    assert stock_df["Volume"].dtype == np.float64
+    assert stock_df["Volume"].iloc[0] == 100
+    assert np.isnan(stock_df["Volume"].iloc[1])
+
+
+def test_fractional_volume_is_a_schema_error():
+    with pytest.raises(SchemaError):
+        read_stock("100", "2.5")
+
+
+def test_market_cap_scalar_and_vector():
+    assert parse_market_cap("2.1T") == pytest.approx(2100.0)
+    assert np.isnan(parse_market_cap("n/a"))
+    parsed = parse_market_cap(["350B", "900M", "1,200"])
+    np.testing.assert_allclose(parsed, [350.0, 0.9, 1200.0])
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+import pipeline
+from screener import get_screener
+
+
+def ticker_history(stock_path, window):
+    """
+    The stock CSV by (Name, Date) with per-ticker pandas references.
+    """
+    stock_df = pd.read_csv(stock_path).sort_values(["Name", "Date"])
+    close = stock_df.groupby("Name")["Close"]
+    return stock_df.assign(**{
+        f"{window}D Return": close.pct_change(window),
+        f"{window}D SMA": close.transform(
+            lambda series: series.rolling(window).mean()),
+    })
+
+
+def test_top_ranks_each_ticker_on_its_own_history(market_tables):
+    screener = get_screener()
+    assert get_screener() is screener
+    history = ticker_history(pipeline.STOCK_MARKET_CSV, 5)
+    date = history["Date"].max()
+    day = history[history["Date"] == date]
+
+    top = screener.top("Volume", date, n=3)
+    assert list(top["Name"]) == list(day.nlargest(3, "Volume")["Name"])
+
+    # GOOG and GOOGL belong to one company but are ranked separately
+    top = screener.top("5D Return", date, n=4, industry="Software")
+    expected = day[day["Name"] != "AAPL"].nlargest(4, "5D Return")
+    assert list(top["Name"]) == list(expected["Name"])
+    # Prices are stored as float32
+    np.testing.assert_allclose(top["5D Return"], expected["5D Return"],
+                               rtol=1e-5)
+
+
+def test_sma_crossovers_match_rolling_means(market_tables):
+    screener = get_screener()
+    history = ticker_history(pipeline.STOCK_MARKET_CSV, 5)
+    above = history["Close"] > history["5D SMA"]
+    was_above = above.groupby(history["Name"]).shift(1)
+    known = (history["5D SMA"].notna()
+             & history.groupby("Name")["5D SMA"].shift(1).notna())
+    crossed_up = history[known & above & was_above.eq(False)]
+
+    found = 0
+    for date in screener.dates[1:]:
+        result = screener.sma_crossovers(date, window=5)
+        expected = crossed_up[crossed_up["Date"] == date]
+        assert sorted(result["Name"]) == sorted(expected["Name"])
+        assert (result["Crossed"] == "up").all()
+        found += len(result)
+    assert found > 0
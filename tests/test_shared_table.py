@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from shared_table import AttachedTable, SharedTable
+
+
+def test_attached_columns_share_the_block():
+    df = pd.DataFrame({
+        "Date": ["2016-01-04", "2016-01-05", "2016-01-04"],
+        "Close": np.array([1.5, 2.5, 3.5], dtype=np.float32),
+        "Volume": [10, 20, 30],
+        "Name": pd.Categorical(["AAPL", "AAPL", "MSFT"]),
+    })
+    with SharedTable(df) as table:
+        attached = AttachedTable(table.descriptor)
+        frame = attached.frame
+        block = np.ndarray((attached.shm.size,), dtype=np.uint8,
+                           buffer=attached.shm.buf)
+
+        for name in ("Date", "Name"):
+            assert np.shares_memory(frame[name].array.codes, block)
+        for name in ("Close", "Volume"):
+            assert np.shares_memory(frame[name].to_numpy(), block)
+        assert list(frame["Date"]) == list(df["Date"])
+        assert list(frame["Name"]) == ["AAPL", "AAPL", "MSFT"]
+        np.testing.assert_array_equal(frame["Close"], df["Close"])
+        del frame, block, attached
@@ -0,0 +1,14 @@
+import pipeline
+from csv_cache import ColumnarCache
+
+
+def test_cached_index_opens_only_requested_columns(csv_tables, tmp_path):
+    client = pipeline.CSVClient(cache=ColumnarCache(str(tmp_path / "c")))
+    index = client.get_stock_index()
+    rows = index.get_stock_slice("Apple", start="2016-01-05",
+                                 columns=["Date", "Close"])
+
+    assert list(rows["Date"]) == ["2016-01-05", "2016-01-06"]
+    assert list(rows["Close"]) == [2.0, 4.0]
+    assert sorted(index._columns) == ["Close", "Company Name", "Date"]
+    assert list(index.stock_df.columns) == list(client.get_stock_df())
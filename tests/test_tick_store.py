@@ -0,0 +1,63 @@
+import pandas as pd
+
+import ingest
+import pipeline
+import tick_store
+from tick_store import TickStore, TickStoreCSVClient
+
+
+def day_rows(day, symbols=("AAPL", "MSFT")):
+    count = len(symbols)
+    return pd.DataFrame({
+        "Date": [f"2016-01-{day:02d}"] * count,
+        "Open": [1.0] * count, "High": [1.0] * count,
+        "Low": [1.0] * count, "Close": [float(day)] * count,
+        "Adj Close": [1.0] * count, "Volume": [100] * count,
+        "Name": list(symbols), "Company Name": list(symbols),
+    })
+
+
+def test_appends_compact_past_max_extents(tmp_path):
+    store = TickStore(str(tmp_path), max_extents=3)
+    for day in range(1, 8):
+        store.append(day_rows(day))
+        extents = [len(entry["extents"])
+                   for entry in store.manifest()["tickers"].values()]
+        assert max(extents) <= 3
+
+    stock_df = store.read("AAPL")
+    assert stock_df["Close"].tolist() == [float(day)
+                                          for day in range(1, 8)]
+    assert store.manifest()["generation"] > 0
+
+
+def test_single_ticker_appends_extend_one_extent(tmp_path):
+    store = TickStore(str(tmp_path), max_extents=2)
+    for day in range(1, 6):
+        store.append(day_rows(day, ["AAPL"]))
+    manifest = store.manifest()
+    assert manifest["tickers"]["AAPL"]["extents"] == [[0, 5]]
+    assert manifest["generation"] == 0
+
+
+def test_dates_match_the_partition_backend(csv_tables, tmp_path,
+                                           monkeypatch):
+    _, stock_path = csv_tables
+    partitions = ingest.StockPartitionStore(str(tmp_path / "partitions"))
+    partitions.ingest(stock_path)
+    ticks = TickStore(str(tmp_path / "ticks"))
+    ticks.ingest(stock_path)
+    monkeypatch.setattr(ingest.PartitionedClientFactory, "get_client",
+                        lambda: ingest.PartitionedCSVClient(partitions))
+    monkeypatch.setattr(tick_store.TickStoreClientFactory, "get_client",
+                        lambda: TickStoreCSVClient(ticks))
+
+    expected = pipeline.get_repository("partitions")
+    repo = pipeline.get_repository("tickstore")
+    for company in ["Apple", "Microsoft"]:
+        stock_df = repo.get_stock_data_by_company(company)
+        assert stock_df["Date"].dtype == "str"
+        assert list(stock_df["Date"]) == list(
+            expected.get_stock_data_by_company(company)["Date"])
+    all_dates = repo.client.get_stock_df()["Date"]
+    assert sorted(all_dates) == sorted(pd.read_csv(stock_path)["Date"])
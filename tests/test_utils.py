@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from utils import (AverageCloseStrategy, ColumnScan, HighVolumeStrategy,
+                   StrategyPipeline, TopCloseStrategy,
+                   calculate_average_close)
+
+
+def make_pipeline():
+    return (StrategyPipeline()
+            .register("average", AverageCloseStrategy())
+            .register("high_volume", HighVolumeStrategy(4))
+            .register("top", TopCloseStrategy(k=2)))
+
+
+def test_pipeline_matches_the_plain_strategies():
+    records = pd.DataFrame({
+        "Close": np.array([1.5, np.nan, 3.25], dtype=np.float32),
+        "Volume": [1, 5, 9],
+    })
+    results = make_pipeline().run(records)
+    assert results["average"] == calculate_average_close(records)
+    assert list(results["high_volume"]["Volume"]) == [5, 9]
+    assert list(results["top"]["Close"]) == [3.25, 1.5]
+
+
+def test_average_of_no_rows_is_nan():
+    records = pd.DataFrame({"Close": np.array([], dtype=np.float32),
+                            "Volume": np.array([], dtype=np.int64)})
+    assert np.isnan(make_pipeline().run(records)["average"])
+    assert np.isnan(calculate_average_close(records))
+
+
+def test_blocked_scan_matches_whole_array_reductions():
+    rng = np.random.default_rng(3)
+    close = rng.normal(100, 10, 1000).astype(np.float32)
+    close[rng.choice(1000, 50, replace=False)] = np.nan
+    volume = rng.integers(0, 100, 1000)
+
+    scan = ColumnScan()
+    scan.want_volume_above(60)
+    scan.want_top(5, True)
+    scan.want_top(3, False)
+    scan.run(close, volume, block_rows=64)
+
+    assert scan.close_count == 950
+    assert np.isclose(scan.close_sum / scan.close_count,
+                      np.nanmean(close.astype(np.float64)), rtol=1e-12)
+    np.testing.assert_array_equal(scan.volume_above(60), volume > 60)
+    order = np.argsort(-close.astype(np.float64), kind="stable")
+    np.testing.assert_array_equal(scan.top(5, True), order[:5])
+    np.testing.assert_array_equal(scan.top(3, False),
+                                  np.argsort(close, kind="stable")[:3])
@@ -0,0 +1,420 @@
+# ======================================================
+# 📄 FILE: tick_store.py
+# PURPOSE: Memory-mapped, append-only store for daily stock rows
+# EXPECTED:
+# - One fixed-width binary file per price column, memory-mapped
+# - A manifest maps each ticker to its row extents in those files
+# - Appends add rows at the end and commit by swapping the manifest
+# - Compaction rewrites the files so each ticker is one extent; it
+#   runs automatically once a ticker has too many extents
+# - Served through the CSVClient / CompanyRepository interface
+# RULES:
+# - Rows past the committed count are never read (torn appends)
+# - Appended rows must be newer than the ticker's stored rows
+# - One writer at a time; any number of readers
+# OUTCOME:
+# - One ticker's history is a slice of the mapped files, no parsing
+# ======================================================
+
+import copy
+import json
+import os
+import shutil
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import load_env
+from csv_cache import ColumnarCache
+from ingest import PartitionIndex, iter_stock_chunks
+from pipeline import CSV_CACHE_DIR, CSVClient
+
+# Load environment variables
+load_env()
+
+# Directory holding the store's manifest and column files
+TICK_STORE_DIR = os.getenv("TICK_STORE_DIR", "tick_store")
+
+# Compact after an append leaves any ticker with more extents than this
+# (each multi-ticker append adds one per ticker); 0 disables it
+TICK_STORE_MAX_EXTENTS = int(os.getenv("TICK_STORE_MAX_EXTENTS", "32"))
+
+MANIFEST_FILE = "manifest.json"
+STORE_FORMAT_VERSION = 1
+
+# Stored columns and their on-disk dtypes; Date is datetime64[s]
+COLUMNS = {
+    "Date": "int64",
+    "Open": "float32",
+    "High": "float32",
+    "Low": "float32",
+    "Close": "float32",
+    "Adj Close": "float32",
+    "Volume": "int64",
+}
+DATE_DTYPE = "datetime64[s]"
+
+
+def column_file(column):
+    return column.lower().replace(" ", "_") + ".bin"
+
+
+def _fsync_dir(path):
+    # Makes a rename durable; not every platform can open directories
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _to_seconds(value):
+    return int(np.datetime64(value, "s").astype("int64"))
+
+
+class TickStore:
+    """
+    Column files plus a JSON manifest of committed rows and extents.
+
+    The manifest names a generation directory holding the column
+    files. Appends extend that generation's files; compaction writes a
+    new generation and switches to it in one manifest swap.
+    """
+
+    def __init__(self, root=TICK_STORE_DIR,
+                 max_extents=TICK_STORE_MAX_EXTENTS):
+        self.root = root
+        self.max_extents = max_extents
+        self._manifest = None
+        self._manifest_stat = None
+        self._maps = None
+
+    # ---- Manifest ----------------------------------------------------
+
+    def manifest(self):
+        """
+        Return the committed manifest, re-reading it only if replaced.
+        """
+        path = os.path.join(self.root, MANIFEST_FILE)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return {"version": STORE_FORMAT_VERSION, "generation": 0,
+                    "rows": 0, "tickers": {}}
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key != self._manifest_stat:
+            with open(path) as handle:
+                manifest = json.load(handle)
+            if manifest.get("version") != STORE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported tick store format in "
+                                 f"{self.root}")
+            self._manifest, self._manifest_stat = manifest, key
+            self._maps = None
+        return self._manifest
+
+    def version(self):
+        """
+        Changes with every commit; used to invalidate cached results.
+        """
+        manifest = self.manifest()
+        return manifest["generation"], manifest["rows"]
+
+    def symbols(self):
+        return sorted(self.manifest()["tickers"])
+
+    def _generation_dir(self, generation):
+        return os.path.join(self.root, f"gen-{generation}")
+
+    def _commit(self, manifest):
+        """
+        Atomically replace the manifest: the commit point of a write.
+        """
+        path = os.path.join(self.root, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as handle:
+            json.dump(manifest, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(self.root)
+
+    # ---- Reads -------------------------------------------------------
+
+    def _columns(self):
+        """
+        Memory-maps of the committed rows of every column.
+        """
+        manifest = self.manifest()
+        if self._maps is None:
+            rows = manifest["rows"]
+            directory = self._generation_dir(manifest["generation"])
+            self._maps = {
+                column: (np.memmap(os.path.join(directory,
+                                                column_file(column)),
+                                   dtype=dtype, mode="r", shape=(rows,))
+                         if rows else np.empty(0, dtype=dtype))
+                for column, dtype in COLUMNS.items()}
+        return self._maps
+
+    def _ranges(self, extents, dates, start, end):
+        """
+        Row ranges of the extents that fall between start and end.
+        """
+        ranges = []
+        for first, stop in extents:
+            if start is not None:
+                first += int(np.searchsorted(dates[first:stop], start))
+            if end is not None:
+                stop = first + int(np.searchsorted(dates[first:stop], end,
+                                                   side="right"))
+            if first < stop:
+                ranges.append((first, stop))
+        return ranges
+
+    def read(self, symbol, start=None, end=None, columns=None):
+        """
+        Return one ticker's rows between start and end (inclusive).
+
+        A compacted ticker is returned as read-only views of the mapped
+        files; a ticker spread over several extents is concatenated.
+        """
+        manifest = self.manifest()
+        entry = manifest["tickers"].get(symbol)
+        maps = self._columns()
+        start = None if start is None else _to_seconds(start)
+        end = None if end is None else _to_seconds(end)
+        ranges = ([] if entry is None else
+                  self._ranges(entry["extents"], maps["Date"], start, end))
+
+        data = {}
+        for column in COLUMNS:
+            parts = [maps[column][first:stop] for first, stop in ranges]
+            values = (parts[0] if len(parts) == 1 else
+                      np.concatenate(parts) if parts else
+                      np.empty(0, dtype=COLUMNS[column]))
+            if column == "Date":
+                values = values.view(DATE_DTYPE)
+            data[column] = values
+        rows = len(data["Date"])
+        company = entry["company"] if entry else symbol
+        for column, value in (("Name", symbol), ("Company Name", company)):
+            data[column] = pd.Categorical.from_codes(
+                np.zeros(rows, dtype=np.int8),
+                categories=[] if value is None else [value])
+        stock_df = pd.DataFrame(data, copy=False)
+        return stock_df if columns is None else stock_df[columns]
+
+    # ---- Writes ------------------------------------------------------
+
+    def append(self, stock_df, check_order=True):
+        """
+        Append stock rows and commit them; returns the rows written.
+
+        Each ticker's new rows must be dated after its stored rows.
+        Rows are written past the committed end of every column file
+        first; they become visible only when the manifest is replaced.
+        The store is compacted once a ticker exceeds max_extents.
+        """
+        if stock_df.empty:
+            return 0
+        manifest = copy.deepcopy(self.manifest())
+        directory = self._generation_dir(manifest["generation"])
+        os.makedirs(directory, exist_ok=True)
+
+        dates = pd.to_datetime(stock_df["Date"]).to_numpy(DATE_DTYPE)
+        seconds = dates.view("int64")
+        order = np.lexsort((seconds,
+                            stock_df["Name"].astype(str).to_numpy()))
+        batch = stock_df.take(order)
+        seconds = seconds[order]
+        symbols = batch["Name"].astype(str).to_numpy()
+        companies = batch["Company Name"].astype(str).to_numpy()
+
+        base = manifest["rows"]
+        boundaries = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.append(boundaries, len(batch))
+        tickers = manifest["tickers"]
+        for first, stop in zip(starts, stops):
+            symbol = symbols[first]
+            entry = tickers.setdefault(symbol, {
+                "company": companies[first], "extents": [], "last": None})
+            if (check_order and entry["last"] is not None
+                    and seconds[first] <= entry["last"]):
+                raise ValueError(f"Rows for {symbol} must be newer than "
+                                 f"its stored rows")
+            extent = [base + int(first), base + int(stop)]
+            if entry["extents"] and entry["extents"][-1][1] == extent[0]:
+                entry["extents"][-1][1] = extent[1]
+            else:
+                entry["extents"].append(extent)
+            last = int(seconds[stop - 1])
+            entry["last"] = (last if entry["last"] is None
+                             else max(entry["last"], last))
+
+        values = {column: batch[column].to_numpy(dtype)
+                  for column, dtype in COLUMNS.items() if column != "Date"}
+        values["Date"] = seconds
+        for column, dtype in COLUMNS.items():
+            path = os.path.join(directory, column_file(column))
+            with open(path, "ab") as handle:
+                # Drop the torn tail of an append that never committed
+                handle.truncate(base * np.dtype(dtype).itemsize)
+                handle.write(np.ascontiguousarray(values[column],
+                                                  dtype=dtype).tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        manifest["rows"] = base + len(batch)
+        self._commit(manifest)
+        if self.max_extents and any(
+                len(tickers[symbol]["extents"]) > self.max_extents
+                for symbol in symbols[starts]):
+            self.compact()
+        return len(batch)
+
+    def compact(self):
+        """
+        Rewrite the store so every ticker is one date-ordered extent.
+        Readers of the previous generation keep their mapped files.
+        """
+        manifest = self.manifest()
+        generation = manifest["generation"] + 1
+        directory = self._generation_dir(generation)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+        maps = self._columns()
+        tickers, rows = {}, 0
+        handles = {column: open(os.path.join(directory, column_file(column)),
+                                "wb") for column in COLUMNS}
+        try:
+            for symbol in sorted(manifest["tickers"]):
+                entry = manifest["tickers"][symbol]
+                parts = [np.arange(first, stop)
+                         for first, stop in entry["extents"]]
+                positions = (np.concatenate(parts) if parts
+                             else np.zeros(0, dtype=np.int64))
+                positions = positions[np.argsort(maps["Date"][positions],
+                                                 kind="stable")]
+                for column, handle in handles.items():
+                    handle.write(maps[column][positions].tobytes())
+                tickers[symbol] = {"company": entry["company"],
+                                   "extents": [[rows,
+                                                rows + len(positions)]],
+                                   "last": entry["last"]}
+                rows += len(positions)
+            for handle in handles.values():
+                handle.flush()
+                os.fsync(handle.fileno())
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        self._commit({"version": STORE_FORMAT_VERSION,
+                      "generation": generation, "rows": rows,
+                      "tickers": tickers})
+        shutil.rmtree(self._generation_dir(manifest["generation"]),
+                      ignore_errors=True)
+        return rows
+
+    def ingest(self, csv_path, max_memory_mb=None):
+        """
+        Rebuild the store from a stock CSV, streamed in chunks.
+        The new store is built aside and swapped in when complete.
+        """
+        tmp_root = f"{self.root}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        # Compacted once at the end rather than every max_extents chunks
+        store = TickStore(tmp_root, max_extents=0)
+        os.makedirs(tmp_root)
+        # The CSV need not be in date order; compaction sorts it
+        for chunk in iter_stock_chunks(csv_path, max_memory_mb):
+            store.append(chunk, check_order=False)
+        rows = store.compact()
+
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.replace(tmp_root, self.root)
+        _fsync_dir(os.path.dirname(os.path.abspath(self.root)))
+        return rows
+
+
+def iso_dates(stock_df):
+    """
+    Replace a datetime64 Date column with the ISO strings the CSV and
+    partition backends return.
+    """
+    if "Date" in stock_df.columns:
+        dates = np.datetime_as_string(stock_df["Date"].to_numpy(DATE_DTYPE),
+                                      unit="D")
+        stock_df["Date"] = pd.array(dates, dtype="str")
+    return stock_df
+
+
+class TickStoreIndex(PartitionIndex):
+    """
+    Stock lookups answered by TickStore reads, with date and column
+    pushdown into the mapped files. Dates are returned as ISO strings.
+    """
+
+    def get_stock_slice(self, company_name, start=None, end=None,
+                        columns=None):
+        symbols = self._company_symbols.get(company_name, [])
+        if len(symbols) <= 1:
+            symbol = symbols[0] if symbols else None
+            return iso_dates(self.partitions.read(symbol, start, end,
+                                                  columns))
+        # Several tickers of one company: merge them in date order
+        stock_df = pd.concat([self.partitions.read(symbol, start, end)
+                              for symbol in symbols], ignore_index=True)
+        stock_df = stock_df.sort_values("Date", kind="stable")
+        return iso_dates(stock_df if columns is None else stock_df[columns])
+
+
+class TickStoreCSVClient(CSVClient):
+    """
+    CSVClient that reads stock rows from a TickStore; the company
+    table still comes from its CSV.
+    """
+
+    def __init__(self, store, cache=None):
+        super().__init__(cache=cache)
+        self.store = store
+
+    def get_stock_df(self):
+        """
+        Materialize every ticker; prefer repository lookups instead.
+        """
+        frames = [self.store.read(symbol) for symbol in self.store.symbols()]
+        if not frames:
+            return iso_dates(self.store.read(None))
+        return iso_dates(pd.concat(frames, ignore_index=True))
+
+    def data_version(self):
+        company_version, _ = super().data_version()
+        return company_version, self.store.version()
+
+    def get_stock_index(self):
+        return self._memoized("stock_index", lambda: TickStoreIndex(
+            self.get_company_df(), self.store))
+
+
+class TickStoreClientFactory:
+    """
+    Factory Pattern: one TickStoreCSVClient per process.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_client():
+        return TickStoreCSVClient(TickStore(TICK_STORE_DIR),
+                                  cache=ColumnarCache(CSV_CACHE_DIR))
+
+
+if __name__ == "__main__":
+    total = TickStore(TICK_STORE_DIR).ingest(os.getenv("STOCK_CSV_PATH"))
+    print(f"Stored {total} rows in {TICK_STORE_DIR}")
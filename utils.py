@@ -11,6 +11,11 @@
 # - Abstraction and helper tools that plug into the flow
 # ======================================================
 
+import numpy as np
+
+from instrumentation import span
+
+
 class StrategyContext:
     """
     Context class for Strategy Pattern.
@@ -60,4 +65,199 @@ def sort_by_close(records, descending=True):
         return records.sort_values(by='Close', ascending=descending)
     except Exception as e:
         print(f"Error sorting records: {e}")
-        return records.iloc[0:0]  # Return empty DataFrame on error
\ No newline at end of file
+        return records.iloc[0:0]  # Return empty DataFrame on error
+
+
+# Rows per block of the fused scan; a block's columns stay in cache
+SCAN_BLOCK_ROWS = 1 << 16
+
+
+def _smallest(keys, k):
+    """
+    Positions of the k smallest keys, in no particular order.
+    """
+    if len(keys) <= k:
+        return np.arange(len(keys))
+    return np.argpartition(keys, k - 1)[:k]
+
+
+class ColumnScan:
+    """
+    One blocked pass over the Close and Volume arrays that produces
+    everything the array strategies asked for: the sum and count of
+    the present closes, one mask per volume threshold and the top-k
+    close candidates. Each block's NaN mask is computed once and
+    shared; prices are upcast to float64 only inside a block.
+    """
+
+    def __init__(self):
+        self.thresholds = set()
+        self.top_requests = set()
+        self.has_close = False
+        self.close_sum = 0.0
+        self.close_count = 0
+        self._masks = {}
+        self._tops = {}
+
+    def want_volume_above(self, threshold):
+        self.thresholds.add(threshold)
+
+    def want_top(self, k, descending):
+        self.top_requests.add((k, descending))
+
+    def volume_above(self, threshold):
+        """
+        Boolean row mask, or None without a Volume column.
+        """
+        return self._masks.get(threshold)
+
+    def top(self, k, descending):
+        """
+        Row positions of the k best closes, best first (missing closes
+        rank last, ties by position), or None without a Close column.
+        """
+        return self._tops.get((k, descending))
+
+    def run(self, close=None, volume=None, block_rows=SCAN_BLOCK_ROWS):
+        self.has_close = close is not None
+        rows = len(close) if close is not None else (
+            0 if volume is None else len(volume))
+        if volume is not None:
+            self._masks = {threshold: np.empty(rows, dtype=bool)
+                           for threshold in self.thresholds}
+        candidates = {request: (np.zeros(0, dtype=np.intp), np.zeros(0))
+                      for request in self.top_requests if self.has_close}
+
+        for start in range(0, rows, block_rows):
+            stop = min(start + block_rows, rows)
+            if volume is not None:
+                block = volume[start:stop]
+                for threshold, mask in self._masks.items():
+                    np.greater(block, threshold, out=mask[start:stop])
+            if close is None:
+                continue
+
+            block = close[start:stop].astype(np.float64)
+            missing = np.isnan(block)
+            present = ~missing
+            self.close_count += int(np.count_nonzero(present))
+            self.close_sum += float(np.sum(block, where=present))
+            for (k, descending), (positions, keys) in candidates.items():
+                block_keys = np.where(missing, np.inf,
+                                      -block if descending else block)
+                local = _smallest(block_keys, k)
+                positions = np.concatenate([positions, start + local])
+                keys = np.concatenate([keys, block_keys[local]])
+                keep = _smallest(keys, k)
+                candidates[(k, descending)] = positions[keep], keys[keep]
+
+        for request, (positions, keys) in candidates.items():
+            self._tops[request] = positions[np.lexsort((positions, keys))]
+        return self
+
+
+class AverageCloseStrategy:
+    """
+    Array strategy: mean closing price, ignoring missing values.
+    Like calculate_average_close: 0 without a Close column, NaN when
+    there is no close to average.
+    """
+    columns = ("Close",)
+
+    def plan(self, scan):
+        # The close sum and count are always collected
+        pass
+
+    def compute(self, scan, records):
+        if not scan.has_close:
+            return 0
+        if not scan.close_count:
+            return np.nan
+        return scan.close_sum / scan.close_count
+
+
+class HighVolumeStrategy:
+    """
+    Array strategy: rows whose volume is above the threshold.
+    """
+    columns = ("Volume",)
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def plan(self, scan):
+        scan.want_volume_above(self.threshold)
+
+    def compute(self, scan, records):
+        mask = scan.volume_above(self.threshold)
+        if mask is None:
+            return records.iloc[0:0]
+        return records[mask]
+
+
+class TopCloseStrategy:
+    """
+    Array strategy: the k rows with the highest (or lowest) close.
+    Uses partial selection instead of sorting the whole frame.
+    """
+    columns = ("Close",)
+
+    def __init__(self, k=5, descending=True):
+        self.k = k
+        self.descending = descending
+
+    def plan(self, scan):
+        scan.want_top(self.k, self.descending)
+
+    def compute(self, scan, records):
+        top = scan.top(self.k, self.descending)
+        if top is None:
+            return records.iloc[0:0]
+        return records.iloc[top]
+
+
+class StrategyPipeline:
+    """
+    Runs several registered strategies over one frame.
+
+    Array strategies (with `columns`, `plan` and `compute`) register
+    what they need with one ColumnScan, which makes a single fused pass
+    over zero-copy views of the columns; each strategy then builds its
+    result from the scan. Plain strategy functions such as
+    calculate_average_close still work as plug-ins and receive the
+    frame itself.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def register(self, name, strategy, **kwargs):
+        self.steps.append((name, strategy, kwargs))
+        return self
+
+    def run(self, records):
+        """
+        Return a dict of strategy name -> result.
+        """
+        arrays = {}
+        scan = ColumnScan()
+        for _, strategy, _ in self.steps:
+            if not hasattr(strategy, "compute"):
+                continue
+            strategy.plan(scan)
+            for column in strategy.columns:
+                if column in records.columns and column not in arrays:
+                    arrays[column] = records[column].to_numpy(copy=False)
+        if arrays:
+            with span("strategy.scan", rows=len(records)):
+                scan.run(arrays.get("Close"), arrays.get("Volume"))
+
+        results = {}
+        for name, strategy, kwargs in self.steps:
+            with span(f"strategy.{name}", rows=len(records)):
+                if hasattr(strategy, "compute"):
+                    results[name] = strategy.compute(scan, records)
+                else:
+                    results[name] = StrategyContext(strategy).execute(
+                        records, **kwargs)
+        return results